@@ -0,0 +1,278 @@
+# asgi.py
+# ASGI entry point: async handlers for the LLM-bound endpoints, everything else
+# served by the existing Flask app through asgiref's WSGI adapter.
+#
+#   uvicorn asgi:application --host 0.0.0.0 --port 5001
+#
+# Run a single process: the DB lives in process memory and the journal has one
+# writer, so a second process serving the same DATA_DIR refuses to start (it fails
+# lifespan startup). While an async route awaits the LLM it holds no thread, so one
+# process can keep hundreds of completions in flight (ASYNC_AI_MAX_CONCURRENCY, default 500).
+# Sync routes run unchanged in asgiref's thread pool. The admin change feed
+# (GET /api/admin/events) is also served here, so an open SSE connection costs a
+# queue rather than a pool thread.
+import asyncio
+import importlib.util
+import os
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as backend
+import auth
+import changefeed
+import llm
+import metrics
+import ratelimit
+import store
+import tenants
+from blueprints import ai
+from json_provider import dumps_bytes, loads
+
+MAX_BODY = int(os.getenv("ASYNC_MAX_BODY", str(1024 * 1024)))
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_AI_MAX_CONCURRENCY", "500"))
+
+# path -> (rate-limit class, plan function from blueprints/ai.py)
+ASYNC_ROUTES = {
+    "/api/chatbot": ("chat", ai.plan_chatbot),
+    "/api/ai/auto_build": ("ai", ai.plan_auto_build),
+    "/api/ai/seo_analyze": ("ai", ai.plan_seo_analyze),
+    "/api/ai/theme": ("ai", ai.plan_theme),
+    "/api/voice/text": ("ai", ai.plan_voice_text),
+}
+
+_wsgi = WsgiToAsgi(backend.app)
+_in_flight = 0  # only touched from the event loop thread
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY:
+            return False
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status, body, headers=()):
+    payload = dumps_bytes(body) + b"\n"
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            (b"access-control-allow-origin", b"*"),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _dispatch(scope, receive, endpoint_class, plan_fn):
+    """Run one async LLM route; returns (status, body, extra headers)."""
+    global _in_flight
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+    tenant_id = tenants.resolve(headers.get("host"), headers.get("authorization"))
+    if tenant_id is None:
+        return 404, {"error": "Unknown site"}, ()
+    store.set_tenant(tenant_id)  # context variable: scoped to this request's task
+    if ratelimit.ENABLED:
+        client = scope.get("client") or ("unknown", 0)
+        key = ratelimit.client_key_for(headers.get("authorization"), headers.get("x-forwarded-for"), client[0])
+        wait = await asyncio.to_thread(ratelimit.check, endpoint_class, key)  # may be a Redis round trip
+        if wait is not None:
+            retry = max(1, int(wait + 0.999))
+            return 429, {"error": "Rate limit exceeded", "retry_after": retry}, [(b"retry-after", str(retry).encode())]
+    if _in_flight >= ASYNC_MAX_CONCURRENCY:
+        return 503, {"error": "Server busy, try again shortly", "retry_after": 1}, [(b"retry-after", b"1")]
+
+    raw = await _read_body(receive)
+    if raw is None:
+        return None, None, ()
+    if raw is False:
+        return 413, {"error": "Request body too large"}, ()
+    try:
+        data = loads(raw) if raw.strip() else {}
+    except ValueError:
+        return 400, {"error": "Invalid JSON body"}, ()
+    # plan and finish read and write DB (journal fsync, revisions) and may tokenize large
+    # inputs, so they run in a worker thread; to_thread carries the tenant context along
+    plan = await asyncio.to_thread(plan_fn, data if isinstance(data, dict) else {})
+    while True:
+        if "prompt" in plan:
+            calls = {None: (plan["prompt"], plan["max_tokens"])}
+        elif "prompts" in plan:
+            calls = plan["prompts"]
+        else:
+            return plan.get("status", 200), plan["result"], ()
+        endpoint = plan.get("endpoint", "other")
+        _in_flight += len(calls)
+        try:
+            results = await asyncio.gather(*(llm.complete_async(endpoint, prompt, max_tokens=max_tokens)
+                                             for prompt, max_tokens in calls.values()))
+        finally:
+            _in_flight -= len(calls)
+        body = await asyncio.to_thread(plan["finish"], results[0] if "prompt" in plan else dict(zip(calls, results)))
+        if not isinstance(body, llm.Chain):
+            return 200, body, ()
+        plan = body.plan  # e.g. the reduce step of seo_analyze
+
+
+async def _handle(scope, receive, send, endpoint_class, plan_fn):
+    start = time.perf_counter()
+    metrics.IN_FLIGHT.inc()
+    status = 500
+    started = False
+
+    async def tracked_send(message):
+        nonlocal started
+        started = started or message["type"] == "http.response.start"
+        await send(message)
+
+    try:
+        status, body, headers = await _dispatch(scope, receive, endpoint_class, plan_fn)
+        if status is not None:
+            await _send_json(tracked_send, status, body, headers)
+    except Exception:
+        status = 500
+        if not started:  # otherwise the headers are out: the server just closes the connection
+            await _send_json(send, 500, {"error": "Internal server error"})
+        raise
+    finally:
+        metrics.IN_FLIGHT.dec()
+        if status is not None:
+            metrics.LATENCY.observe(time.perf_counter() - start, scope["path"], "POST")
+            metrics.REQUESTS.inc(scope["path"], "POST", status)
+
+
+async def _events(scope, receive, send):
+    """SSE change feed for admins (see changefeed.py); same contract as the Flask route."""
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    authorization = headers.get("authorization")
+    if authorization is None and query.get("access_token"):
+        authorization = "Bearer " + query["access_token"][0]  # EventSource cannot send headers
+    tenant_id = tenants.resolve(headers.get("host"), authorization)
+    if tenant_id is None:
+        return await _send_json(send, 404, {"error": "Unknown site"})
+    claims = auth.verify_token(authorization[7:].strip() if authorization and authorization.startswith("Bearer ") else None)
+    if claims is None:
+        return await _send_json(send, 401, {"error": "Admin authentication required"})
+    if claims.get("tid", store.DEFAULT_TENANT) not in (store.DEFAULT_TENANT, tenant_id):
+        return await _send_json(send, 403, {"error": "Token is not valid for this site"})
+    types = [t for t in ",".join(query.get("types", [])).split(",") if t]
+    unknown = [t for t in types if t not in changefeed.TYPES]
+    if unknown:
+        return await _send_json(send, 400, {"error": f"Unknown type(s): {unknown}", "types": list(changefeed.TYPES)})
+    last_id = headers.get("last-event-id") or (query.get("last_event_id") or [None])[0]
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue(maxsize=changefeed.QUEUE_SIZE)
+    overflow = asyncio.Event()
+
+    def put(event):
+        try:
+            events.put_nowait(event)
+        except asyncio.QueueFull:
+            overflow.set()
+
+    def deliver(event):  # called from whichever thread made the write
+        loop.call_soon_threadsafe(put, event)
+
+    async def disconnected():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    changefeed.subscribe(tenant_id, deliver)
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            (b"access-control-allow-origin", b"*"),
+        ]})
+        chunks, seen = changefeed.catch_up(tenant_id, last_id, types)
+        chunks.insert(0, b"retry: 3000\n\n")
+        await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+        while not watcher.done():
+            if overflow.is_set():
+                overflow.clear()
+                while not events.empty():
+                    events.get_nowait()
+                await send({"type": "http.response.body", "body": changefeed.RESYNC, "more_body": True})
+            getter = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait({getter, watcher}, timeout=changefeed.HEARTBEAT,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                if not done:
+                    await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+                continue
+            event = getter.result()
+            if event["id"] > seen and changefeed.wanted(event, types):
+                await send({"type": "http.response.body", "body": changefeed.sse(event), "more_body": True})
+    except OSError:
+        pass  # client went away mid-send
+    finally:
+        changefeed.unsubscribe(tenant_id, deliver)
+        watcher.cancel()
+
+
+_process_lock = None
+
+
+def _claim_data_dir():
+    """Take an exclusive lock on DATA_DIR for this process; False if another process holds it."""
+    global _process_lock
+    if importlib.util.find_spec("fcntl") is None:
+        return True  # Windows: no advisory locks, rely on the documented single process
+    import fcntl
+
+    store.DATA_DIR.mkdir(parents=True, exist_ok=True)
+    f = open(store.DATA_DIR / "asgi.lock", "w")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _process_lock = f  # held until the process exits
+    return True
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if not _claim_data_dir():
+                # a second worker would keep its own DB and, with DB_JOURNAL_DIR, corrupt the journal
+                await send({"type": "lifespan.startup.failed",
+                            "message": f"another process is already serving {store.DATA_DIR}; run one worker "
+                                       "(uvicorn without --workers)"})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if store.JOURNAL is not None:
+                store.JOURNAL.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in ASYNC_ROUTES:
+        endpoint_class, plan_fn = ASYNC_ROUTES[scope["path"]]
+        return await _handle(scope, receive, send, endpoint_class, plan_fn)
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] == "/api/admin/events":
+        return await _events(scope, receive, send)
+    return await _wsgi(scope, receive, send)
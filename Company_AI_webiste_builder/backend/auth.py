@@ -0,0 +1,121 @@
+# auth.py
+# Stateless admin tokens: base64url(JSON claims) + "." + base64url(HMAC-SHA256).
+#
+# Verifying a token is one HMAC, a constant-time compare and a dict lookup in a
+# small revocation set (jti -> expiry) — no DB round trip per request. Tokens
+# carry their own expiry, so revoked entries can be dropped once they expire.
+#
+# Tokens are only issued for a correct password: ADMIN_PASSWORD_HASH (a werkzeug
+# password hash, `python auth.py` prints one) for the platform admins, and a site's
+# own "admin_password_hash" for its site admins. The app refuses to start without
+# ADMIN_PASSWORD_HASH.
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+log = logging.getLogger(__name__)
+
+TOKEN_TTL = int(os.getenv("ADMIN_TOKEN_TTL", str(8 * 3600)))
+# fine for a single dev process; tokens won't survive restarts or span workers
+SECRET = os.getenv("ADMIN_TOKEN_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH", "")
+
+_revoked = {}  # jti -> exp
+_lock = threading.Lock()
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(s):
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _sign(payload):
+    return hmac.new(SECRET, payload.encode("ascii"), hashlib.sha256).digest()
+
+
+def init_app(app):
+    """Re-read the admin settings (create_app has loaded .env by now, after this module was
+    imported) and refuse to start without a platform admin password."""
+    global PASSWORD_HASH, SECRET
+    PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH", PASSWORD_HASH)
+    if os.getenv("ADMIN_TOKEN_SECRET"):
+        SECRET = os.environ["ADMIN_TOKEN_SECRET"].encode("utf-8")
+    else:
+        log.warning("ADMIN_TOKEN_SECRET not set; using a random per-process secret")
+    if not PASSWORD_HASH:
+        raise RuntimeError("ADMIN_PASSWORD_HASH is not set; generate one with `python auth.py`")
+
+
+def hash_password(password):
+    return generate_password_hash(password)
+
+
+def check_password(password, pw_hash):
+    """True if `password` matches a werkzeug hash; False for a missing hash or password."""
+    if not pw_hash or not password:
+        return False
+    try:
+        return check_password_hash(pw_hash, password)
+    except ValueError:  # malformed / unsupported hash
+        log.warning("auth: unusable password hash")
+        return False
+
+
+def issue_token(email, ttl=None, tenant=None):
+    """Mint a signed token for `email` (scoped to `tenant` when given). Returns (token, claims)."""
+    now = int(time.time())
+    claims = {"sub": email, "iat": now, "exp": now + (ttl or TOKEN_TTL), "jti": secrets.token_hex(8)}
+    if tenant:
+        claims["tid"] = tenant
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_b64(_sign(payload))}", claims
+
+
+def verify_token(token):
+    """Return the token's claims if it is authentic, unexpired and not revoked; else None."""
+    if not token or token.count(".") != 1:
+        return None
+    payload, sig = token.split(".")
+    try:
+        if not hmac.compare_digest(_sign(payload), _unb64(sig)):
+            return None
+        claims = json.loads(_unb64(payload))
+    except (ValueError, UnicodeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    if claims.get("jti") in _revoked:
+        return None
+    return claims
+
+
+def revoke(claims):
+    """Revoke a verified token until its natural expiry."""
+    now = time.time()
+    with _lock:
+        _revoked[claims["jti"]] = claims["exp"]
+        for jti, exp in list(_revoked.items()):
+            if exp < now:
+                del _revoked[jti]
+
+
+def bearer_token(headers):
+    auth = headers.get("Authorization", "")
+    return auth[7:].strip() if auth.startswith("Bearer ") else None
+
+
+if __name__ == "__main__":
+    import getpass
+
+    print(hash_password(getpass.getpass("Admin password: ")))
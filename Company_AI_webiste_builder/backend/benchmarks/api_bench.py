@@ -0,0 +1,318 @@
+# api_bench.py
+# Reproducible load test for the backend API.
+#
+# memory mode (default): boots app.py in-process on a threaded WSGI server, swaps
+#   the LLM for a stub with fixed latency, and drives a weighted mix of real HTTP
+#   requests (pages, posts, jobs, apply uploads, chatbot) from N client threads.
+# sqlalchemy mode: app.py's routes are backed by the in-memory DB, so this mode
+#   runs the equivalent reads/writes through models.py against SQLite instead.
+#
+# Reports throughput and p50/p95/p99 per scenario; --json writes a machine-readable
+# report and --compare fails (exit 1) if p95 or throughput regress beyond --tolerance.
+#
+#   python benchmarks/api_bench.py --duration 10 --concurrency 8 --json bench.json
+#   python benchmarks/api_bench.py --compare bench.json
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+RESUME = b"""Jane Doe
+jane.doe@example.com
+Senior engineer with 6 years of experience in Python, Flask, React, SQL, AWS and Docker.
+"""
+
+# scenario -> weight
+MIX = {
+    "page_services": 25,
+    "page_home": 15,
+    "posts": 15,
+    "post_detail": 5,
+    "jobs": 20,
+    "apply": 10,
+    "chatbot": 10,
+}
+
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def summarize(samples, elapsed):
+    """samples: scenario -> list of (latency seconds, ok)."""
+    report = {}
+    everything = []
+    for name, vals in sorted(samples.items()):
+        lats = sorted(v[0] for v in vals)
+        everything.extend(lats)
+        report[name] = {
+            "requests": len(vals),
+            "errors": sum(1 for v in vals if not v[1]),
+            "rps": round(len(vals) / elapsed, 2),
+            "p50_ms": round(percentile(lats, 50) * 1000, 3),
+            "p95_ms": round(percentile(lats, 95) * 1000, 3),
+            "p99_ms": round(percentile(lats, 99) * 1000, 3),
+        }
+    everything.sort()
+    report["_total"] = {
+        "requests": len(everything),
+        "errors": sum(r["errors"] for r in report.values()),
+        "rps": round(len(everything) / elapsed, 2),
+        "p50_ms": round(percentile(everything, 50) * 1000, 3),
+        "p95_ms": round(percentile(everything, 95) * 1000, 3),
+        "p99_ms": round(percentile(everything, 99) * 1000, 3),
+    }
+    return report
+
+
+def run_load(do_request, duration, concurrency, seed):
+    """Call do_request(rng, scenario) from `concurrency` threads for `duration` seconds."""
+    names = list(MIX)
+    weights = [MIX[n] for n in names]
+    samples = {n: [] for n in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(idx):
+        rng = random.Random(seed + idx)
+        local = {n: [] for n in names}
+        state = {}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                ok = do_request(rng, name, state)
+            except Exception:
+                ok = False
+                state.clear()
+            local[name].append((time.perf_counter() - t0, ok))
+        with lock:
+            for n in names:
+                samples[n].extend(local[n])
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(samples, time.perf_counter() - start)
+
+
+# ----------------------------
+# memory mode: real HTTP against app.py
+# ----------------------------
+def multipart(fields, file_field, filename, content):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for k, v in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f"Content-Type: text/plain\r\n\r\n".encode() + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def bench_memory(args):
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    os.environ.setdefault("ADMIN_PASSWORD_HASH", "pbkdf2:sha256:1000$bench$unused")  # no admin logins here
+    workdir = tempfile.mkdtemp(prefix="api_bench_")
+    os.chdir(workdir)  # app.py writes uploads under ./data
+
+    from werkzeug.serving import make_server
+    import app as backend
+    import llm
+    from seed import ensure_seed_data
+    from store import DB
+
+    ensure_seed_data()
+    latency = args.llm_latency_ms / 1000.0
+
+    def stub_llm(prompt, max_tokens=200, temperature=0.7):
+        time.sleep(latency)
+        return "Stub answer for benchmarking."
+
+    llm.run_openai_completion = stub_llm
+    llm.USE_OPENAI = True
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    post_ids = [p["id"] for p in DB["blog"]]
+    job_titles = [j["title"] for j in DB["jobs"]]
+
+    def do_request(rng, name, state):
+        conn = state.get("conn")
+        if conn is None:
+            conn = state["conn"] = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        headers = {}
+        body = None
+        method = "GET"
+        if name == "page_services":
+            path = "/api/pages/services"
+        elif name == "page_home":
+            path = "/api/pages/home"
+        elif name == "posts":
+            path = "/api/posts"
+        elif name == "post_detail":
+            path = f"/api/posts/{rng.choice(post_ids)}"
+        elif name == "jobs":
+            path = "/api/jobs"
+        elif name == "apply":
+            method, path = "POST", "/api/apply"
+            # vary the resume so the extraction cache doesn't turn every upload into a hit
+            content = RESUME + f"ref {rng.random()}\n".encode()
+            body, ctype = multipart(
+                {"name": "Jane Doe", "email": "jane.doe@example.com", "job_title": rng.choice(job_titles),
+                 "desired_skills": "python,react,aws"},
+                "resume", "resume.txt", content,
+            )
+            headers["Content-Type"] = ctype
+        else:
+            method, path = "POST", "/api/chatbot"
+            body = json.dumps({"question": "What services do you offer?"}).encode()
+            headers["Content-Type"] = "application/json"
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status < 400
+
+    try:
+        return run_load(do_request, args.duration, args.concurrency, args.seed)
+    finally:
+        server.shutdown()
+
+
+# ----------------------------
+# sqlalchemy mode: same mix through models.py on SQLite
+# ----------------------------
+def bench_sqlalchemy(args):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import scoped_session, sessionmaker
+    from models import Application, Base, BlogPost, Job, Page
+
+    path = os.path.join(tempfile.mkdtemp(prefix="api_bench_"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = scoped_session(sessionmaker(bind=engine))
+
+    from resume import parse_resume_text_simple, score_resume
+    from seed import ensure_seed_data
+    from store import DB
+
+    ensure_seed_data()
+    db = Session()
+    for name, content in DB["pages"].items():
+        db.add(Page(name=name, content=content))
+    for j in DB["jobs"]:
+        db.add(Job(title=j["title"], skills=j["skills"], description=j["description"]))
+    for p in DB["blog"]:
+        db.add(BlogPost(id=p["id"], title=p["title"], content=p["content"], summary=p["summary"]))
+    db.commit()
+    Session.remove()
+    post_ids = [p["id"] for p in DB["blog"]]
+
+    def do_request(rng, name, state):
+        db = Session()
+        try:
+            if name in ("page_services", "page_home"):
+                page = db.query(Page).filter_by(tenant_id="default", name=name[5:]).first()
+                json.dumps(page.content)
+            elif name == "posts":
+                json.dumps([{"id": p.id, "title": p.title, "content": p.content} for p in db.query(BlogPost).filter_by(tenant_id="default")])
+            elif name == "post_detail":
+                db.get(BlogPost, rng.choice(post_ids)).title
+            elif name == "jobs":
+                json.dumps([{"id": j.id, "title": j.title, "skills": j.skills} for j in db.query(Job).filter_by(tenant_id="default")])
+            elif name == "apply":
+                parsed = parse_resume_text_simple(RESUME.decode())
+                db.add(Application(name="Jane Doe", email="jane.doe@example.com", job_title="Data Engineer",
+                                   parsed=parsed, score=score_resume(parsed, ["python", "aws"])))
+                db.commit()
+            else:
+                for page in db.query(Page).filter_by(tenant_id="default"):
+                    json.dumps(page.content)
+                time.sleep(args.llm_latency_ms / 1000.0)
+            return True
+        finally:
+            Session.remove()
+
+    return run_load(do_request, args.duration, args.concurrency, args.seed)
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regression messages (scenario-level p95 and rps)."""
+    problems = []
+    if baseline.get("mode") != report["mode"]:
+        return [f"baseline mode {baseline.get('mode')!r} does not match {report['mode']!r}"]
+    for name, cur in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {base['p95_ms']}ms -> {cur['p95_ms']}ms")
+        if base["rps"] and cur["rps"] < base["rps"] * (1 - tolerance):
+            problems.append(f"{name}: rps {base['rps']} -> {cur['rps']}")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Backend API load test")
+    ap.add_argument("--mode", choices=["memory", "sqlalchemy"], default="memory")
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    ap.add_argument("--concurrency", type=int, default=8, help="client threads")
+    ap.add_argument("--llm-latency-ms", type=float, default=50.0, help="stub LLM latency for chatbot")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--json", help="write the report to this file")
+    ap.add_argument("--compare", help="baseline report to diff against")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = ap.parse_args()
+    # memory mode chdirs into a scratch dir; resolve report paths first
+    args.json = args.json and os.path.abspath(args.json)
+    args.compare = args.compare and os.path.abspath(args.compare)
+
+    results = bench_memory(args) if args.mode == "memory" else bench_sqlalchemy(args)
+    report = {
+        "mode": args.mode,
+        "config": {"duration": args.duration, "concurrency": args.concurrency,
+                   "llm_latency_ms": args.llm_latency_ms, "seed": args.seed},
+        "env": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+
+    print(f"{'scenario':<16}{'reqs':>8}{'err':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['requests']:>8}{r['errors']:>6}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for p in problems:
+            print("REGRESSION", p)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# cold_start.py
+# Cold-start time of the backend: a fresh interpreter importing app.py (which runs
+# create_app()) and serving its first request, repeated in new processes.
+#
+# Exits 1 when the median import + first request exceeds --target-ms, so it can
+# gate deploys to serverless / autoscaling targets where every new instance pays it.
+#
+#   python benchmarks/cold_start.py --runs 15 --target-ms 250
+#   python benchmarks/cold_start.py --importtime   # slowest imports of one run
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, %r)
+import app
+t1 = time.perf_counter()
+resp = app.app.test_client().get("/api/pages/home")
+t2 = time.perf_counter()
+assert resp.status_code == 200, resp.status_code
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_request_ms": (t2 - t1) * 1000}))
+""" % BACKEND_DIR
+
+
+def run_once(workdir):
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=workdir, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(workdir, n=15):
+    """Run one import under -X importtime; return the n slowest (cumulative us, module)."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE], cwd=workdir,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure backend cold-start time")
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--target-ms", type=float, default=250.0, help="budget for median import + first request")
+    ap.add_argument("--importtime", action="store_true", help="also list the slowest imports")
+    ap.add_argument("--json", help="write the report to this file")
+    args = ap.parse_args()
+
+    # app.py must not need anything from the cwd; run it somewhere empty
+    workdir = tempfile.mkdtemp(prefix="cold_start_")
+    os.environ.setdefault("ADMIN_PASSWORD_HASH", "pbkdf2:sha256:1000$bench$unused")  # required to start
+    run_once(workdir)  # warm the OS file cache and __pycache__ so runs measure startup, not disk
+    samples = [run_once(workdir) for _ in range(args.runs)]
+    total = sorted(s["import_ms"] + s["first_request_ms"] for s in samples)
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "first_request_ms_median": round(statistics.median(s["first_request_ms"] for s in samples), 1),
+        "total_ms_median": round(statistics.median(total), 1),
+        "total_ms_max": round(total[-1], 1),
+        "target_ms": args.target_ms,
+        "data_dir_created": os.path.exists(os.path.join(workdir, "data")),
+    }
+    print(f"import {report['import_ms_median']} ms + first request {report['first_request_ms_median']} ms"
+          f" = {report['total_ms_median']} ms median ({report['total_ms_max']} ms max, {args.runs} runs)")
+    if report["data_dir_created"]:
+        print("warning: startup created ./data (it should only appear on first upload/cache write)")
+    if args.importtime:
+        print("\nslowest imports (cumulative):")
+        for us, name in slowest_imports(workdir):
+            print(f"  {us / 1000:8.1f} ms  {name}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if report["total_ms_median"] > args.target_ms:
+        print(f"FAIL: over the {args.target_ms:.0f} ms cold-start target")
+        sys.exit(1)
+    print(f"OK: within the {args.target_ms:.0f} ms cold-start target")
+
+
+if __name__ == "__main__":
+    main()
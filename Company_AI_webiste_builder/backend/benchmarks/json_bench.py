@@ -0,0 +1,74 @@
+# json_bench.py
+# Compare JSON encoding throughput for the payloads we serve most:
+# the seeded `services` page and the admin applications list.
+#
+#   python benchmarks/json_bench.py --applications 5000 --seconds 2
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from seed import ensure_seed_data  # noqa: E402
+from store import DB  # noqa: E402
+from json_provider import USE_ORJSON, RawJSON, dumps_bytes  # noqa: E402
+
+
+def make_applications(n):
+    apps = []
+    for i in range(n):
+        apps.append({
+            "id": str(uuid.uuid4()),
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "job_title": "Machine Learning Engineer",
+            "resume_path": f"data/uploads/resume_{i}.pdf",
+            "parsed": {"name": f"Candidate {i}", "email": f"candidate{i}@example.com",
+                       "skills": ["python", "tensorflow", "aws", "sql"], "experience_years": i % 12},
+            "score": {"match_percent": float(i % 100), "matched_skills": ["python", "aws"]},
+        })
+    return apps
+
+
+def bench(fn, seconds):
+    """Run fn repeatedly for ~seconds; return (ops/sec, bytes per op)."""
+    size = len(fn())
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(10):
+            fn()
+        n += 10
+    return n / (time.perf_counter() - start), size
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--applications", type=int, default=5000)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args()
+
+    ensure_seed_data()
+    services = DB["pages"]["services"]
+    applications = make_applications(args.applications)
+    cached_services = RawJSON(dumps_bytes(services))
+
+    cases = [
+        ("services page / stdlib json.dumps", lambda: json.dumps(services).encode("utf-8")),
+        ("services page / provider", lambda: dumps_bytes(services)),
+        ("services page / cached fragment", lambda: dumps_bytes({"page": cached_services})),
+        (f"applications x{args.applications} / stdlib json.dumps", lambda: json.dumps(applications).encode("utf-8")),
+        (f"applications x{args.applications} / provider", lambda: dumps_bytes(applications)),
+    ]
+    print(f"encoder: {'orjson' if USE_ORJSON else 'stdlib json'}")
+    for name, fn in cases:
+        ops, size = bench(fn, args.seconds)
+        print(f"{name:<50} {ops:>12,.0f} ops/s {ops * size / 1e6:>10,.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
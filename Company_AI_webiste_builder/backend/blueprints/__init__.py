@@ -0,0 +1,8 @@
+# blueprints/
+# One Flask blueprint per subsystem, registered by app.create_app():
+#   pages    health, metrics, site pages, contact form
+#   careers  jobs, applications, resume parsing, portfolios
+#   ai       chatbot, SEO, theme, auto-build, voice (LLM-backed)
+#   admin    auth, admin-only views and the /api/admin/* guard
+#   blog     public blog posts
+#   media    image proxy (resize, WebP/AVIF, disk cache)
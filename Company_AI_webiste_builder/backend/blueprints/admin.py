@@ -0,0 +1,294 @@
+# blueprints/admin.py
+import datetime
+
+from flask import Blueprint, Response, g, jsonify, request
+
+import auth
+import changefeed
+import dedup
+import exports
+import images
+import outbox
+import profiler
+import revisions
+import store
+import tenants
+from store import DB, DEFAULT_TENANT, page_json, persist
+
+bp = Blueprint("admin", __name__)
+
+# Simple auth/login for admin (demo). These are platform admins (any site, tenant management);
+# each tenant lists its own site admins in _site["admins"].
+ADMIN_WHITELIST = ["admin1@yourdomain.com", "admin2@yourdomain.com"]
+
+
+# ----------------------------
+# Admin auth middleware
+# ----------------------------
+@bp.before_app_request
+def require_admin_token():
+    """Protect /api/admin/* with a signed bearer token (verified in memory, no DB lookup)."""
+    if not request.path.startswith("/api/admin/") or request.method == "OPTIONS":
+        return None
+    token = auth.bearer_token(request.headers)
+    if token is None and request.path == "/api/admin/events":
+        token = request.args.get("access_token")  # EventSource cannot send headers
+    claims = auth.verify_token(token)
+    if claims is None:
+        return jsonify({"error": "Admin authentication required"}), 401
+    # site admins only administer their own site; platform tokens (default tenant) work everywhere
+    if claims.get("tid", DEFAULT_TENANT) not in (DEFAULT_TENANT, store.current_tenant()):
+        return jsonify({"error": "Token is not valid for this site"}), 403
+    g.admin = claims
+    return None
+
+@bp.route('/api/auth/login', methods=['POST'])
+def auth_login():
+    data = request.get_json() or {}
+    email = data.get('email')
+    password = data.get('password')
+    if not email or not password:
+        return jsonify({"error":"email and password required"}), 400
+    if email in ADMIN_WHITELIST:
+        tenant, pw_hash = DEFAULT_TENANT, auth.PASSWORD_HASH
+    elif email in tenants.site().get("admins", []):
+        tenant, pw_hash = store.current_tenant(), tenants.site().get("admin_password_hash")
+    else:
+        return jsonify({"error":"not allowed"}), 403
+    if not auth.check_password(password, pw_hash):
+        return jsonify({"error":"invalid email or password"}), 401
+    token, claims = auth.issue_token(email, tenant=tenant)
+    return jsonify({"token": token, "expires_at": claims["exp"], "tenant": tenant})
+
+@bp.route('/api/auth/logout', methods=['POST'])
+def auth_logout():
+    claims = auth.verify_token(auth.bearer_token(request.headers))
+    if claims is None:
+        return jsonify({"error": "invalid or expired token"}), 401
+    auth.revoke(claims)
+    return jsonify({"status": "logged_out"})
+
+# ----------------------------
+# Content management
+# ----------------------------
+@bp.route("/api/admin/pages/<pagename>", methods=["POST"])
+def admin_update_page(pagename):
+    data = request.get_json() or {}
+    if pagename not in DB["pages"] and tenants.over_quota("pages"):
+        return jsonify({"error": f"Page quota reached ({tenants.quota('pages')})"}), 403
+    rev = revisions.record(pagename, data, author=g.admin.get("sub"), message=request.args.get("message"))
+    # add a simplified FAQ entry for chatbot context
+    faq = {"q": f"What is on the {pagename} page?", "a": page_json(pagename).data.decode("utf-8")}
+    DB.setdefault("faq", []).append(faq)
+    persist("append", ["faq"], faq)
+    return jsonify({"status":"ok", "page": data, "rev": rev["rev"]})
+
+# Page history (see revisions.py): deltas against periodic snapshots
+@bp.route("/api/admin/pages/<pagename>/revisions", methods=["GET"])
+def admin_page_revisions(pagename):
+    return jsonify({"page": pagename, "current": revisions.current_rev(pagename),
+                    "revisions": revisions.summary(pagename)})
+
+@bp.route("/api/admin/pages/<pagename>/revisions/<int:rev>", methods=["GET"])
+def admin_page_revision(pagename, rev):
+    content = revisions.content_at(pagename, rev)
+    if content is None:
+        return jsonify({"error": "Revision not found"}), 404
+    return jsonify({"page": pagename, "rev": rev, "content": content})
+
+@bp.route("/api/admin/pages/<pagename>/rollback", methods=["POST"])
+def admin_page_rollback(pagename):
+    rev = (request.get_json() or {}).get("rev")
+    if not isinstance(rev, int):
+        return jsonify({"error": "Provide integer 'rev' in JSON body"}), 400
+    entry = revisions.rollback(pagename, rev, author=g.admin.get("sub"))
+    if entry is None:
+        return jsonify({"error": "Revision not found"}), 404
+    return jsonify({"status": "ok", "rev": entry["rev"], "page": DB["pages"][pagename]})
+
+# Drafts: saved next to the live page, previewed, then published (or discarded)
+@bp.route("/api/admin/pages/<pagename>/draft", methods=["GET", "POST", "DELETE"])
+def admin_page_draft(pagename):
+    if request.method == "POST":
+        draft = revisions.save_draft(pagename, request.get_json() or {}, author=g.admin.get("sub"))
+        return jsonify({"status": "saved", "base_rev": draft["base_rev"], "changes": len(draft["patch"])})
+    if request.method == "DELETE":
+        if not revisions.discard_draft(pagename):
+            return jsonify({"error": "No draft"}), 404
+        return jsonify({"status": "discarded"})
+    try:
+        content, draft = revisions.preview_draft(pagename)
+    except revisions.PatchConflict as e:
+        return jsonify({"error": f"Draft does not apply: {e}"}), 409
+    if draft is None:
+        return jsonify({"error": "No draft"}), 404
+    return jsonify({"page": pagename, "base_rev": draft["base_rev"], "current": revisions.current_rev(pagename),
+                    "author": draft.get("author"), "updated": draft["updated"], "patch": draft["patch"], "content": content})
+
+@bp.route("/api/admin/pages/<pagename>/draft/publish", methods=["POST"])
+def admin_page_publish(pagename):
+    if pagename not in DB["pages"] and tenants.over_quota("pages"):
+        return jsonify({"error": f"Page quota reached ({tenants.quota('pages')})"}), 403
+    try:
+        entry = revisions.publish_draft(pagename, author=g.admin.get("sub"))
+    except revisions.PatchConflict as e:
+        return jsonify({"error": f"Draft conflicts with the current page: {e}"}), 409
+    if entry is None:
+        return jsonify({"error": "No draft"}), 404
+    return jsonify({"status": "published", "rev": entry["rev"], "page": DB["pages"][pagename]})
+
+# Admin seeding utility (idempotent)
+@bp.route("/api/admin/ensure_seed", methods=["GET","POST"])
+def api_ensure_seed():
+    from seed import ensure_seed_data  # sample content is only loaded when asked for
+
+    ensure_seed_data()  # persists what it adds, so the journal and derived indexes follow
+    return jsonify({"status":"seeded_or_exists","summary": {
+        "pages": list(DB.get("pages",{}).keys()),
+        "jobs": len(DB.get("jobs",[])),
+        "applications": len(DB.get("applications",[])),
+        "blog_posts": len(DB.get("blog",[]))
+    }})
+
+# Optional admin endpoint to list applications
+@bp.route("/api/admin/applications", methods=["GET"])
+def list_applications():
+    return jsonify(DB.get("applications", []))
+
+# Admin: duplicate application clusters (see dedup.py)
+@bp.route("/api/admin/applications/duplicates", methods=["GET"])
+def list_duplicate_clusters():
+    return jsonify(dedup.clusters(min_size=max(2, request.args.get("min_size", default=2, type=int))))
+
+# Admin: list contact messages
+@bp.route('/api/admin/messages', methods=['GET'])
+def admin_list_messages():
+    return jsonify(DB.get('messages', []))
+
+# Admin: streaming bulk export (see exports.py)
+@bp.route('/api/admin/export/<collection>', methods=['GET'])
+def admin_export(collection):
+    if collection not in exports.COLUMNS:
+        return jsonify({"error": f"Unknown collection '{collection}'", "collections": list(exports.COLUMNS)}), 404
+    fmt = request.args.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        return jsonify({"error": f"Unknown format '{fmt}'", "formats": list(exports.FORMATS)}), 400
+    if fmt == "parquet" and not exports.USE_PYARROW:
+        return jsonify({"error": "Parquet export requires pyarrow"}), 501
+    # bind the tenant's list now: the generator runs after the view has returned
+    records = DB.get(collection, [])
+    filename = f"{collection}-{store.current_tenant()}-{datetime.date.today().isoformat()}.{fmt}"
+    return Response(exports.WRITERS[fmt](collection, records), mimetype=exports.FORMATS[fmt],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"})
+
+# Admin: outgoing email (see outbox.py)
+@bp.route('/api/admin/outbox', methods=['GET'])
+def admin_outbox():
+    return jsonify(outbox.status())
+
+@bp.route('/api/admin/outbox/<msg_id>/retry', methods=['POST'])
+def admin_outbox_retry(msg_id):
+    msg = outbox.requeue(msg_id)
+    if msg is None:
+        return jsonify({"error": "No dead-lettered message with that id"}), 404
+    return jsonify({"status": "requeued", "message": msg})
+
+# Admin: media library for page images, served through /api/img?src=media:<name> (see images.py)
+@bp.route('/api/admin/media', methods=['POST'])
+def admin_upload_media():
+    file = request.files.get("image")
+    if not file:
+        return jsonify({"error": "Attach an image (form-data key 'image')"}), 400
+    try:
+        name = images.save_media(file.read(images.MAX_SOURCE_BYTES + 1))
+    except images.ImageError as e:
+        return jsonify({"error": str(e)}), e.status
+    return jsonify({"src": f"media:{name}", "url": f"/api/img?src=media:{name}"}), 201
+
+# Admin: live change feed (see changefeed.py), Server-Sent Events
+@bp.route('/api/admin/events', methods=['GET'])
+def admin_events():
+    types = [t for t in request.args.get("types", "").split(",") if t]
+    unknown = [t for t in types if t not in changefeed.TYPES]
+    if unknown:
+        return jsonify({"error": f"Unknown type(s): {unknown}", "types": list(changefeed.TYPES)}), 400
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    # each stream holds a worker thread here (asgi.py serves them without one): cap them
+    if not changefeed.acquire_stream():
+        return jsonify({"error": "Too many open event streams on this server; poll the lists instead",
+                        "retry_after": 60}), 503, {"Retry-After": "60"}
+    resp = Response(changefeed.stream(store.current_tenant(), types, last_id), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    resp.call_on_close(changefeed.release_stream)
+    return resp
+
+# Admin: captured request profiles (see profiler.py)
+@bp.route('/api/admin/profiles', methods=['GET'])
+def admin_list_profiles():
+    return jsonify(profiler.list_profiles())
+
+@bp.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def admin_get_profile(profile_id):
+    top = request.args.get("top", default=20, type=int)
+    rec = profiler.top_functions(profile_id, n=top, sort=request.args.get("sort", "cumulative"))
+    if rec is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify(rec)
+
+# ----------------------------
+# Tenants (platform admins only)
+# ----------------------------
+def _platform_only():
+    if g.admin.get("tid", DEFAULT_TENANT) != DEFAULT_TENANT:
+        return jsonify({"error": "Platform admin required"}), 403
+    return None
+
+def _site_settings(tenant_id):
+    return {k: v for k, v in tenants.site(tenant_id).items() if k != "admin_password_hash"}
+
+@bp.route('/api/admin/tenants', methods=['GET'])
+def admin_list_tenants():
+    denied = _platform_only()
+    if denied:
+        return denied
+    out = []
+    for tenant_id in store.tenant_ids():
+        db = store.tenant_db(tenant_id)
+        out.append({"id": tenant_id, **_site_settings(tenant_id),
+                    "pages": len(db.get("pages", {})), "jobs": len(db.get("jobs", [])),
+                    "applications": len(db.get("applications", []))})
+    return jsonify(out)
+
+@bp.route('/api/admin/tenants', methods=['POST'])
+def admin_create_tenant():
+    denied = _platform_only()
+    if denied:
+        return denied
+    data = request.get_json() or {}
+    try:
+        tenants.create(data.get("id"), data.get("domains") or [], data.get("admins") or [], data.get("quotas"),
+                       admin_password=data.get("admin_password"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if data.get("seed"):
+        from seed import ensure_seed_data
+
+        with store.using_tenant(data["id"]):
+            ensure_seed_data()
+    return jsonify({"status": "created", "tenant": {"id": data["id"], **_site_settings(data["id"])}}), 201
+
+@bp.route('/api/admin/tenants/<tenant_id>', methods=['PATCH'])
+def admin_update_tenant(tenant_id):
+    denied = _platform_only()
+    if denied:
+        return denied
+    data = request.get_json() or {}
+    try:
+        tenants.update(tenant_id, data.get("domains"), data.get("admins"), data.get("quotas"),
+                       admin_password=data.get("admin_password"))
+    except KeyError:
+        return jsonify({"error": f"Unknown tenant '{tenant_id}'"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"status": "updated", "tenant": {"id": tenant_id, **_site_settings(tenant_id)}})
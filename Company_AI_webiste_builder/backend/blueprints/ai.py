@@ -0,0 +1,161 @@
+# blueprints/ai.py
+# LLM-backed endpoints. The plan_* functions are shared with the async routes in asgi.py.
+import re
+
+from flask import Blueprint, jsonify, request
+
+import llm
+import search
+import site_builder
+import themes
+import tokens
+from ratelimit import limited
+from store import DB, page_json, persist
+
+bp = Blueprint("ai", __name__)
+
+
+# ----------------------------
+# Chatbot (contextual)
+# ----------------------------
+@bp.route("/api/chatbot", methods=["POST"])
+@limited("chat")
+def chatbot():
+    body, status = llm.run_llm_plan(plan_chatbot(request.get_json() or {}))
+    return jsonify(body), status
+
+def plan_chatbot(data):
+    q = data.get("question", "")
+    if not q:
+        return {"result": {"error":"Provide 'question' in body"}, "status": 400}
+    if not llm.USE_OPENAI:
+        # naive fallback
+        basic = "; ".join([f"{k}:{str(list(v.keys())[:3])}" for k,v in DB.get("pages", {}).items()])
+        return {"result": {"answer": f"Demo-mode answer. Pages summary: {basic}"}}
+    q = tokens.truncate(q, 200, "chatbot")
+    head = "Use the following context to answer concisely to the question.\n\nCONTEXT:\n"
+    tail = f"\n\nQUESTION: {q}\n\nAnswer:"
+    # Build context within the budget: pages most relevant to the question first, then recent FAQ
+    ranked = []
+    for _, doc, _ in search.get_index().search(q, types=("page", "service")):
+        name = "services" if doc["type"] == "service" else doc["id"]
+        if name not in ranked:
+            ranked.append(name)
+    context = []
+    for k in ranked + [k for k in list(DB.get("pages", {})) if k not in ranked]:
+        raw = page_json(k)
+        if raw is not None:
+            context.append(f"Page {k}: {raw.data.decode('utf-8')}")
+    for f in reversed(DB.get("faq", [])[-10:]):
+        context.append(f"FAQ: Q:{f.get('q')} A:{f.get('a')}")
+    room = tokens.budget("chatbot") - tokens.count(head) - tokens.count(tail)
+    context, cut = tokens.fit(context, room)
+    if cut:
+        tokens.TRUNCATIONS.inc("chatbot", "fit")
+    prompt = head + "\n\n".join(context) + tail
+    return {"endpoint": "chatbot", "prompt": prompt, "max_tokens": 200, "finish": lambda ans: {"answer": ans}}
+
+# ----------------------------
+# SEO analyzer
+# ----------------------------
+SEO_PROMPT = "Analyze this blog content for SEO. Provide 5 keyword suggestions, a short SEO score (0-100), and a one-line meta description. Content:\n\n{}"
+SEO_SUMMARY_PROMPT = "The following are summaries of consecutive parts of one long blog post. Analyze the post for SEO. Provide 5 keyword suggestions, a short SEO score (0-100), and a one-line meta description.\n\n{}"
+SEO_MAX_PARTS = 16  # beyond this, the tail of the content is dropped before summarizing
+
+@bp.route("/api/ai/seo_analyze", methods=["POST"])
+@limited("ai")
+def seo_analyze():
+    body, status = llm.run_llm_plan(plan_seo_analyze(request.get_json() or {}))
+    return jsonify(body), status
+
+def plan_seo_analyze(data):
+    content = data.get("content", "")
+    if not content:
+        return {"result": {"error":"Provide 'content' in JSON body"}, "status": 400}
+    if not llm.USE_OPENAI:
+        words = re.findall(r"\w+", content.lower())
+        common = {}
+        for w in words:
+            if len(w)>4:
+                common[w] = common.get(w,0)+1
+        top = sorted(common.items(), key=lambda x:-x[1])[:5]
+        keywords = [t[0] for t in top]
+        score = min(85, 50 + len(top)*5)
+        meta = (content[:120] + "...") if len(content)>120 else content
+        return {"result": {"keywords": keywords, "score": score, "meta": meta}}
+    if tokens.count(content) <= tokens.budget("seo_analyze"):
+        return {"endpoint": "seo_analyze", "prompt": SEO_PROMPT.format(content), "max_tokens": 200,
+                "finish": lambda out: {"analysis": out}}
+    # too long for one prompt: summarize the parts in parallel (map), then analyze the summaries (reduce)
+    tokens.TRUNCATIONS.inc("seo_analyze", "map_reduce")
+    parts = tokens.chunks(content, tokens.budget("seo_chunk"))[:SEO_MAX_PARTS]
+    prompts = {i: ("Summarize this part of a blog post in 3-4 bullet points, keeping its key terms and phrases:\n\n" + part, 150)
+               for i, part in enumerate(parts)}
+
+    def reduce(summaries):
+        joined = "\n\n".join(f"Part {i + 1}:\n{summaries[i]}" for i in range(len(parts)))
+        prompt = SEO_SUMMARY_PROMPT.format(tokens.truncate(joined, tokens.budget("seo_analyze") - 60, "seo_analyze"))
+        return llm.Chain({"endpoint": "seo_analyze", "prompt": prompt, "max_tokens": 200,
+                          "finish": lambda out: {"analysis": out, "summarized_parts": len(parts)}})
+    return {"endpoint": "seo_analyze", "prompts": prompts, "finish": reduce}
+
+# ----------------------------
+# Theme customizer
+# ----------------------------
+@bp.route("/api/ai/theme", methods=["POST"])
+@limited("ai")
+def theme_customize():
+    body, status = llm.run_llm_plan(plan_theme(request.get_json() or {}))
+    return jsonify(body), status
+
+def plan_theme(data):
+    tone = themes.normalize_tone(tokens.truncate(str(data.get("tone", "professional")), 30, "theme"))
+    theme = None if data.get("refresh") else themes.cached(tone)
+    if theme is not None:
+        return {"result": themes.response(tone, theme)}
+    if not llm.USE_OPENAI:
+        j = dict(themes.BUILTIN["professional"])
+        DB.setdefault("themes", {})[tone] = j
+        persist("set", ["themes", tone], j)
+        return {"result": themes.response(tone, j)}
+
+    def finish(out):
+        j = themes.parse(out)
+        if j is None:
+            return {"theme_suggestion": out}
+        DB.setdefault("themes", {})[tone] = j
+        persist("set", ["themes", tone], j)
+        return themes.response(tone, j)
+    return {"endpoint": "theme", "prompt": themes.prompt(tone), "max_tokens": 200, "finish": finish}
+
+# ----------------------------
+# AI Auto Website Builder
+# ----------------------------
+@bp.route("/api/ai/auto_build", methods=["POST"])
+@limited("ai")
+def ai_auto_build():
+    body, status = llm.run_llm_plan(plan_auto_build(request.get_json() or {}))
+    return jsonify(body), status
+
+def plan_auto_build(payload):
+    # section-level, incremental: only sections whose inputs changed are regenerated
+    return site_builder.plan(payload)
+
+# ----------------------------
+# Voice text (rewrite for narration)
+# ----------------------------
+@bp.route("/api/voice/text", methods=["POST"])
+@limited("ai")
+def voice_text():
+    body, status = llm.run_llm_plan(plan_voice_text(request.get_json() or {}))
+    return jsonify(body), status
+
+def plan_voice_text(data):
+    text = data.get("text","")
+    if not text:
+        return {"result": {"error":"Provide 'text' to convert to speech-friendly form"}, "status": 400}
+    if not llm.USE_OPENAI:
+        return {"result": {"speech_text": re.sub(r"\s+", " ", text).strip()}}
+    text = tokens.truncate(text, tokens.budget("voice_text") - 20, "voice_text")
+    prompt = f"Rewrite the following text as a short friendly spoken introduction (40-70 words):\n\n{text}"
+    return {"endpoint": "voice_text", "prompt": prompt, "max_tokens": 120, "finish": lambda out: {"speech_text": out}}
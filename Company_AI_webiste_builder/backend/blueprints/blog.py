@@ -0,0 +1,22 @@
+# blueprints/blog.py
+from flask import Blueprint, jsonify
+
+from store import DB
+
+bp = Blueprint("blog", __name__)
+
+
+# Public blog endpoints
+@bp.route('/api/posts', methods=['GET'])
+def get_posts():
+    # Return blog posts list
+    return jsonify(DB.get('blog', []))
+
+
+@bp.route('/api/posts/<post_id>', methods=['GET'])
+def get_post(post_id):
+    posts = DB.get('blog', [])
+    post = next((p for p in posts if str(p.get('id')) == str(post_id)), None)
+    if not post:
+        return jsonify({"error": "Post not found"}), 404
+    return jsonify(post)
@@ -0,0 +1,207 @@
+# blueprints/careers.py
+import datetime
+import os
+import uuid
+
+from flask import Blueprint, jsonify, request
+
+import dedup
+import jobmatch
+import llm
+import outbox
+import portfolio_render
+import store
+import tenants
+import tokens
+from extract import extract_file, extract_text
+from ratelimit import limited
+from resume import parse_resume_text_simple, score_resume
+from store import DB, persist, save_upload
+
+# cli_group=None keeps `flask render-portfolios` at the top level
+bp = Blueprint("careers", __name__, cli_group=None)
+
+
+def _render(pid, rec, theme=None):
+    # portfolio ids are only unique within a tenant (seeded sites share "sample-portfolio-1")
+    return portfolio_render.render((store.current_tenant(), pid), rec, theme)
+
+@bp.route("/api/jobs", methods=["GET","POST"])
+def jobs():
+    if request.method == "POST":
+        job = request.get_json()
+        if tenants.over_quota("jobs"):
+            return jsonify({"error": f"Job quota reached ({tenants.quota('jobs')})"}), 403
+        job['id'] = job.get('id') or str(uuid.uuid4())
+        job.setdefault('date_posted', datetime.date.today().isoformat())  # JobPosting datePosted (seo.py)
+        DB.setdefault("jobs", []).append(job)
+        persist("append", ["jobs"], job)
+        return jsonify({"status":"job_added", "job": job})
+    return jsonify(DB.get("jobs", []))
+
+@bp.route("/api/apply", methods=["POST"])
+def apply_job():
+    form = request.form.to_dict()
+    file = request.files.get("resume")
+    saved_path = str(save_upload(file)) if file else None
+    app_entry = {
+        "id": str(uuid.uuid4()),
+        "name": form.get("name"),
+        "email": form.get("email"),
+        "job_title": form.get("job_title"),
+        "resume_path": saved_path
+    }
+    # duplicate detection (dedup.py): an identical or near-identical resume reuses the earlier parse;
+    # it is a re-application only for the same job, otherwise the same candidate applying elsewhere
+    index = dedup.get_index()
+    fingerprint = {"sha256": dedup.file_sha256(saved_path) if saved_path else None, "minhash": None}
+    original, reason, sim = (index.exact(fingerprint["sha256"], app_entry["job_title"]) if fingerprint["sha256"] else None), "exact", 1.0
+    if original is not None:
+        fingerprint["minhash"] = original["fingerprint"].get("minhash")
+        if original.get("resume_path") and original["resume_path"] != saved_path:
+            os.remove(saved_path)  # same bytes are already stored (upload names are unique, see save_upload)
+            app_entry["resume_path"] = original["resume_path"]
+    txt = None
+    if saved_path and original is None:
+        try:
+            txt = extract_file(saved_path)
+            fingerprint["minhash"] = dedup.minhash(txt)
+        except Exception:
+            txt = None
+    if fingerprint["minhash"] and (original is None or not dedup.same_job(original, app_entry)):
+        match, match_sim = index.near(fingerprint["minhash"], app_entry["job_title"])
+        if match is not None and (original is None or dedup.same_job(match, app_entry)):
+            original, reason, sim = match, "near", match_sim
+    if original is not None:
+        parsed = dict(original.get("parsed") or {})  # only the parse is reused; the score depends on this form
+    else:
+        # parse resume (simple)
+        parsed = {}
+        if txt:
+            try:
+                parsed = parse_resume_text_simple(txt)
+            except Exception:
+                parsed = {}
+    if original is not None and not dedup.same_job(original, app_entry):
+        app_entry.update(same_candidate_as=original["id"], match_reason=reason, similarity=sim)
+        original = None
+    if original is None:
+        original, reason, sim = index.same_email_job(app_entry["email"], app_entry["job_title"]), "email_job", None
+    desired_skills = (form.get("desired_skills") or "").split(",") if form.get("desired_skills") else []
+    score = score_resume(parsed, desired_skills)
+    app_entry['parsed'] = parsed
+    app_entry['score'] = score
+    app_entry['fingerprint'] = fingerprint
+    if original is not None:
+        app_entry.update(duplicate_of=original["id"], duplicate_reason=reason, similarity=sim)
+    DB.setdefault("applications", []).append(app_entry)
+    persist("append", ["applications"], app_entry)
+    # acknowledgment email goes through the outbox (sent in the background; not for re-applications)
+    address = outbox.clean_address(app_entry["email"])
+    if outbox.ENABLED and address and not app_entry.get("duplicate_of"):
+        outbox.enqueue("application_ack", address,
+                       {"name": app_entry["name"], "job_title": app_entry["job_title"], "application_id": app_entry["id"]})
+    return jsonify({"status":"received", "application": app_entry})
+
+# ----------------------------
+# Resume parse + match
+# ----------------------------
+@bp.route("/api/resume/parse", methods=["POST"])
+def resume_parse():
+    file = request.files.get("resume")
+    desired = (request.form.get("desired_skills") or "").split(",") if request.form.get("desired_skills") else []
+    if not file:
+        return jsonify({"error":"Attach resume file (key name 'resume')"}), 400
+    path = save_upload(file)
+    text = ""
+    try:
+        text = extract_file(path)
+    except:
+        text = ""
+    parsed = parse_resume_text_simple(text)
+    score = score_resume(parsed, desired)
+    return jsonify({"parsed": parsed, "score": score})
+
+@bp.route("/api/jobs/match", methods=["POST"])
+@limited("upload")
+def jobs_match():
+    """Rank every job against one resume (file 'resume', or pasted 'text'); the file is not stored."""
+    file = request.files.get("resume")
+    if file:
+        text = extract_text(file.read(), file.filename or "")
+    else:
+        text = request.form.get("text") or (request.get_json(silent=True) or {}).get("text") or ""
+    if not text.strip():
+        return jsonify({"error": "Attach a resume file (key name 'resume') or send its 'text'"}), 400
+    try:
+        limit = max(1, int(request.args.get("limit", 10)))
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+    parsed = parse_resume_text_simple(text)
+    return jsonify({"parsed": parsed, **jobmatch.match(text, parsed, limit)})
+
+# ----------------------------
+# Portfolio generator
+# ----------------------------
+@bp.route("/api/portfolio/generate", methods=["POST"])
+@limited("upload")
+def portfolio_generate():
+    file = request.files.get("resume")
+    if not file:
+        return jsonify({"error":"Attach resume file (form-data key 'resume')"}), 400
+    if tenants.over_quota("portfolios"):
+        return jsonify({"error": f"Portfolio quota reached ({tenants.quota('portfolios')})"}), 403
+    path = save_upload(file)
+    text = ""
+    try:
+        # PDF / DOCX / TXT are detected by content and extracted in the worker pool
+        text = extract_file(path)
+    except Exception:
+        text = ""
+    parsed = parse_resume_text_simple(text)
+    theme = request.form.get("theme") or portfolio_render.DEFAULT_THEME
+    if theme not in portfolio_render.themes():
+        return jsonify({"error": f"Unknown theme '{theme}'", "themes": portfolio_render.themes()}), 400
+    if llm.USE_OPENAI:
+        # the LLM only writes the intro text; markup comes from the (escaped) theme template
+        candidate = tokens.truncate(str(parsed), tokens.budget("portfolio") - 40, "portfolio")
+        prompt = f"Write a short, friendly 2-3 sentence portfolio introduction (plain text, no HTML) for this candidate: {candidate}"
+        parsed["intro"] = llm.complete("portfolio", prompt, max_tokens=150)
+    pid = str(uuid.uuid4())
+    rec = {"meta": parsed, "theme": theme, "version": 1}
+    rec["html"] = _render(pid, rec)
+    DB.setdefault("portfolios", {})[pid] = rec
+    persist("set", ["portfolios", pid], rec)
+    return jsonify({"portfolio_id": pid, "preview_html": rec["html"][:800]})
+
+@bp.route("/api/portfolio/<pid>", methods=["GET"])
+def portfolio_get(pid):
+    rec = DB.get("portfolios", {}).get(pid)
+    if not rec:
+        return jsonify({"error":"Not found"}), 404
+    if not rec.get("meta"):
+        # legacy record with only stored HTML
+        return rec["html"], 200, {"Content-Type":"text/html; charset=utf-8"}
+    theme = request.args.get("theme")
+    if theme and theme not in portfolio_render.themes():
+        return jsonify({"error": f"Unknown theme '{theme}'", "themes": portfolio_render.themes()}), 400
+    html = _render(pid, rec, theme)
+    return html, 200, {"Content-Type":"text/html; charset=utf-8"}
+
+@bp.cli.command("render-portfolios")
+def render_portfolios_command():
+    """Recompile portfolio templates and re-render every portfolio in every theme (all tenants)."""
+    names = portfolio_render.load_templates()
+    portfolio_render.invalidate()
+    count = 0
+    for tenant_id in store.tenant_ids():
+        with store.using_tenant(tenant_id):
+            for pid, rec in list(DB.get("portfolios", {}).items()):
+                if not rec.get("meta"):
+                    continue
+                for theme in names:
+                    _render(pid, rec, theme)
+                rec["html"] = _render(pid, rec)
+                persist("set", ["portfolios", pid], rec)
+                count += 1
+    print(f"Re-rendered {count} portfolios x {len(names)} themes ({', '.join(names)})")
@@ -0,0 +1,48 @@
+# blueprints/media.py
+from flask import Blueprint, Response, jsonify, request, send_file
+
+import images
+import themes
+
+bp = Blueprint("media", __name__)
+
+
+# Resized / re-encoded images from a disk cache (see images.py)
+@bp.route("/api/img", methods=["GET"])
+def image_proxy():
+    src = request.args.get("src", "")
+    if not src:
+        return jsonify({"error": "Provide 'src' (image URL or media:<name>)"}), 400
+    fmt = request.args.get("fmt", "auto")
+    if fmt != "auto" and fmt not in ("webp", "avif", "jpeg", "png"):
+        return jsonify({"error": f"Unknown format '{fmt}'", "formats": ["auto", "webp", "avif", "jpeg", "png"]}), 400
+    width = images.snap_width(max(1, request.args.get("w", default=images.WIDTHS[-1], type=int)))
+    try:
+        path, mime = images.variant(src, width, images.negotiate(fmt, request.headers.get("Accept")))
+    except images.ImageError as e:
+        return jsonify({"error": str(e)}), e.status
+    # the object name is its content hash, so it doubles as a strong ETag
+    resp = send_file(path, mimetype=mime, etag=path.name, max_age=images.MAX_AGE, conditional=True)
+    resp.cache_control.public = True
+    if fmt == "auto":
+        resp.vary.add("Accept")
+    return resp
+
+
+# Theme catalog and compiled CSS bundles (see themes.py)
+@bp.route("/api/themes", methods=["GET"])
+def theme_list():
+    return jsonify(themes.listing())
+
+
+@bp.route("/api/themes/<digest>.css", methods=["GET"])
+def theme_bundle(digest):
+    css = themes.bundle(digest)
+    if css is None:
+        return jsonify({"error": "Unknown theme bundle"}), 404
+    resp = Response(css, mimetype="text/css")
+    resp.set_etag(digest)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = themes.MAX_AGE
+    resp.cache_control.immutable = True
+    return resp.make_conditional(request)
@@ -0,0 +1,93 @@
+# blueprints/pages.py
+import datetime
+import uuid
+
+from flask import Blueprint, Response, jsonify, request
+
+import llm
+import metrics
+import search
+import seo
+from store import DB, page_json, persist
+
+bp = Blueprint("pages", __name__)
+
+
+@bp.route("/")
+def health():
+    return jsonify({"message":"AI Website Builder Backend Running", "openai": bool(llm.USE_OPENAI)})
+
+@bp.route("/metrics")
+def metrics_endpoint():
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@bp.route("/api/pages/<pagename>", methods=["GET"])
+def get_page(pagename):
+    page = page_json(pagename)
+    if page is None:
+        return jsonify({"error":"Page not found"}), 404
+    return jsonify(page)
+
+# Flat lists formerly served by the standalone simple_app.py / test_server.py
+@bp.route("/api/services", methods=["GET"])
+def list_services():
+    return jsonify(DB.get("pages", {}).get("services", {}).get("services", []))
+
+@bp.route("/api/projects", methods=["GET"])
+def list_projects():
+    return jsonify(DB.get("pages", {}).get("projects", {}).get("projects", []))
+
+# Site search (see search.py): ?q=&type=blog,job&page=&per_page=
+@bp.route("/api/search", methods=["GET"])
+def site_search():
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "Provide 'q' query parameter"}), 400
+    types = [t for t in request.args.get("type", "").split(",") if t]
+    unknown = [t for t in types if t not in search.TYPES]
+    if unknown:
+        return jsonify({"error": f"Unknown type(s): {unknown}", "types": list(search.TYPES)}), 400
+    page = max(1, request.args.get("page", default=1, type=int))
+    per_page = min(50, max(1, request.args.get("per_page", default=10, type=int)))
+    return jsonify(search.search(q[:200], types=types or None, page=page, per_page=per_page))
+
+# Sitemap and per-URL SEO metadata, precomputed by seo.py
+@bp.route("/sitemap.xml", methods=["GET"])
+def sitemap():
+    site = seo.get_site(request.url_root)
+    resp = Response(site.sitemap, mimetype="application/xml")
+    resp.set_etag(site.etag)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 3600
+    return resp.make_conditional(request)
+
+@bp.route("/api/seo/meta", methods=["GET"])
+def seo_meta():
+    meta = seo.get_site(request.url_root).by_path.get(request.args.get("path", "/"))
+    if meta is None:
+        return jsonify({"error": "No public page at this path"}), 404
+    return Response(meta, mimetype="application/json")
+
+# Contact form endpoint (public)
+@bp.route('/api/contact', methods=['POST'])
+def contact_submit():
+    data = request.get_json() or {}
+    name = data.get('name')
+    email = data.get('email')
+    message = data.get('message')
+    if not message:
+        return jsonify({"error": "Provide 'message' in JSON body"}), 400
+    rec = {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "email": email,
+        "message": message,
+        "created": datetime.datetime.utcnow().isoformat()
+    }
+    DB.setdefault('messages', []).append(rec)
+    persist("append", ["messages"], rec)
+    # Optionally, store a lightweight FAQ/context entry for the chatbot
+    faq = {"q": f"Contact from {name or email}", "a": message}
+    DB.setdefault('faq', []).append(faq)
+    persist("append", ["faq"], faq)
+    return jsonify({"status": "received", "message_id": rec["id"]}), 201
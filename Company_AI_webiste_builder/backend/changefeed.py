@@ -0,0 +1,261 @@
+# changefeed.py
+# Change feed for the admin dashboard: writes become events pushed over SSE
+# (GET /api/admin/events) instead of admins polling the full lists.
+#
+# Events come from store.on_write, so every persisted write is covered:
+#   application.created, message.created, job.created    (appends)
+#   page.updated                                         (a new page revision)
+#   page.draft                                           (draft saved / discarded)
+# Each event is {"id", "type", "data", "ts"}; "data" is a small summary (the delta),
+# not the whole collection. Events are published to a broker: in-process by default,
+# or Redis pub/sub (CHANGEFEED_REDIS_URL) so admins connected to any worker see
+# writes made in every worker. Each process keeps the last REPLAY events per tenant,
+# so a reconnecting EventSource (Last-Event-ID) gets what it missed; a Last-Event-ID
+# the history doesn't hold (evicted, or from before a restart) gets a resync instead.
+#
+# Writers never wait on the broker: the Redis broker hands events to a background
+# publisher thread (ids are assigned there), the in-memory one only fans out.
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import store
+
+log = logging.getLogger(__name__)
+
+REPLAY = int(os.getenv("CHANGEFEED_REPLAY", "500"))
+QUEUE_SIZE = int(os.getenv("CHANGEFEED_QUEUE", "1000"))   # per connection; a slower client is told to resync
+HEARTBEAT = float(os.getenv("CHANGEFEED_HEARTBEAT", "15"))
+TYPES = ("application", "message", "job", "page")
+# Under the sync (WSGI) server every open stream holds a worker thread for as long as it
+# is open; serve.py sets this well below --threads so the site keeps serving requests.
+SYNC_STREAMS = int(os.getenv("CHANGEFEED_SYNC_STREAMS", "1"))
+
+_subscribers = {}      # tenant -> set of deliver(event) callables
+_history = {}          # tenant -> deque of recent events
+_lock = threading.Lock()
+
+
+def _fanout(tenant_id, event):
+    """Deliver an event to this process's subscribers of the tenant."""
+    with _lock:
+        _history.setdefault(tenant_id, deque(maxlen=REPLAY)).append(event)
+        targets = list(_subscribers.get(tenant_id, ()))
+    for deliver in targets:
+        deliver(event)
+
+
+# ----------------------------
+# Brokers
+# ----------------------------
+class MemoryBroker:
+    """Single-process pub/sub. Ids start at the boot time in microseconds, so they keep
+    increasing across restarts and a client's old Last-Event-ID is never mistaken for a new one."""
+
+    def __init__(self):
+        self._seq = None
+        self._pid = None
+
+    def publish(self, tenant_id, event):
+        if self._pid != os.getpid():  # a forked worker starts its own sequence
+            self._pid = os.getpid()
+            self._seq = itertools.count(time.time_ns() // 1000)
+        event["id"] = next(self._seq)
+        _fanout(tenant_id, event)
+
+
+class RedisBroker:
+    """Pub/sub through Redis, so every worker process sees every write."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CHANGEFEED_REDIS_URL is set but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._pending = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = None
+        self._publisher = None
+        self._pid = None
+        self._publisher_pid = None
+        self._start_lock = threading.Lock()
+
+    def publish(self, tenant_id, event):
+        """Queue an event for the publisher thread (called inside persist, so it must not block)."""
+        self._start_publisher()
+        try:
+            self._pending.put_nowait((tenant_id, event))
+        except queue.Full:
+            log.warning("changefeed: publish queue full, dropping a %s event", event["type"])
+
+    def _start_publisher(self):
+        if self._publisher_pid == os.getpid() and self._publisher.is_alive():
+            return
+        with self._start_lock:
+            if self._publisher_pid == os.getpid() and self._publisher.is_alive():
+                return
+            if self._publisher_pid != os.getpid():
+                self._pending = queue.Queue(maxsize=QUEUE_SIZE)  # the parent's queue has no consumer here
+            self._publisher_pid = os.getpid()
+            self._publisher = threading.Thread(target=self._publish_loop, name="changefeed-publish", daemon=True)
+            self._publisher.start()
+
+    def _publish_loop(self):
+        while True:
+            tenant_id, event = self._pending.get()
+            try:
+                event["id"] = int(self._client.incr("changefeed:seq"))
+                self._client.publish(f"changefeed:{tenant_id}", json.dumps(event))
+            except Exception:
+                log.exception("changefeed: publishing a %s event failed", event["type"])
+
+    def start(self):
+        # one listener per (possibly forked) process
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._listen, name="changefeed", daemon=True)
+            self._thread.start()
+
+    def _listen(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe("changefeed:*")
+        for message in pubsub.listen():
+            channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
+            _fanout(channel.split(":", 1)[1], json.loads(message["data"]))
+
+
+BROKER = RedisBroker(os.getenv("CHANGEFEED_REDIS_URL")) if os.getenv("CHANGEFEED_REDIS_URL") else MemoryBroker()
+
+
+def publish(event_type, data):
+    """Publish an event for the current tenant (the broker assigns its id)."""
+    event = {"id": None, "type": event_type, "data": data, "ts": time.time()}
+    BROKER.publish(store.current_tenant(), event)
+    return event
+
+
+# ----------------------------
+# Write -> event
+# ----------------------------
+def _summary(kind, rec):
+    if kind == "applications":
+        return "application.created", {k: rec.get(k) for k in ("id", "name", "email", "job_title", "duplicate_of")} | {
+            "match_percent": (rec.get("score") or {}).get("match_percent")}
+    if kind == "messages":
+        return "message.created", {"id": rec.get("id"), "name": rec.get("name"), "email": rec.get("email"),
+                                   "message": (rec.get("message") or "")[:200], "created": rec.get("created")}
+    return "job.created", {"id": rec.get("id"), "title": rec.get("title")}
+
+
+@store.on_write
+def _on_write(op, path, value):
+    if not path:
+        return
+    if op == "append" and len(path) == 1 and path[0] in ("applications", "messages", "jobs"):
+        publish(*_summary(path[0], value))
+    elif op == "append" and path[0] == "page_revisions" and len(path) == 2:
+        publish("page.updated", {"name": path[1], "rev": value["rev"], "kind": value["kind"],
+                                 "author": value.get("author"), "message": value.get("message")})
+    elif path[0] == "page_drafts" and len(path) == 2:
+        publish("page.draft", {"name": path[1], "deleted": op == "delete"})
+
+
+# ----------------------------
+# Subscriptions
+# ----------------------------
+def subscribe(tenant_id, deliver):
+    if hasattr(BROKER, "start"):
+        BROKER.start()
+    with _lock:
+        _subscribers.setdefault(tenant_id, set()).add(deliver)
+
+
+def unsubscribe(tenant_id, deliver):
+    with _lock:
+        subs = _subscribers.get(tenant_id)
+        if subs is not None:
+            subs.discard(deliver)
+            if not subs:
+                del _subscribers[tenant_id]
+
+
+def wanted(event, types):
+    return not types or event["type"].split(".", 1)[0] in types
+
+
+def sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n".encode("utf-8")
+
+
+RESYNC = b"event: resync\ndata: {}\n\n"   # events were dropped: refetch the lists, then keep listening
+
+
+def catch_up(tenant_id, last_id, types=()):
+    """What a (re)connecting client is sent first: (SSE chunks, newest event id they cover).
+
+    Events after `last_id` are replayed from this process's history. If the history doesn't
+    hold `last_id` (evicted, issued before a restart, or by another broker) the client is told
+    to resync instead. Live events up to the returned id are already covered and skipped.
+    """
+    if last_id is None:
+        return [], 0
+    with _lock:
+        history = list(_history.get(tenant_id, ()))
+    ids = [e["id"] for e in history]
+    newest = ids[-1] if ids else 0
+    if last_id not in ids:
+        return [RESYNC], newest
+    return [sse(e) for e in history[ids.index(last_id) + 1:] if wanted(e, types)], newest
+
+
+_sync_slots = threading.BoundedSemaphore(max(1, SYNC_STREAMS))
+
+
+def acquire_stream():
+    """Claim one of this process's SYNC_STREAMS slots for a stream(); False when all are taken."""
+    return SYNC_STREAMS > 0 and _sync_slots.acquire(blocking=False)
+
+
+def release_stream():
+    _sync_slots.release()
+
+
+def stream(tenant_id, types=(), last_id=None):
+    """Blocking SSE generator for the Flask route (one thread per connection)."""
+    q = queue.Queue(maxsize=QUEUE_SIZE)
+    overflow = threading.Event()
+
+    def deliver(event):
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            overflow.set()
+
+    subscribe(tenant_id, deliver)  # before replaying, so nothing falls in between
+    try:
+        chunks, seen = catch_up(tenant_id, last_id, types)
+        yield b"".join([b"retry: 3000\n\n", *chunks])
+        while True:
+            if overflow.is_set():
+                overflow.clear()
+                with q.mutex:
+                    q.queue.clear()
+                yield RESYNC
+            try:
+                event = q.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                yield b": ping\n\n"
+                continue
+            if event["id"] > seen and wanted(event, types):
+                yield sse(event)
+    finally:
+        unsubscribe(tenant_id, deliver)
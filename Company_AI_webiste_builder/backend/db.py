@@ -4,6 +4,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from dotenv import load_dotenv
 
+import metrics
+
 # Load .env file (contains DATABASE_URL)
 load_dotenv()
 
@@ -15,6 +17,7 @@ DATABASE_URL = os.getenv(
 
 # Create SQLAlchemy engine
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+metrics.instrument_sqlalchemy()
 
 # Session factory
 SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
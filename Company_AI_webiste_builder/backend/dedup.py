@@ -0,0 +1,191 @@
+# dedup.py
+# Duplicate application detection for /api/apply.
+#
+# Three signals, cheapest first:
+#   exact   - sha256 of the uploaded resume file (checked before any text extraction)
+#   near    - MinHash of the resume's word shingles, with LSH banding to find candidates
+#             whose estimated Jaccard similarity is >= NEAR_THRESHOLD (re-exported
+#             PDFs, a changed phone number, ...)
+#   email_job - same email applying to the same job again
+# Only a match for the same job is a re-application: it is linked to the cluster's
+# canonical (first) application for that job via "duplicate_of", so clusters are
+# listed without comparing applications pairwise. A resume match for another job is
+# the same candidate applying elsewhere, recorded as "same_candidate_as" instead.
+# Either way the new application reuses the matched parse.
+#
+# Fingerprints are stored on the application ("fingerprint": {"sha256", "minhash"}),
+# so the per-tenant index is rebuilt from DB without re-reading resumes, and it
+# follows new applications through store.on_write.
+import hashlib
+import os
+import re
+import threading
+
+import store
+from store import DB
+
+NUM_PERM = 64
+BANDS = 16                   # 16 bands x 4 rows: candidates from ~50% similarity, verified below
+ROWS = NUM_PERM // BANDS
+NEAR_THRESHOLD = float(os.getenv("DEDUP_NEAR_THRESHOLD", "0.85"))
+SHINGLE = 5
+INDEX_TENANTS = int(os.getenv("DEDUP_INDEX_TENANTS", "200"))
+
+_MERSENNE = (1 << 61) - 1
+_MAX32 = (1 << 32) - 1
+# fixed permutations (a*x + b mod p) so signatures stay comparable across restarts
+_PERMS = [(int.from_bytes(hashlib.sha256(b"a%d" % i).digest()[:8], "big") % (_MERSENNE - 1) + 1,
+           int.from_bytes(hashlib.sha256(b"b%d" % i).digest()[:8], "big") % _MERSENNE)
+          for i in range(NUM_PERM)]
+WORD_RE = re.compile(r"[a-z0-9@.+#]+")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def minhash(text):
+    """MinHash signature of the text's word shingles, as a hex string (None for empty text)."""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    shingles = {" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1))}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big") for s in shingles]
+    sig = [min((a * x + b) % _MERSENNE for x in hashes) & _MAX32 for a, b in _PERMS]
+    return "".join(f"{v:08x}" for v in sig)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    same = sum(sig_a[i:i + 8] == sig_b[i:i + 8] for i in range(0, NUM_PERM * 8, 8))
+    return same / NUM_PERM
+
+
+def _bands(sig):
+    width = ROWS * 8
+    return [(i, sig[i * width:(i + 1) * width]) for i in range(BANDS)]
+
+
+def _job(job_title):
+    return " ".join((job_title or "").lower().split())
+
+
+def _email_job(email, job_title):
+    if not email:
+        return None
+    return f"{email.strip().lower()}|{_job(job_title)}"
+
+
+def same_job(a, b):
+    return _job(a.get("job_title")) == _job(b.get("job_title"))
+
+
+class Index:
+    """One tenant's fingerprint -> application lookups and duplicate clusters."""
+
+    def __init__(self):
+        self.by_id = {}
+        self.by_sha = {}        # sha -> first application with that file
+        self.by_sha_job = {}    # (sha, job) -> first application for that job
+        self.by_email_job = {}
+        self.buckets = {}       # (band, rows) -> [application ids]
+        self.clusters = {}      # canonical id -> [duplicate ids]
+        self.lock = threading.Lock()
+
+    def add(self, app):
+        fp = app.get("fingerprint") or {}
+        with self.lock:
+            self.by_id[app["id"]] = app
+            if fp.get("sha256"):
+                self.by_sha.setdefault(fp["sha256"], app["id"])
+                self.by_sha_job.setdefault((fp["sha256"], _job(app.get("job_title"))), app["id"])
+            key = _email_job(app.get("email"), app.get("job_title"))
+            if key:
+                self.by_email_job.setdefault(key, app["id"])
+            if fp.get("minhash"):
+                for band in _bands(fp["minhash"]):
+                    self.buckets.setdefault(band, []).append(app["id"])
+            if app.get("duplicate_of"):
+                self.clusters.setdefault(app["duplicate_of"], []).append(app["id"])
+
+    def canonical(self, app_id):
+        app = self.by_id.get(app_id)
+        return self.by_id.get(app.get("duplicate_of")) or app if app else None
+
+    def exact(self, sha, job_title):
+        """Application with the same file, for this job if there is one."""
+        return self.canonical(self.by_sha_job.get((sha, _job(job_title))) or self.by_sha.get(sha))
+
+    def near(self, sig, job_title):
+        """Best near-duplicate (application, similarity) above NEAR_THRESHOLD, for this job
+        if there is one, or (None, 0)."""
+        best, best_key = None, (False, 0.0)
+        job = _job(job_title)
+        with self.lock:
+            candidates = {i for band in _bands(sig) for i in self.buckets.get(band, ())}
+        for app_id in candidates:
+            app = self.by_id[app_id]
+            sim = similarity(sig, app["fingerprint"]["minhash"])
+            key = (_job(app.get("job_title")) == job, sim)
+            if sim >= NEAR_THRESHOLD and key > best_key:
+                best, best_key = app, key
+        return (self.canonical(best["id"]), best_key[1]) if best else (None, 0.0)
+
+    def same_email_job(self, email, job_title):
+        key = _email_job(email, job_title)
+        return self.canonical(self.by_email_job.get(key)) if key else None
+
+
+def _build():
+    index = Index()
+    for app in DB.get("applications", []):
+        index.add(app)
+    return index
+
+
+_INDEXES = store.TenantCache(_build, INDEX_TENANTS)
+
+
+def get_index():
+    return _INDEXES.get()
+
+
+def reset():
+    _INDEXES.reset()
+
+
+@store.on_write
+def _on_write(op, path, value):
+    if not path or path[0] != "applications":
+        return
+    index = _INDEXES.written()
+    if index is None:
+        return
+    if op == "append" and len(path) == 1:
+        index.add(value)
+    else:
+        reset()
+
+
+def clusters(min_size=2):
+    """Duplicate clusters, largest first: canonical application plus its duplicates."""
+    index = get_index()
+    out = []
+    with index.lock:
+        items = [(cid, list(dups)) for cid, dups in index.clusters.items()]
+    for cid, dups in items:
+        if len(dups) + 1 < min_size or cid not in index.by_id:
+            continue
+        canonical = index.by_id[cid]
+        out.append({
+            "canonical": {k: canonical.get(k) for k in ("id", "name", "email", "job_title")},
+            "size": len(dups) + 1,
+            "duplicates": [{k: index.by_id[d].get(k) for k in ("id", "name", "email", "job_title", "duplicate_reason", "similarity")}
+                           for d in dups],
+        })
+    out.sort(key=lambda c: -c["size"])
+    return out
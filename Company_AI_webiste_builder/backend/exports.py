@@ -0,0 +1,140 @@
+# exports.py
+# Streaming bulk exports of applications and contact messages (admin).
+#
+# Rows are written as they are read: CSV and NDJSON exports are generators that
+# yield a chunk every CHUNK_ROWS rows, so a 500k-row export starts downloading at
+# once and holds one chunk in memory. Parquet (optional, needs pyarrow) is written
+# one row group at a time to a temporary file, then streamed; its footer comes
+# last, so the download only starts once the file is complete.
+import csv
+import importlib.util
+import io
+import os
+import tempfile
+
+from json_provider import dumps_bytes
+
+CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "500"))
+PARQUET_ROW_GROUP = int(os.getenv("EXPORT_PARQUET_ROW_GROUP", "50000"))
+USE_PYARROW = importlib.util.find_spec("pyarrow") is not None
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")   # cells starting with these are quoted
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _path(*keys):
+    def get(row):
+        value = row
+        for k in keys:
+            value = value.get(k) if isinstance(value, dict) else None
+        return value
+    return get
+
+
+def _joined(*keys):
+    get = _path(*keys)
+    return lambda row: ";".join(map(str, get(row) or []))
+
+
+# collection -> [(column, getter, parquet type)]; NDJSON exports the stored record as-is
+COLUMNS = {
+    "applications": [
+        ("id", _path("id"), "string"),
+        ("name", _path("name"), "string"),
+        ("email", _path("email"), "string"),
+        ("job_title", _path("job_title"), "string"),
+        ("resume_path", _path("resume_path"), "string"),
+        ("skills", _joined("parsed", "skills"), "string"),
+        ("experience_years", _path("parsed", "experience_years"), "int64"),
+        ("match_percent", _path("score", "match_percent"), "float64"),
+        ("matched_skills", _joined("score", "matched_skills"), "string"),
+    ],
+    "messages": [
+        ("id", _path("id"), "string"),
+        ("name", _path("name"), "string"),
+        ("email", _path("email"), "string"),
+        ("message", _path("message"), "string"),
+        ("created", _path("created"), "string"),
+    ],
+}
+
+
+def _rows(records):
+    # Bound by the length at the start: rows appended during the export are left out
+    # and the list is never copied.
+    for i in range(len(records)):
+        yield records[i]
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    value = str(value)
+    # keep spreadsheet apps from evaluating user-supplied text as a formula
+    return "'" + value if value[:1] in FORMULA_PREFIXES else value
+
+
+def iter_csv(collection, records):
+    cols = COLUMNS[collection]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([name for name, _, _ in cols])
+    for n, row in enumerate(_rows(records), 1):
+        writer.writerow([_csv_cell(get(row)) for _, get, _ in cols])
+        if n % CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def iter_ndjson(collection, records):
+    chunk = []
+    for row in _rows(records):
+        chunk.append(dumps_bytes(row))
+        if len(chunk) == CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def iter_parquet(collection, records):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cols = COLUMNS[collection]
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, _, kind in cols])
+    with tempfile.TemporaryFile() as tmp:
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            batch = []
+            for row in _rows(records):
+                batch.append(row)
+                if len(batch) == PARQUET_ROW_GROUP:
+                    writer.write_table(_table(pa, schema, cols, batch))
+                    batch = []
+            if batch or not records:
+                writer.write_table(_table(pa, schema, cols, batch))
+        tmp.seek(0)
+        while True:
+            block = tmp.read(1 << 20)
+            if not block:
+                break
+            yield block
+
+
+def _table(pa, schema, cols, batch):
+    arrays = []
+    for (name, get, kind), field in zip(cols, schema):
+        values = [get(row) for row in batch]
+        if kind == "string":
+            values = [None if v is None else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+WRITERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
@@ -0,0 +1,246 @@
+# extract.py
+# Resume text extraction stage: detect file type, pull text out of PDF / DOCX / TXT.
+#
+# PDF and DOCX parsing is CPU-heavy, so it runs in a process pool with a timeout,
+# a byte-size cap and a page limit. Results are cached by SHA-256 of the file
+# content (memory LRU + optional disk), so re-uploading the same resume is free.
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import re
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from xml.etree import ElementTree
+
+import store
+from workers import ProcessPool
+
+# pypdf is imported inside the worker that needs it, not by the web process at startup
+USE_PYPDF = importlib.util.find_spec("pypdf") is not None
+
+log = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv("EXTRACT_WORKERS", "2"))
+TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "10"))
+MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "20"))
+MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(10 * 1024 * 1024)))
+CACHE_DIR = Path(os.getenv("EXTRACT_CACHE_DIR", str(store.DATA_DIR / "extract_cache")))
+MEMORY_CACHE_SIZE = 512
+
+_cache = OrderedDict()  # sha256 -> text
+_lock = threading.Lock()
+POOL = ProcessPool("extract", MAX_WORKERS, reap_after=TIMEOUT)
+
+
+# ----------------------------
+# Type detection
+# ----------------------------
+def detect_type(data):
+    """Return 'pdf', 'docx', 'txt' or 'unknown' from the file's magic bytes."""
+    if data[:5] == b"%PDF-":
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                if "word/document.xml" in zf.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+        return "unknown"
+    head = data[:4096]
+    if b"\x00" in head and not head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "unknown"
+    return "txt"
+
+
+# ----------------------------
+# Extractors (run inside pool workers)
+# ----------------------------
+def _decode_text(data):
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="ignore")
+    return data.decode("utf-8", errors="ignore")
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _extract_docx(data, max_pages):
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        xml = zf.read("word/document.xml")
+    root = ElementTree.fromstring(xml)
+    lines = []
+    for p in root.iter(_W + "p"):
+        parts = []
+        for node in p.iter():
+            if node.tag == _W + "t" and node.text:
+                parts.append(node.text)
+            elif node.tag == _W + "tab":
+                parts.append("\t")
+            elif node.tag in (_W + "br", _W + "cr"):
+                parts.append("\n")
+        lines.append("".join(parts))
+    return "\n".join(lines)
+
+
+_PDF_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_TOKEN = re.compile(rb"\((?:\\.|[^\\)])*\)|\[(?:\\.|[^\]])*\]|\b(?:Tj|TJ|Td|TD|ET)\b|T\*|'")
+_PDF_STRING = re.compile(rb"\(((?:\\.|[^\\)])*)\)")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _pdf_unescape(s):
+    out = bytearray()
+    i = 0
+    while i < len(s):
+        c = s[i:i + 1]
+        if c == b"\\" and i + 1 < len(s):
+            nxt = s[i + 1:i + 2]
+            if nxt in _PDF_ESCAPES:
+                out += _PDF_ESCAPES[nxt]
+                i += 2
+            elif nxt in b"01234567":  # \ddd octal; \8 and \9 are just the digit
+                octal = re.match(rb"[0-7]{1,3}", s[i + 1:i + 4]).group(0)
+                out.append(int(octal, 8) & 0xFF)
+                i += 1 + len(octal)
+            else:
+                out += nxt
+                i += 2
+        else:
+            out += c
+            i += 1
+    return out.decode("latin-1")
+
+
+def _extract_pdf_fallback(data, max_pages):
+    """Best-effort stdlib PDF text: inflate content streams and read Tj/TJ operators."""
+    chunks = []
+    streams = 0
+    for m in _PDF_STREAM.finditer(data):
+        raw = m.group(1)
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            pass
+        if b"BT" not in raw:
+            continue
+        streams += 1
+        if streams > max_pages:
+            break
+        pending = []
+        for tok in _PDF_TOKEN.finditer(raw):
+            t = tok.group(0)
+            if t.startswith(b"(") or t.startswith(b"["):
+                pending = [_pdf_unescape(s) for s in _PDF_STRING.findall(t)]
+            elif t in (b"Tj", b"TJ", b"'"):
+                chunks.append("".join(pending))
+                pending = []
+            elif t in (b"Td", b"TD", b"T*", b"ET"):
+                chunks.append("\n")
+        chunks.append("\n")
+    return re.sub(r"\n{3,}", "\n\n", "".join(chunks))
+
+
+def _extract_pdf(data, max_pages):
+    if not USE_PYPDF:
+        return _extract_pdf_fallback(data, max_pages)
+    import pypdf
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    pages = []
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            break
+        pages.append(page.extract_text() or "")
+    return "\n".join(pages)
+
+
+_EXTRACTORS = {"pdf": _extract_pdf, "docx": _extract_docx}
+
+
+def _run_extractor(kind, data, max_pages):
+    return _EXTRACTORS[kind](data, max_pages)
+
+
+# ----------------------------
+# Cache
+# ----------------------------
+def _cache_get(digest):
+    with _lock:
+        text = _cache.get(digest)
+        if text is not None:
+            _cache.move_to_end(digest)
+            return text
+    path = CACHE_DIR / f"{digest}.txt"
+    if path.exists():
+        text = path.read_text(encoding="utf-8")
+        _cache_put(digest, text, disk=False)
+        return text
+    return None
+
+
+def _cache_put(digest, text, disk=True):
+    with _lock:
+        _cache[digest] = text
+        if len(_cache) > MEMORY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    if disk:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = CACHE_DIR / f"{digest}.tmp"
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, CACHE_DIR / f"{digest}.txt")
+        except OSError:
+            log.warning("could not write extract cache for %s", digest)
+
+
+def extract_text(data, filename=""):
+    """Extract plain text from resume bytes (PDF/DOCX/TXT). Returns '' on failure."""
+    if not data:
+        return ""
+    if len(data) > MAX_BYTES:
+        log.warning("resume %s too large to extract (%d bytes)", filename, len(data))
+        return ""
+    digest = hashlib.sha256(data).hexdigest()
+    text = _cache_get(digest)
+    if text is not None:
+        return text
+    kind = detect_type(data)
+    if kind == "txt":
+        text = _decode_text(data)
+    elif kind in _EXTRACTORS:
+        pool = POOL.get()
+        try:
+            text = pool.submit(_run_extractor, kind, data, MAX_PAGES).result(timeout=TIMEOUT)
+        except FutureTimeout:
+            log.warning("extracting %s (%s) timed out after %ss", filename, kind, TIMEOUT)
+            POOL.retire(pool)
+            return ""
+        except BrokenProcessPool:
+            log.warning("extract worker pool died while processing %s; restarting it", filename)
+            POOL.reset()
+            return ""
+        except CancelledError:
+            # queued in a pool that another request reset: the file itself may be fine, so don't cache
+            log.warning("extracting %s (%s) was cancelled by a pool restart", filename, kind)
+            return ""
+        except Exception as e:
+            # parser error on a malformed file: cache the empty result, retrying won't help
+            log.warning("extracting %s (%s) failed: %s", filename, kind, e)
+            text = ""
+    else:
+        text = ""
+    _cache_put(digest, text)
+    return text
+
+
+def extract_file(path):
+    """Extract text from a saved upload."""
+    path = Path(path)
+    return extract_text(path.read_bytes(), path.name)
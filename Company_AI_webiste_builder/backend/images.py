@@ -0,0 +1,330 @@
+# images.py
+# Image proxy for service / project images: GET /api/img?src=<url|media:name>&w=640&fmt=auto
+#
+# The original is fetched once (remote URL on an allowed host, or an image that an
+# admin uploaded to the site's media library, DATA_DIR/media/<tenant>; resumes and
+# other user uploads live elsewhere and are never served)
+# and resized copies in the requested width and format (WebP / AVIF / JPEG / PNG;
+# "auto" picks from the Accept header) are generated in a process pool and stored
+# in a content-addressed disk cache:
+#   objects/<ab>/<sha256>   image bytes (originals and variants), named by content hash
+#   refs/<sha256(key)>      {"hash", "mime"} for "src:<url>" and "var:<original>:<w>:<fmt>"
+# Objects are evicted least-recently-used (mtime is touched on every hit) once the
+# cache exceeds IMAGE_CACHE_MAX_MB; a ref whose object is gone is simply a miss.
+#
+# Resizing needs Pillow (optional, imported only in the pool workers); without it
+# the cached original is served as-is, which still saves every visitor the remote fetch.
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import threading
+import urllib.request
+import weakref
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import store
+from workers import ProcessPool
+
+USE_PIL = importlib.util.find_spec("PIL") is not None
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", str(store.DATA_DIR / "image_cache")))
+CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024
+ALLOWED_HOSTS = frozenset(h.strip() for h in os.getenv(
+    "IMAGE_ALLOWED_HOSTS", "source.unsplash.com,images.unsplash.com,picsum.photos,fastly.picsum.photos").split(",") if h.strip())
+WIDTHS = (160, 320, 480, 640, 800, 960, 1280, 1600)  # requested widths snap up to one of these
+MAX_SOURCE_BYTES = int(os.getenv("IMAGE_MAX_SOURCE_BYTES", str(15 * 1024 * 1024)))
+MAX_PIXELS = 40_000_000
+FETCH_TIMEOUT = float(os.getenv("IMAGE_FETCH_TIMEOUT", "10"))
+MAX_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+TIMEOUT = float(os.getenv("IMAGE_TIMEOUT", "20"))
+MAX_AGE = int(os.getenv("IMAGE_MAX_AGE", str(30 * 86400)))
+
+MIME = {"webp": "image/webp", "avif": "image/avif", "jpeg": "image/jpeg", "png": "image/png", "gif": "image/gif"}
+QUALITY = {"webp": 80, "avif": 55, "jpeg": 82}
+
+
+class ImageError(Exception):
+    """Bad source (not allowed, not an image, too large); `status` is the HTTP code to return."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def sniff(data):
+    """Image format from magic bytes, or None."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[4:12] in (b"ftypavif", b"ftypavis"):
+        return "avif"
+    return None
+
+
+def snap_width(w):
+    return next((x for x in WIDTHS if x >= w), WIDTHS[-1])
+
+
+# ----------------------------
+# Transform (runs inside pool workers)
+# ----------------------------
+def _transform(data, width, fmt):
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    with Image.open(io.BytesIO(data)) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im.thumbnail((width, im.height * width // im.width + 1), Image.LANCZOS)
+        alpha = im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info
+        if fmt == "legacy":
+            fmt = "png" if alpha else "jpeg"
+        if fmt == "jpeg" or not alpha:
+            im = im.convert("RGB") if im.mode != "L" else im
+        elif im.mode not in ("RGBA", "LA"):
+            im = im.convert("RGBA")
+        out = io.BytesIO()
+        params = {"jpeg": {"quality": QUALITY["jpeg"], "optimize": True, "progressive": True},
+                  "webp": {"quality": QUALITY["webp"], "method": 4},
+                  "avif": {"quality": QUALITY["avif"]},
+                  "png": {"optimize": True}}[fmt]
+        im.save(out, format=fmt.upper(), **params)
+    return out.getvalue(), fmt
+
+
+POOL = ProcessPool("image", MAX_WORKERS, reap_after=TIMEOUT)
+_lock = threading.Lock()
+
+
+_avif = None
+
+
+def avif_supported():
+    global _avif
+    if _avif is None:
+        try:
+            from PIL import features
+            _avif = bool(features.check("avif"))
+        except Exception:
+            _avif = False
+    return _avif
+
+
+def negotiate(fmt, accept):
+    """Output format for a request: explicit fmt, or the best one the client accepts."""
+    if fmt != "auto":
+        return "webp" if fmt == "avif" and not avif_supported() else fmt
+    accept = accept or ""
+    if "image/avif" in accept and avif_supported():
+        return "avif"
+    if "image/webp" in accept:
+        return "webp"
+    return "legacy"  # png if the image has transparency, else jpeg
+
+
+# ----------------------------
+# Content-addressed disk cache
+# ----------------------------
+_usage = None           # bytes in objects/, scanned on first write
+_key_locks = weakref.WeakValueDictionary()
+
+
+def _object_path(digest):
+    return CACHE_DIR / "objects" / digest[:2] / digest
+
+
+def _ref_path(key):
+    return CACHE_DIR / "refs" / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _get(key):
+    """(object path, mime) for a ref, touching the object for LRU; None on a miss."""
+    try:
+        ref = json.loads(_ref_path(key).read_text())
+        path = _object_path(ref["hash"])
+        os.utime(path)
+        return path, ref["mime"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _put(key, data, mime):
+    global _usage
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest)
+    if not path.exists():
+        _write(path, data)
+        with _lock:
+            if _usage is not None:
+                _usage += len(data)
+        _evict()
+    _write(_ref_path(key), json.dumps({"hash": digest, "mime": mime}).encode())
+    return path, mime
+
+
+def _evict():
+    """Delete least-recently-used objects until the cache is back under 90% of its limit."""
+    global _usage
+    with _lock:
+        if _usage is not None and _usage <= CACHE_MAX_BYTES:
+            return
+        objects = []
+        for p in (CACHE_DIR / "objects").glob("*/*"):
+            if not p.name.endswith(".tmp"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                objects.append((st.st_mtime, st.st_size, p))
+        _usage = sum(size for _, size, _ in objects)
+        if _usage <= CACHE_MAX_BYTES:
+            return
+        objects.sort()
+        for _, size, p in objects:
+            if _usage <= CACHE_MAX_BYTES * 0.9:
+                break
+            try:
+                p.unlink()
+                _usage -= size
+            except OSError:
+                pass
+
+
+def _key_lock(key):
+    # one builder per key, so a burst of visitors for a new image triggers one fetch/resize
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+# ----------------------------
+# Sources
+# ----------------------------
+class _AllowedRedirects(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if urlsplit(newurl).hostname not in ALLOWED_HOSTS or urlsplit(newurl).scheme not in ("http", "https"):
+            raise ImageError("Image redirected to a host that is not allowed", 403)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+_opener = urllib.request.build_opener(_AllowedRedirects)
+
+
+def media_dir():
+    """The current site's media library (images uploaded by its admins for pages)."""
+    path = store.DATA_DIR / "media"
+    return path if store.current_tenant() == store.DEFAULT_TENANT else path / store.current_tenant()
+
+
+def save_media(data):
+    """Store an image in the media library under its content hash; returns its name."""
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ImageError("Image too large", 413)
+    kind = sniff(data)
+    if kind is None:
+        raise ImageError("Not a supported image (JPEG, PNG, GIF, WebP, AVIF)", 415)
+    name = f"{hashlib.sha256(data).hexdigest()[:32]}.{kind}"
+    path = media_dir() / name
+    if not path.exists():
+        _write(path, data)
+    return name
+
+
+def _read_source(src):
+    if src.startswith("media:"):
+        name = src[len("media:"):]
+        path = media_dir() / name
+        if not name or name != os.path.basename(name) or name.startswith(".") or not path.is_file():
+            raise ImageError("Image not found", 404)
+        if path.stat().st_size > MAX_SOURCE_BYTES:
+            raise ImageError("Image too large", 413)
+        return path.read_bytes()
+    parts = urlsplit(src)
+    if parts.scheme not in ("http", "https") or parts.hostname not in ALLOWED_HOSTS:
+        raise ImageError("Image host is not allowed", 403)
+    try:
+        with _opener.open(urllib.request.Request(src, headers={"User-Agent": "mastersolis-image-proxy"}),
+                          timeout=FETCH_TIMEOUT) as resp:
+            data = resp.read(MAX_SOURCE_BYTES + 1)
+    except ImageError:
+        raise
+    except OSError as e:
+        raise ImageError(f"Could not fetch image: {e}", 502)
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ImageError("Image too large", 413)
+    return data
+
+
+def _source_key(src):
+    # media is per tenant; remote URLs are shared by every site
+    return f"src:{store.current_tenant()}:{src}" if src.startswith("media:") else f"src:{src}"
+
+
+def original(src):
+    """(path, mime) of the cached original, fetching it on first use."""
+    key = _source_key(src)
+    hit = _get(key)
+    if hit:
+        return hit
+    with _key_lock(key):
+        hit = _get(key)
+        if hit:
+            return hit
+        data = _read_source(src)
+        kind = sniff(data)
+        if kind is None:
+            raise ImageError("Source is not a supported image", 415)
+        return _put(key, data, MIME[kind])
+
+
+def variant(src, width, fmt):
+    """(path, mime) of `src` resized to `width` in `fmt` (see negotiate()); the original without Pillow."""
+    orig_path, orig_mime = original(src)
+    if not USE_PIL:
+        return orig_path, orig_mime
+    key = f"var:{orig_path.name}:{width}:{fmt}"
+    hit = _get(key)
+    if hit:
+        return hit
+    with _key_lock(key):
+        hit = _get(key)
+        if hit:
+            return hit
+        try:
+            source = orig_path.read_bytes()
+        except FileNotFoundError:
+            # evicted since original() returned it: a miss, fetch it again
+            orig_path, orig_mime = original(src)
+            source = orig_path.read_bytes()
+        pool = POOL.get()
+        try:
+            data, out_fmt = pool.submit(_transform, source, width, fmt).result(timeout=TIMEOUT)
+        except FutureTimeout:
+            POOL.retire(pool)
+            raise ImageError("Image processing timed out", 503)
+        except BrokenProcessPool:
+            POOL.reset()
+            raise ImageError("Image worker failed", 503)
+        except Exception as e:
+            log.warning("resizing %s failed: %s", src, e)
+            return orig_path, orig_mime
+        return _put(key, data, MIME[out_fmt])
@@ -0,0 +1,159 @@
+# jobmatch.py
+# Rank all of a tenant's jobs against one resume (POST /api/jobs/match).
+#
+# Each job's comma-separated "skills" are normalized once into a skill taxonomy
+# (lowercased, aliases folded: "ReactJS" -> react, "Node.js" -> node) and stored as
+# one row of a job-skill matrix: a bitset per job, bit i set when the job asks for
+# taxonomy skill i. A resume is parsed once and turned into the same kind of bitset,
+# so scoring every job is one pass of AND + popcount over the rows - a few
+# milliseconds for thousands of openings, with no per-job string comparisons.
+#
+# The matrix is per tenant, built from DB on the first match and kept current by
+# store.on_write: a new job adds a row; any other change to the jobs list rebuilds
+# the matrix on next use.
+import heapq
+import os
+import re
+import threading
+
+import store
+from resume import SKILL_RE, combined_score
+from store import DB
+
+INDEX_TENANTS = int(os.getenv("JOBMATCH_INDEX_TENANTS", "200"))
+MAX_RESULTS = 50
+
+# spelling -> canonical skill; resumes and job postings are matched on the canonical form
+ALIASES = {
+    "js": "javascript", "ecmascript": "javascript",
+    "ts": "typescript",
+    "reactjs": "react", "react.js": "react",
+    "node.js": "node", "nodejs": "node",
+    "nextjs": "next.js",
+    "vuejs": "vue", "vue.js": "vue",
+    "tailwind": "tailwind css", "tailwindcss": "tailwind css",
+    "postgres": "postgresql",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "ml": "machine learning",
+    "c sharp": "c#",
+}
+
+
+def normalize(skill):
+    skill = " ".join(skill.lower().split()).strip(" .")
+    return ALIASES.get(skill, skill)
+
+
+def job_skills(job):
+    """Canonical skills of a job: its "skills" field, else the known skills in its title/description."""
+    skills = job.get("skills")
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    if not skills:
+        skills = SKILL_RE.findall(f"{job.get('title') or ''}\n{job.get('description') or ''}")
+    return {s for s in (normalize(str(s)) for s in skills) if s}
+
+
+class Matrix:
+    """One tenant's job-skill matrix."""
+
+    def __init__(self):
+        self.bits = {}          # canonical skill -> bit index
+        self.names = []         # bit index -> canonical skill
+        self.rows = []          # (job, bitset, number of skills)
+        self._pattern = None    # regex finding taxonomy skills in resume text
+        self.lock = threading.Lock()
+
+    def _bit(self, skill):
+        bit = self.bits.get(skill)
+        if bit is None:
+            bit = self.bits[skill] = len(self.names)
+            self.names.append(skill)
+            self._pattern = None
+        return bit
+
+    def add(self, job):
+        with self.lock:
+            row = 0
+            for skill in job_skills(job):
+                row |= 1 << self._bit(skill)
+            self.rows.append((job, row, row.bit_count()))
+
+    def _skill_pattern(self):
+        # every spelling of a taxonomy skill, longest first so "next.js" wins over "js"
+        if self._pattern is None:
+            forms = set(self.bits) | {a for a, c in ALIASES.items() if c in self.bits}
+            alternatives = [re.escape(f).replace(r"\ ", r"\s+") for f in sorted(forms, key=len, reverse=True)]
+            self._pattern = re.compile(r"(?<![\w+#.])(?:%s)(?![\w+#])" % "|".join(alternatives), re.I) if forms else None
+        return self._pattern
+
+    def vector(self, text, skills=()):
+        """Bitset of the taxonomy skills found in `text` or listed in `skills`."""
+        with self.lock:
+            pattern = self._skill_pattern()
+            found = {normalize(m) for m in pattern.findall(text or "")} if pattern else set()
+            found.update(normalize(s) for s in skills)
+            return sum(1 << self.bits[s] for s in found if s in self.bits)
+
+    def skill_names(self, bitset):
+        out = []
+        while bitset:
+            low = bitset & -bitset
+            out.append(self.names[low.bit_length() - 1])
+            bitset ^= low
+        return out
+
+    def rank(self, resume_bits, limit=10):
+        """Top `limit` (job, job bitset, matched bitset, coverage) by share of the job's skills the resume has."""
+        with self.lock:
+            rows = list(self.rows)
+        scored = ((job, row, hits, hits.bit_count() / n) for job, row, n in rows if n and (hits := row & resume_bits))
+        return heapq.nlargest(limit, scored, key=lambda r: (r[3], r[2].bit_count()))
+
+
+def _build():
+    matrix = Matrix()
+    for job in DB.get("jobs", []):
+        matrix.add(job)
+    return matrix
+
+
+_MATRICES = store.TenantCache(_build, INDEX_TENANTS)
+
+
+def get_matrix():
+    return _MATRICES.get()
+
+
+def reset():
+    _MATRICES.reset()
+
+
+@store.on_write
+def _on_write(op, path, value):
+    if not path or path[0] != "jobs":
+        return
+    matrix = _MATRICES.written()
+    if matrix is None:
+        return
+    if op == "append" and len(path) == 1:
+        matrix.add(value)
+    else:
+        reset()
+
+
+def match(text, parsed, limit=10):
+    """Jobs ranked for a parsed resume, best first, with matched and missing skills."""
+    matrix = get_matrix()
+    resume_bits = matrix.vector(text, parsed.get("skills", ()))
+    out = []
+    for job, row, hits, coverage in matrix.rank(resume_bits, min(limit, MAX_RESULTS)):
+        out.append({
+            "job": {k: job.get(k) for k in ("id", "title", "location", "type", "salary_range")},
+            "match_percent": combined_score(coverage, parsed.get("experience_years", 0)),
+            "matched_skills": matrix.skill_names(hits),
+            "missing_skills": matrix.skill_names(row & ~hits),
+        })
+    return {"skills": matrix.skill_names(resume_bits), "jobs_considered": len(matrix.rows), "matches": out}
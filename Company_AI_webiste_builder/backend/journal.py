@@ -0,0 +1,281 @@
+# journal.py
+# Append-only write journal + compacted snapshots for the in-memory DB.
+#
+# Every mutation is recorded as [seq, op, path, value]:
+#   ["set",    ["pages", "home"], {...}]   -> DB["pages"]["home"] = {...}
+#   ["append", ["jobs"], {...}]            -> DB["jobs"].append({...})
+#   ["delete", ["portfolios", pid]]        -> DB["portfolios"].pop(pid)
+# A snapshot stores the whole DB plus the seq it covers, so records already
+# folded into a snapshot are skipped on replay (safe if we crash mid-compaction).
+# Snapshots are compacted from the files themselves, so they contain exactly the
+# records up to their seq. Compaction runs on the background thread: a write that
+# crosses snapshot_every only flags it, and writers keep appending while it runs.
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+
+try:
+    import msgpack
+    USE_MSGPACK = True
+except Exception:
+    USE_MSGPACK = False
+
+log = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def _pack(obj):
+    if USE_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _iter_records(f):
+    """Yield (record, end_offset) pairs; stops quietly at a torn tail record."""
+    if USE_MSGPACK:
+        unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+        while True:
+            try:
+                rec = unpacker.unpack()
+            except msgpack.OutOfData:
+                return
+            except Exception:
+                return
+            yield rec, unpacker.tell()
+    else:
+        offset = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                return
+            offset += len(line)
+            yield rec, offset
+
+
+def apply_op(db, op, path, value=None):
+    """Apply a single journal operation to a nested dict."""
+    parent = db
+    for key in path[:-1]:
+        parent = parent.setdefault(key, {})
+    last = path[-1]
+    if op == "set":
+        parent[last] = value
+    elif op == "append":
+        parent.setdefault(last, []).append(value)
+    elif op == "delete":
+        parent.pop(last, None)
+    else:
+        raise ValueError(f"unknown journal op: {op}")
+
+
+class Journal:
+    """Durable log of DB mutations with periodic snapshot compaction."""
+
+    def __init__(self, directory, fsync="interval", fsync_interval=1.0, snapshot_every=50000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        ext = "msgpack" if USE_MSGPACK else "jsonl"
+        self.dir = Path(directory)
+        self.snapshot_path = self.dir / f"snapshot.{ext}"
+        self.journal_path = self.dir / f"journal.{ext}"
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.seq = 0
+        self.since_snapshot = 0
+        self._fh = None
+        self._dirty = False
+        self._size = 0              # journal bytes written as far as this process knows
+        self._snapshot_mtime = None
+        self._snapshot_due = False
+        self._stopped = False
+        self._wake = threading.Event()
+        self._lock = threading.RLock()
+        self._compacting = threading.Lock()   # one snapshot at a time
+
+    # ----------------------------
+    # Startup
+    # ----------------------------
+    def open(self, db):
+        """Load the latest snapshot into `db`, replay the journal tail and start appending.
+
+        Returns the number of journal records replayed.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.seq, replayed, good_offset = self._read(db)
+        # drop a torn tail so new records don't land after garbage
+        if self.journal_path.exists() and good_offset != self.journal_path.stat().st_size:
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_offset)
+        self.since_snapshot = replayed
+        self._fh = open(self.journal_path, "ab")
+        self._size = self._fh.tell()
+        self._snapshot_mtime = self._mtime(self.snapshot_path)
+        self.start_background()
+        return replayed
+
+    def _read(self, db, until=None):
+        """Load the snapshot file into `db` and apply the journal records after it (up to
+        seq `until`, if given).
+
+        Returns (last seq, records applied, end offset of the last intact record).
+        """
+        base_seq = 0
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "rb") as f:
+                for snap, _ in _iter_records(f):
+                    base_seq = snap["seq"]
+                    db.clear()
+                    db.update(snap["db"])
+                    break
+        seq = base_seq
+        replayed = 0
+        good_offset = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "rb") as f:
+                for rec, end in _iter_records(f):
+                    if until is not None and rec[0] > until:
+                        break
+                    good_offset = end
+                    if rec[0] <= base_seq:
+                        continue
+                    apply_op(db, rec[1], rec[2], rec[3] if len(rec) > 3 else None)
+                    seq = rec[0]
+                    replayed += 1
+        return seq, replayed, good_offset
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def changed_on_disk(self):
+        """True if another process wrote to the journal or snapshot since this one last did."""
+        return (self._mtime(self.snapshot_path) != self._snapshot_mtime
+                or not self.journal_path.exists() or self.journal_path.stat().st_size != self._size)
+
+    def reopen(self, db, initial=None):
+        """Re-attach in a forked worker: reload `db` from disk if an earlier worker wrote to it since
+        the fork source last did (reset to `initial` first), else just reopen the file.
+
+        Returns True when `db` was reloaded.
+        """
+        with self._lock:
+            if self._fh is not None and not self._fh.closed:
+                self._fh.close()  # the child's copy of the fd; the parent's stays open
+            if not self.changed_on_disk():
+                self._fh = open(self.journal_path, "ab")
+                self.start_background()
+                return False
+            db.clear()
+            db.update(initial or {})
+            self.open(db)
+            return True
+
+    def start_background(self):
+        """Start the interval-fsync / compaction thread (call again in a forked child; threads
+        don't survive fork)."""
+        if self.fsync == "interval" or self.snapshot_every:
+            self._stopped = False
+            t = threading.Thread(target=self._fsync_loop, name="journal-fsync", daemon=True)
+            t.start()
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def record(self, op, path, value=None):
+        """Append one mutation (already applied to the in-memory DB)."""
+        with self._lock:
+            self.seq += 1
+            rec = [self.seq, op, list(path)] if op == "delete" else [self.seq, op, list(path), value]
+            self._fh.write(_pack(rec))
+            self._fh.flush()
+            self._size = self._fh.tell()
+            if self.fsync == "always":
+                os.fsync(self._fh.fileno())
+            else:
+                self._dirty = True
+            self.since_snapshot += 1
+            if self.snapshot_every and self.since_snapshot >= self.snapshot_every and not self._snapshot_due:
+                self._snapshot_due = True   # compacted by the background thread
+                self._wake.set()
+
+    def snapshot(self):
+        """Fold the journal into a new snapshot and truncate the journal. Returns True on success.
+
+        The snapshot is built from the files (old snapshot + journal), not from the live DB:
+        a request that has changed the DB but not yet recorded it must not end up in a
+        snapshot whose seq is lower than its record's, or replay would apply it twice.
+        Only the start and the journal swap hold the write lock; records appended in
+        between are carried over to the new journal.
+        """
+        with self._compacting:
+            with self._lock:
+                self._snapshot_due = False
+                self._fh.flush()
+                upto, offset = self.seq, self._size
+            db = {}
+            try:
+                seq, _, _ = self._read(db, until=upto)
+                if seq != upto:
+                    log.warning("journal: files end at seq %d, expected %d; snapshot skipped", seq, upto)
+                    return False
+                data = _pack({"seq": seq, "db": db})
+                tmp = self.snapshot_path.with_suffix(".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.snapshot_path)
+                with self._lock:
+                    self._fh.flush()
+                    with open(self.journal_path, "rb") as f:
+                        f.seek(offset)
+                        tail = f.read()
+                    tmp = self.journal_path.with_suffix(".tmp")
+                    with open(tmp, "wb") as f:
+                        f.write(tail)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._fh.close()
+                    os.replace(tmp, self.journal_path)
+                    self._fh = open(self.journal_path, "ab")
+                    self._size = len(tail)
+                    self._snapshot_mtime = self._mtime(self.snapshot_path)
+                    self._dirty = False
+                    self.since_snapshot = self.seq - upto
+            except (OSError, TypeError, ValueError) as e:
+                log.warning("journal: snapshot failed, keeping the journal: %s", e)
+                return False
+            return True
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        with self._lock:
+            if self._fh and not self._fh.closed:
+                self._fh.flush()
+                if self.fsync != "never":
+                    os.fsync(self._fh.fileno())
+                self._fh.close()
+
+    def _fsync_loop(self):
+        while not self._stopped:
+            self._wake.wait(self.fsync_interval)
+            self._wake.clear()
+            with self._lock:
+                if self._stopped or self._fh.closed:
+                    return
+                if self._dirty and self.fsync == "interval":
+                    os.fsync(self._fh.fileno())
+                    self._dirty = False
+            if self._snapshot_due:
+                self.snapshot()
@@ -0,0 +1,103 @@
+# json_provider.py
+# Fast JSON provider for Flask: orjson when installed, stdlib json otherwise.
+# Also supports RawJSON fragments (already-encoded bytes) so cached payloads such
+# as whole pages can be embedded in responses without being re-serialized.
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+    USE_ORJSON = True
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_FRAGMENT = getattr(orjson, "Fragment", None)
+except Exception:
+    USE_ORJSON = False
+    _ORJSON_FRAGMENT = None
+
+
+class RawJSON:
+    """Pre-encoded JSON (bytes) that is spliced into output verbatim."""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _default(o):
+    if isinstance(o, (datetime.datetime, datetime.date)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, indent=False, sort_keys=False):
+    """Serialize `obj` to UTF-8 JSON bytes, expanding any RawJSON fragments."""
+    if isinstance(obj, RawJSON):
+        return obj.data
+    fragments = []
+    token = None
+
+    def default(o):
+        nonlocal token
+        if isinstance(o, RawJSON):
+            if _ORJSON_FRAGMENT is not None and USE_ORJSON:
+                return _ORJSON_FRAGMENT(o.data)
+            if token is None:
+                token = uuid.uuid4().hex
+            fragments.append(o.data)
+            return f"__raw_{token}_{len(fragments) - 1}__"
+        return _default(o)
+
+    if USE_ORJSON:
+        opts = _ORJSON_OPTS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        if sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        out = orjson.dumps(obj, default=default, option=opts)
+    else:
+        out = json.dumps(
+            obj, default=default, ensure_ascii=False, sort_keys=sort_keys,
+            indent=2 if indent else None, separators=None if indent else (",", ":"),
+        ).encode("utf-8")
+    for i, data in enumerate(fragments):
+        out = out.replace(f'"__raw_{token}_{i}__"'.encode("ascii"), data, 1)
+    return out
+
+
+def loads(s):
+    if USE_ORJSON:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(JSONProvider):
+    """Drop-in replacement for Flask's DefaultJSONProvider (``app.json = FastJSONProvider(app)``)."""
+
+    mimetype = "application/json"
+    sort_keys = False
+    compact = None
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, indent=bool(kwargs.get("indent")), sort_keys=kwargs.get("sort_keys", self.sort_keys)).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps_bytes(obj, indent=indent, sort_keys=self.sort_keys)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,134 @@
+# llm.py
+# OpenAI completion helpers (with an offline stub) and the plan runner shared by
+# the sync Flask routes and the async ASGI routes.
+#
+# The openai package is only imported on the first real completion, so a cold
+# start without traffic to the AI endpoints never pays for it.
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import tokens
+
+OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+USE_OPENAI = bool(OPENAI_KEY) and importlib.util.find_spec("openai") is not None
+PARALLEL = int(os.getenv("LLM_PARALLEL", "8"))  # threads for multi-prompt plans (sync path)
+
+_openai = None
+_pool = None
+
+
+def _client():
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = OPENAI_KEY
+        _openai = openai
+    return _openai
+
+
+def _stub(prompt):
+    # Safe stub response for offline demos
+    return "OPENAI_KEY not set — stub response. Prompt head: " + (prompt[:200] + "...")
+
+
+@metrics.timed()
+def run_openai_completion(prompt, max_tokens=200, temperature=0.7):
+    """Run OpenAI Completion (davinci) with fallback stub if key is absent."""
+    if not USE_OPENAI:
+        return _stub(prompt)
+    try:
+        resp = _client().Completion.create(
+            model="text-davinci-003",
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return resp.choices[0].text.strip()
+    except Exception as e:
+        return f"OpenAI error: {e}"
+
+
+async def run_openai_completion_async(prompt, max_tokens=200, temperature=0.7):
+    """Async twin of run_openai_completion, used by the ASGI routes in asgi.py."""
+    if not USE_OPENAI:
+        return _stub(prompt)
+    with metrics.FUNCTIONS.time("run_openai_completion_async"):
+        try:
+            resp = await _client().Completion.acreate(
+                model="text-davinci-003",
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            return resp.choices[0].text.strip()
+        except Exception as e:
+            return f"OpenAI error: {e}"
+
+
+def _guard(endpoint, prompt, max_tokens):
+    """Last-resort cut so prompt + completion fit the model context; returns (prompt, prompt tokens)."""
+    limit = tokens.MODEL_CONTEXT - max_tokens
+    n = tokens.count(prompt)
+    if n > limit:
+        tokens.TRUNCATIONS.inc(endpoint, "context")
+        prompt = tokens.truncate(prompt, limit)
+        n = tokens.count(prompt)
+    return prompt, n
+
+
+def complete(endpoint, prompt, max_tokens=200):
+    """run_openai_completion for a named endpoint: context-guarded and token-counted."""
+    prompt, n = _guard(endpoint, prompt, max_tokens)
+    out = run_openai_completion(prompt, max_tokens=max_tokens)
+    if USE_OPENAI:
+        tokens.record(endpoint, n, out)
+    return out
+
+
+async def complete_async(endpoint, prompt, max_tokens=200):
+    prompt, n = _guard(endpoint, prompt, max_tokens)
+    out = await run_openai_completion_async(prompt, max_tokens=max_tokens)
+    if USE_OPENAI:
+        tokens.record(endpoint, n, out)
+    return out
+
+
+class Chain:
+    """Returned by a plan's finish() to run a follow-up plan (e.g. the reduce step of a map-reduce)."""
+
+    def __init__(self, plan):
+        self.plan = plan
+
+
+# LLM-backed endpoints are split into plan_* (validate input, build the prompt) and a
+# finish(completion) callback, so the sync Flask routes and the async ASGI routes share
+# one implementation. A plan is one of
+#   {"result", "status"}               answered without the LLM
+#   {"prompt", "max_tokens", "finish"}  one completion -> finish(text)
+#   {"prompts", "finish"}              {key: (prompt, max_tokens)} run in parallel -> finish({key: text})
+# LLM plans also name their "endpoint" (token budgets and counters, see tokens.py),
+# and finish() may return Chain(next_plan) to continue with another round of calls.
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=PARALLEL, thread_name_prefix="llm")
+    return _pool
+
+
+def run_llm_plan(plan):
+    """Execute a plan synchronously; returns (body, status)."""
+    while True:
+        endpoint = plan.get("endpoint", "other")
+        if "prompt" in plan:
+            body = plan["finish"](complete(endpoint, plan["prompt"], max_tokens=plan["max_tokens"]))
+        elif "prompts" in plan:
+            futures = {key: _executor().submit(complete, endpoint, prompt, max_tokens=max_tokens)
+                       for key, (prompt, max_tokens) in plan["prompts"].items()}
+            body = plan["finish"]({key: f.result() for key, f in futures.items()})
+        else:
+            return plan["result"], plan.get("status", 200)
+        if not isinstance(body, Chain):
+            return body, 200
+        plan = body.plan
@@ -0,0 +1,214 @@
+# metrics.py
+# Minimal Prometheus instrumentation (no client library needed).
+#
+#   http_requests_total{endpoint,method,status}        counter
+#   http_request_duration_seconds{endpoint,method}     histogram
+#   http_requests_in_flight                            gauge
+#   app_function_duration_seconds{function}            histogram (see @timed)
+#   db_query_duration_seconds{operation}               histogram (SQLAlchemy)
+#
+# Endpoint labels use the URL rule ("/api/pages/<pagename>"), not the raw path,
+# so label cardinality stays bounded. Each observation is a bisect plus a few
+# increments under one lock.
+import bisect
+import functools
+import sys
+import threading
+import time
+
+from flask import g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0)
+
+
+def _fmt_labels(names, values, extra=None):
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for lv, v in items:
+            yield f"{self.name}{_fmt_labels(self.labels, lv)} {v}"
+
+
+class Gauge(Counter):
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def collect(self):
+        lines = list(super().collect())
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            s[idx] += 1
+            s[-1] += value
+
+    def time(self, *label_values):
+        return _Timer(self, label_values)
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(lv, list(s)) for lv, s in self._series.items()]
+        for lv, s in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), s[:-1]):
+                cumulative += count
+                le = 'le="%s"' % bound
+                yield f"{self.name}_bucket{_fmt_labels(self.labels, lv, le)} {cumulative}"
+            yield f"{self.name}_sum{_fmt_labels(self.labels, lv)} {s[-1]}"
+            yield f"{self.name}_count{_fmt_labels(self.labels, lv)} {cumulative}"
+
+
+class _Timer:
+    __slots__ = ("hist", "labels", "start")
+
+    def __init__(self, hist, labels):
+        self.hist, self.labels = hist, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.start, *self.labels)
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by endpoint, method and status.", ("endpoint", "method", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency.", ("endpoint", "method"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+FUNCTIONS = Histogram("app_function_duration_seconds", "Time spent in instrumented functions.", ("function",), SLOW_BUCKETS)
+DB_QUERIES = Histogram("db_query_duration_seconds", "SQLAlchemy statement execution time.", ("operation",))
+
+REGISTRY = [REQUESTS, LATENCY, IN_FLIGHT, FUNCTIONS, DB_QUERIES]
+
+
+def register(metric):
+    """Add another metric to the /metrics output; returns it for convenience."""
+    REGISTRY.append(metric)
+    return metric
+
+
+def render():
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def timed(name=None):
+    """Decorator: record the wrapped function's duration in app_function_duration_seconds."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                FUNCTIONS.observe(time.perf_counter() - start, label)
+        return wrapper
+    return decorator
+
+
+# ----------------------------
+# Flask + SQLAlchemy hooks
+# ----------------------------
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "<unmatched>"
+
+
+def init_app(app):
+    """Install request timing hooks on `app`."""
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_start = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def _metrics_record(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            endpoint = _endpoint()
+            LATENCY.observe(time.perf_counter() - start, endpoint, request.method)
+            REQUESTS.inc(endpoint, request.method, response.status_code)
+            IN_FLIGHT.dec()
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # after_request is skipped on unhandled exceptions; account for those here
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            endpoint = _endpoint()
+            LATENCY.observe(time.perf_counter() - start, endpoint, request.method)
+            REQUESTS.inc(endpoint, request.method, 500)
+            IN_FLIGHT.dec()
+
+    # don't pull SQLAlchemy in just to instrument it; db.py calls instrument_sqlalchemy() itself
+    if "sqlalchemy" in sys.modules:
+        instrument_sqlalchemy()
+
+
+_sqlalchemy_instrumented = False
+
+
+def instrument_sqlalchemy():
+    """Time every SQL statement on every SQLAlchemy engine (no-op if SQLAlchemy is absent)."""
+    global _sqlalchemy_instrumented
+    if _sqlalchemy_instrumented:
+        return
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+    except Exception:
+        return
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_metrics_t0")
+        if stack:
+            op = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+            DB_QUERIES.observe(time.perf_counter() - stack.pop(), op)
+
+    _sqlalchemy_instrumented = True
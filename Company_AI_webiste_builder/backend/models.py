@@ -1,24 +1,69 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import uuid
 
 Base = declarative_base()
 
+DEFAULT_TENANT = "default"
+
 def gen_uuid():
     return str(uuid.uuid4())
 
+def tenant_column():
+    """Owning site of a row; every query should filter on it (see tenants.py)."""
+    return Column(String(63), nullable=False, default=DEFAULT_TENANT, server_default=DEFAULT_TENANT, index=True)
+
+class Tenant(Base):
+    __tablename__ = "tenants"
+    id = Column(String(63), primary_key=True)
+    domains = Column(JSON)   # custom domains served by this site
+    admins = Column(JSON)    # site admin emails
+    quotas = Column(JSON)    # overrides of tenants.DEFAULT_QUOTAS
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class Page(Base):
     __tablename__ = "pages"
+    __table_args__ = (UniqueConstraint("tenant_id", "name"),)
     id = Column(Integer, primary_key=True)
-    name = Column(String(100), unique=True, nullable=False)
-    content = Column(JSON, nullable=False)
+    tenant_id = tenant_column()
+    name = Column(String(100), nullable=False)
+    content = Column(JSON, nullable=False)  # current version: reading a page stays one row
+    rev = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PageRevision(Base):
+    """Page history: a full snapshot every few revisions, JSON patches in between (see revisions.py)."""
+    __tablename__ = "page_revisions"
+    __table_args__ = (UniqueConstraint("tenant_id", "page_name", "rev"),)
+    id = Column(Integer, primary_key=True)
+    tenant_id = tenant_column()
+    page_name = Column(String(100), nullable=False)
+    rev = Column(Integer, nullable=False)
+    kind = Column(String(10), nullable=False)  # snapshot | delta
+    content = Column(JSON)   # kind == snapshot
+    patch = Column(JSON)     # kind == delta, against rev - 1
+    author = Column(String(255))
+    message = Column(String(255))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class PageDraft(Base):
+    __tablename__ = "page_drafts"
+    __table_args__ = (UniqueConstraint("tenant_id", "page_name"),)
+    id = Column(Integer, primary_key=True)
+    tenant_id = tenant_column()
+    page_name = Column(String(100), nullable=False)
+    base_rev = Column(Integer, nullable=False)
+    patch = Column(JSON, nullable=False)
+    author = Column(String(255))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class Job(Base):
     __tablename__ = "jobs"
     id = Column(String(36), primary_key=True, default=gen_uuid)
+    tenant_id = tenant_column()
     title = Column(String(255), nullable=False)
     skills = Column(String(500))
     description = Column(Text)
@@ -26,18 +71,31 @@ class Job(Base):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_tenant_created", "tenant_id", "created_at"),
+        Index("ix_applications_tenant_email_job", "tenant_id", "email", "job_title"),
+        Index("ix_applications_tenant_sha256", "tenant_id", "resume_sha256"),
+    )
     id = Column(String(36), primary_key=True, default=gen_uuid)
+    tenant_id = tenant_column()
     name = Column(String(200))
     email = Column(String(200))
     job_title = Column(String(200))
     resume_path = Column(String(1000))
     parsed = Column(JSON)
     score = Column(JSON)
+    # duplicate detection (dedup.py); MinHash band lookups stay in the in-process index
+    resume_sha256 = Column(String(64))
+    minhash = Column(String(512))
+    duplicate_of = Column(String(36), index=True)
+    duplicate_reason = Column(String(20))  # exact | near | email_job
+    same_candidate_as = Column(String(36), index=True)  # same resume, another job
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class Portfolio(Base):
     __tablename__ = "portfolios"
     id = Column(String(36), primary_key=True, default=gen_uuid)
+    tenant_id = tenant_column()
     html = Column(Text)
     meta = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -45,6 +103,7 @@ class Portfolio(Base):
 class BlogPost(Base):
     __tablename__ = "blog_posts"
     id = Column(String(36), primary_key=True, default=gen_uuid)
+    tenant_id = tenant_column()
     title = Column(String(255))
     content = Column(Text)
     summary = Column(Text)
@@ -53,6 +112,7 @@ class BlogPost(Base):
 class Testimonial(Base):
     __tablename__ = "testimonials"
     id = Column(String(36), primary_key=True, default=gen_uuid)
+    tenant_id = tenant_column()
     client = Column(String(200))
     quote = Column(Text)
     author = Column(String(200))
@@ -60,7 +120,9 @@ class Testimonial(Base):
 
 class Analytics(Base):
     __tablename__ = "analytics"
+    __table_args__ = (UniqueConstraint("tenant_id", "key"),)
     id = Column(Integer, primary_key=True)
-    key = Column(String(100), unique=True)
+    tenant_id = tenant_column()
+    key = Column(String(100))
     value = Column(JSON)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
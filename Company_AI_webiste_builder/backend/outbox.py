@@ -0,0 +1,314 @@
+# outbox.py
+# Transactional outbox for outgoing email (application acknowledgements).
+#
+# /api/apply only records a message in DB["outbox"], journaled right after the
+# application itself, so the request never waits on the LLM or SMTP. A background
+# sender thread (one per process, started on the first request) then:
+#   - collects due messages from every tenant, up to BATCH per pass
+#   - renders them (the LLM writes one template per tenant + job, cached, so a
+#     hundred applicants to one job cost one completion)
+#   - delivers the batch over one SMTP connection that is kept open between
+#     batches and re-opened when idle or dropped
+#   - on failure retries with exponential backoff; after MAX_ATTEMPTS, or on a
+#     permanent (5xx) rejection, the message moves to DB["outbox_dead"]
+# Delivery is at-least-once: a message is removed from the outbox only after the
+# server accepted it, so pending mail survives a restart (with the journal on).
+#
+# Disabled unless SMTP_HOST is set. For local testing run a debugging server:
+#   python -m aiosmtpd -n -l localhost:1025     (or python -m smtpd -n -c DebuggingServer localhost:1025 on <= 3.11)
+#   SMTP_HOST=localhost SMTP_PORT=1025 python app.py
+# smtplib (and ssl) are imported by the sender only, keeping app import cheap.
+import datetime
+import functools
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+import llm
+import metrics
+import store
+import tokens
+from store import DB, persist
+
+log = logging.getLogger(__name__)
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "0") == "1"
+MAIL_FROM = os.getenv("MAIL_FROM", "careers@mastersolis.example")
+ENABLED = bool(SMTP_HOST)
+
+BATCH = int(os.getenv("OUTBOX_BATCH", "50"))
+LINGER = float(os.getenv("OUTBOX_LINGER", "0.5"))        # wait after a wake-up so a batch can fill
+POLL = float(os.getenv("OUTBOX_POLL", "5"))              # also look for due retries this often
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+BACKOFF = float(os.getenv("OUTBOX_BACKOFF", "30"))       # seconds, doubled per attempt, capped at 1h
+IDLE_CLOSE = float(os.getenv("SMTP_IDLE_CLOSE", "60"))   # close the pooled connection after this long unused
+ADDRESS_RE = re.compile(r"[^@\s<>,;\"]+@[^@\s<>,;\"]+\.[^@\s<>,;\"]+")   # one bare address, no header injection
+
+SENT = metrics.register(metrics.Counter(
+    "outbox_messages_total", "Outbox deliveries by result (sent, retry, dead).", ("result",)))
+
+_wake = threading.Event()
+_thread = None
+_pid = None
+_start_lock = threading.Lock()
+_lock = threading.Lock()    # guards DB["outbox"] / DB["outbox_dead"] (request threads + the sender)
+
+
+# ----------------------------
+# Enqueue (request path)
+# ----------------------------
+def clean_address(address):
+    """`address` stripped, or None if it isn't a single plain email address."""
+    address = (address or "").strip()
+    return address if ADDRESS_RE.fullmatch(address) else None
+
+
+def enqueue(kind, to, context):
+    """Record a message for the current tenant; the sender picks it up in the background.
+
+    Raises ValueError if `to` is not a plain email address (see clean_address).
+    """
+    address = clean_address(to)
+    if address is None:
+        raise ValueError(f"not an email address: {to!r}")
+    to = address
+    msg = {"id": str(uuid.uuid4()), "kind": kind, "to": to, "context": context, "attempts": 0,
+           "next_attempt": time.time(), "created": datetime.datetime.utcnow().isoformat()}
+    with _lock:
+        DB.setdefault("outbox", {})[msg["id"]] = msg
+        persist("set", ["outbox", msg["id"]], msg)
+    start()
+    _wake.set()
+    return msg
+
+
+def init_app(app):
+    """Start the sender with the first request of each (possibly forked) worker process."""
+    if ENABLED:
+        app.before_request(start)
+
+
+def start():
+    global _thread, _pid
+    if not ENABLED or (_pid == os.getpid() and _thread is not None and _thread.is_alive()):
+        return
+    with _start_lock:
+        if _pid == os.getpid() and _thread is not None and _thread.is_alive():
+            return
+        _pid = os.getpid()
+        _thread = threading.Thread(target=_run, name="outbox", daemon=True)
+        _thread.start()
+
+
+# ----------------------------
+# Rendering
+# ----------------------------
+TEMPLATES = {
+    "application_ack": (
+        "We received your application: {job_title}",
+        "Hi {name},\n\nThank you for applying for the {job_title} position at {company}. "
+        "Our team reviews every application and will get back to you if your profile is a match.\n\n"
+        "Best regards,\n{company} Careers",
+    ),
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _llm_body(tenant_id, kind, company, job_title):
+    # one completion per tenant/job; "{name}" is filled in per message
+    company, job_title = tokens.truncate(company, 30), tokens.truncate(job_title, 30)
+    prompt = (f"Write a short, warm email (60-90 words, plain text, no subject line) from {company} acknowledging "
+              f"a job application for the {job_title} position. Address the applicant as {{name}} literally, "
+              f"and sign as '{company} Careers'.")
+    out = llm.complete("outbox", prompt, max_tokens=160)
+    if not out or out.startswith("OpenAI error"):
+        raise RuntimeError(out)  # exceptions are not cached by lru_cache
+    return out if "{name}" in out else "Hi {name},\n\n" + out
+
+
+def render(msg, tenant_id):
+    """(subject, body) for a message; falls back to the static template if the LLM is unavailable."""
+    ctx = msg["context"]
+    company = DB.get("pages", {}).get("home", {}).get("title") or "our company"
+    fields = {"name": ctx.get("name") or "there", "job_title": ctx.get("job_title") or "open", "company": company}
+    subject, template = TEMPLATES[msg["kind"]]
+    if llm.USE_OPENAI:
+        try:
+            template = _llm_body(tenant_id, msg["kind"], company, fields["job_title"])
+        except Exception as e:
+            log.warning("outbox: LLM rendering failed, using template: %s", e)
+    body = template
+    for k, v in fields.items():
+        body = body.replace("{" + k + "}", str(v))  # not str.format: LLM text may contain braces
+    return subject.format(**fields), body
+
+
+# ----------------------------
+# Delivery
+# ----------------------------
+class _Connection:
+    """One SMTP connection reused across batches (the sender thread is its only user)."""
+
+    def __init__(self):
+        self.smtp = None
+        self.last_used = 0.0
+
+    def get(self):
+        import smtplib
+
+        if self.smtp is not None and time.monotonic() - self.last_used > IDLE_CLOSE:
+            self.close()
+        if self.smtp is not None:
+            try:
+                self.smtp.noop()
+            except smtplib.SMTPException:
+                self.close()
+        if self.smtp is None:
+            self.smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+            if SMTP_STARTTLS:
+                self.smtp.starttls()
+            if SMTP_USER:
+                self.smtp.login(SMTP_USER, SMTP_PASSWORD or "")
+        self.last_used = time.monotonic()
+        return self.smtp
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except Exception:
+                pass
+            self.smtp = None
+
+
+_conn = _Connection()
+
+
+def _due(now):
+    out = []
+    for tenant_id in store.tenant_ids():
+        with store.using_tenant(tenant_id), _lock:
+            for msg in list(DB.get("outbox", {}).values()):
+                if msg["next_attempt"] <= now:
+                    out.append((tenant_id, msg))
+                    if len(out) == BATCH:
+                        return out
+    return out
+
+
+def _sent(msg):
+    with _lock:
+        DB.get("outbox", {}).pop(msg["id"], None)
+        persist("delete", ["outbox", msg["id"]])
+    SENT.inc("sent")
+
+
+def _dead(msg, error):
+    msg = dict(msg, last_error=str(error), dead_at=datetime.datetime.utcnow().isoformat())
+    with _lock:
+        DB.get("outbox", {}).pop(msg["id"], None)
+        persist("delete", ["outbox", msg["id"]])
+        DB.setdefault("outbox_dead", {})[msg["id"]] = msg
+        persist("set", ["outbox_dead", msg["id"]], msg)
+    SENT.inc("dead")
+    log.error("outbox: dead-lettered %s to %s: %s", msg["id"], msg["to"], error)
+
+
+def _retry(msg, error):
+    attempts = msg["attempts"] + 1
+    if attempts >= MAX_ATTEMPTS:
+        return _dead(dict(msg, attempts=attempts), error)
+    msg = dict(msg, attempts=attempts, last_error=str(error),
+               next_attempt=time.time() + min(3600, BACKOFF * 2 ** (attempts - 1)))
+    with _lock:
+        DB.setdefault("outbox", {})[msg["id"]] = msg
+        persist("set", ["outbox", msg["id"]], msg)
+    SENT.inc("retry")
+
+
+def flush():
+    """Deliver one batch of due messages; returns how many were sent."""
+    import smtplib  # with ssl, only loaded once there is mail to send
+    from email.message import EmailMessage
+
+    batch = _due(time.time())
+    if not batch:
+        if _conn.smtp is not None and time.monotonic() - _conn.last_used > IDLE_CLOSE:
+            _conn.close()
+        return 0
+    sent = 0
+    for i, (tenant_id, msg) in enumerate(batch):
+        with store.using_tenant(tenant_id):
+            try:
+                subject, body = render(msg, tenant_id)
+                email = EmailMessage()
+                email["From"], email["To"], email["Subject"] = MAIL_FROM, msg["to"], subject
+                email.set_content(body)
+            except Exception as e:
+                # a message that can't be built never will be (bad address, unknown kind): set it aside
+                _dead(msg, e)
+                continue
+            try:
+                _conn.get().send_message(email)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                _dead(msg, e)
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code >= 500:
+                    _dead(msg, e)
+                else:
+                    _retry(msg, e)
+            except (OSError, smtplib.SMTPException) as e:
+                # connection trouble: back off this message, leave the rest for the next pass
+                _conn.close()
+                _retry(msg, e)
+                break
+            else:
+                _sent(msg)
+                sent += 1
+    return sent
+
+
+def _run():
+    while True:
+        if _wake.wait(POLL):
+            time.sleep(LINGER)
+        _wake.clear()
+        try:
+            while flush() == BATCH:
+                pass
+        except Exception:
+            log.exception("outbox: sender pass failed")
+
+
+# ----------------------------
+# Admin
+# ----------------------------
+def status():
+    with _lock:  # the sender thread mutates these dicts
+        pending, dead = list(DB.get("outbox", {}).values()), list(DB.get("outbox_dead", {}).values())
+    return {"enabled": ENABLED,
+            "pending": sorted(pending, key=lambda m: m["created"]),
+            "dead": sorted(dead, key=lambda m: m["created"])}
+
+
+def requeue(msg_id):
+    """Move a dead-lettered message back into the outbox; returns it, or None if unknown."""
+    with _lock:
+        msg = DB.get("outbox_dead", {}).pop(msg_id, None)
+        if msg is None:
+            return None
+        persist("delete", ["outbox_dead", msg_id])
+        msg = {k: v for k, v in msg.items() if k not in ("last_error", "dead_at")}
+        msg.update(attempts=0, next_attempt=time.time())
+        DB.setdefault("outbox", {})[msg_id] = msg
+        persist("set", ["outbox", msg_id], msg)
+    start()
+    _wake.set()
+    return msg
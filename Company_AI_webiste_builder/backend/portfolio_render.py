@@ -0,0 +1,104 @@
+# portfolio_render.py
+# Theme-based portfolio rendering.
+#
+# Templates live in templates/portfolio/<theme>.html, are compiled once by
+# load_templates() (on first use, or up front by serve.py) and rendered with
+# autoescaping. Rendered HTML is cached per
+# (portfolio id, theme, portfolio version, template version), so a view after
+# the first one is a dict lookup and a template edit invalidates only that theme.
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "portfolio"
+DEFAULT_THEME = "classic"
+CACHE_SIZE = 2048
+
+_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+)
+_templates = {}          # theme -> compiled jinja2.Template
+_template_versions = {}  # theme -> short hash of template (+ base) source
+_cache = OrderedDict()   # (pid, theme, version, template_version) -> html
+_lock = threading.Lock()
+
+
+def load_templates():
+    """(Re)compile every theme template. Call at startup and after editing templates."""
+    if _env.cache is not None:
+        _env.cache.clear()
+    base = (TEMPLATE_DIR / "_base.html").read_bytes()
+    templates, versions = {}, {}
+    for path in sorted(TEMPLATE_DIR.glob("*.html")):
+        if path.name.startswith("_"):
+            continue
+        theme = path.stem
+        templates[theme] = _env.get_template(path.name)
+        versions[theme] = hashlib.sha1(base + path.read_bytes()).hexdigest()[:12]
+    with _lock:
+        _templates.clear()
+        _templates.update(templates)
+        _template_versions.clear()
+        _template_versions.update(versions)
+    return sorted(templates)
+
+
+def _ensure_loaded():
+    if not _templates:
+        load_templates()
+
+
+def themes():
+    _ensure_loaded()
+    return sorted(_templates)
+
+
+def _context(meta):
+    return {
+        "name": meta.get("name") or "Unknown",
+        "email": meta.get("email") or "",
+        "intro": meta.get("intro") or "",
+        "skills": list(meta.get("skills") or []),
+        "experience_years": meta.get("experience_years") or 0,
+    }
+
+
+def render(pid, rec, theme=None):
+    """Render portfolio record `rec` in `theme`, using the rendered-HTML cache.
+
+    `pid` is only used as the cache key, so callers may qualify it (e.g. with a tenant).
+    """
+    _ensure_loaded()
+    theme = theme or rec.get("theme") or DEFAULT_THEME
+    template = _templates.get(theme)
+    if template is None:
+        raise KeyError(theme)
+    key = (pid, theme, rec.get("version", 0), _template_versions[theme])
+    with _lock:
+        html = _cache.get(key)
+        if html is not None:
+            _cache.move_to_end(key)
+            return html
+    html = template.render(**_context(rec.get("meta") or {}))
+    with _lock:
+        _cache[key] = html
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return html
+
+
+def invalidate(pid=None):
+    """Drop cached renders for one portfolio (or everything)."""
+    with _lock:
+        if pid is None:
+            _cache.clear()
+        else:
+            for key in [k for k in _cache if k[0] == pid]:
+                del _cache[key]
@@ -0,0 +1,119 @@
+# profiler.py
+# Opt-in per-request cProfile capture.
+#
+# A request is profiled when either
+#   * it sends "X-Profile: 1" together with a valid admin bearer token, or
+#   * it is picked by random sampling (PROFILE_SAMPLE_RATE, default 0 = off).
+# Captured profiles are kept in a bounded in-memory ring (and dumped as .prof files
+# when PROFILE_DIR is set, for snakeviz/pstats) and served by the admin endpoints.
+import cProfile
+import collections
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from flask import g, request
+
+import auth
+
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+SORT_KEYS = {"cumulative": 3, "tottime": 2, "calls": 1}
+
+_profiles = collections.OrderedDict()  # id -> record
+_lock = threading.Lock()
+
+
+def _wanted():
+    if request.headers.get("X-Profile") == "1":
+        return auth.verify_token(auth.bearer_token(request.headers)) is not None
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+def _store(prof, status):
+    stats = pstats.Stats(prof)
+    rows = {}
+    for (filename, lineno, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows[f"{filename}:{lineno}({func})"] = (cc, nc, tt, ct)
+    pid = uuid.uuid4().hex[:12]
+    rec = {
+        "id": pid,
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.url_rule.rule if request.url_rule else None,
+        "status": status,
+        "duration_ms": round((time.perf_counter() - g._profile_start) * 1000, 3),
+        "captured_at": time.time(),
+        "sampled": request.headers.get("X-Profile") != "1",
+        "total_calls": stats.total_calls,
+        "rows": rows,
+    }
+    if PROFILE_DIR:
+        Path(PROFILE_DIR).mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(str(Path(PROFILE_DIR) / f"{pid}.prof"))
+    with _lock:
+        _profiles[pid] = rec
+        while len(_profiles) > MAX_STORED:
+            _profiles.popitem(last=False)
+    return pid
+
+
+def init_app(app):
+    """Install the profiling hooks on `app`."""
+
+    @app.before_request
+    def _profile_start():
+        if not _wanted():
+            return
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # another profiler is active (Python 3.12+ allows only one); skip this request
+            return
+        g._profile = prof
+        g._profile_start = time.perf_counter()
+
+    @app.after_request
+    def _profile_stop(response):
+        prof = g.pop("_profile", None)
+        if prof is not None:
+            prof.disable()
+            response.headers["X-Profile-Id"] = _store(prof, response.status_code)
+        return response
+
+    @app.teardown_request
+    def _profile_abort(exc):
+        prof = g.pop("_profile", None)
+        if prof is not None:
+            prof.disable()
+            _store(prof, 500)
+
+
+def list_profiles():
+    with _lock:
+        recs = list(_profiles.values())
+    return [{k: v for k, v in r.items() if k != "rows"} for r in reversed(recs)]
+
+
+def top_functions(pid, n=20, sort="cumulative"):
+    """Return the profile summary plus its top-n functions, or None if unknown."""
+    with _lock:
+        rec = _profiles.get(pid)
+    if rec is None:
+        return None
+    idx = SORT_KEYS.get(sort, 3)
+    rows = sorted(rec["rows"].items(), key=lambda kv: kv[1][idx], reverse=True)[:n]
+    out = {k: v for k, v in rec.items() if k != "rows"}
+    out["sort"] = sort if sort in SORT_KEYS else "cumulative"
+    out["functions"] = [
+        {"function": name, "primitive_calls": cc, "calls": nc,
+         "tottime_ms": round(tt * 1000, 3), "cumtime_ms": round(ct * 1000, 3)}
+        for name, (cc, nc, tt, ct) in rows
+    ]
+    return out
@@ -0,0 +1,198 @@
+# ratelimit.py
+# Admission control for the expensive (LLM-backed) endpoints.
+#
+#  * token bucket per (endpoint class, client) — client is the admin behind a
+#    valid bearer token, otherwise the remote IP. 429 + Retry-After when empty.
+#  * token bucket per tenant shared by all limited endpoints (tenants.py quota
+#    "llm"), so one busy site cannot spend the whole fleet's LLM budget.
+#  * global concurrency gate shared by all limited endpoints — 503 + Retry-After
+#    when every slot is busy, so bursts are shed before any LLM work starts.
+#
+# Buckets live in process memory by default; set RATE_LIMIT_REDIS_URL to share
+# them across workers/hosts.
+import functools
+import math
+import os
+import threading
+import time
+
+from flask import jsonify, request
+
+import auth
+import store
+import tenants
+
+# endpoint class -> "N/period" (burst = N)
+DEFAULT_LIMITS = {
+    "chat": "20/min",
+    "ai": "10/min",
+    "upload": "5/min",
+}
+_PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600}
+
+
+def parse_limit(spec):
+    """'20/min' -> (refill rate per second, burst capacity)."""
+    count, _, period = spec.partition("/")
+    count = float(count)
+    seconds = _PERIODS[period.strip().lower() or "s"]
+    return count / seconds, count
+
+
+# ----------------------------
+# Backends
+# ----------------------------
+class MemoryBackend:
+    """Per-process token buckets: key -> [tokens, last refill timestamp]."""
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1.0):
+        """Try to take `cost` tokens. Returns (allowed, seconds until allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._prune(now)
+                bucket = self._buckets[key] = [burst, now]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (cost - tokens) / rate
+
+    def _prune(self, now):
+        # buckets idle for an hour have refilled completely; dropping them loses nothing
+        for key, (tokens, ts) in list(self._buckets.items()):
+            if now - ts > 3600:
+                del self._buckets[key]
+
+
+class RedisBackend:
+    """Token buckets in Redis, updated atomically by a Lua script."""
+
+    _SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 't'))
+    local ts = tonumber(redis.call('HGET', KEYS[1], 'ts'))
+    local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    if tokens == nil then tokens = burst; ts = now end
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then tokens = tokens - cost; allowed = 1 end
+    redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self._SCRIPT)
+
+    def take(self, key, rate, burst, cost=1.0):
+        allowed, tokens = self._take(keys=[f"rl:{key}"], args=[rate, burst, time.time(), cost])
+        if int(allowed):
+            return True, 0.0
+        return False, (cost - float(tokens)) / rate
+
+
+class ConcurrencyGate:
+    """Non-blocking cap on in-flight expensive requests."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._sem = threading.BoundedSemaphore(limit)
+
+    def try_acquire(self):
+        return self._sem.acquire(blocking=False)
+
+    def release(self):
+        self._sem.release()
+
+
+# ----------------------------
+# Configuration
+# ----------------------------
+LIMITS = {name: parse_limit(os.getenv(f"RATE_LIMIT_{name.upper()}", spec)) for name, spec in DEFAULT_LIMITS.items()}
+ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") != "0"
+TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+BACKEND = RedisBackend(os.getenv("RATE_LIMIT_REDIS_URL")) if os.getenv("RATE_LIMIT_REDIS_URL") else MemoryBackend()
+GATE = ConcurrencyGate(int(os.getenv("AI_MAX_CONCURRENCY", "8")))
+
+
+def client_key_for(authorization, forwarded_for, remote_addr):
+    """Identify the caller from raw header values (shared with the ASGI routes)."""
+    # only a verified token identifies a client; otherwise rotating junk tokens would dodge the IP limit
+    token = authorization[7:].strip() if authorization and authorization.startswith("Bearer ") else None
+    claims = auth.verify_token(token)
+    if claims is not None:
+        return "sub:" + claims["sub"]
+    if TRUST_PROXY and forwarded_for:
+        return "ip:" + forwarded_for.split(",")[0].strip()
+    return "ip:" + (remote_addr or "unknown")
+
+
+def client_key():
+    return client_key_for(request.headers.get("Authorization"), request.headers.get("X-Forwarded-For"), request.remote_addr)
+
+
+@functools.lru_cache(maxsize=256)
+def _tenant_limit(spec):
+    return parse_limit(spec)
+
+
+def check(endpoint_class, key):
+    """Take one token for (endpoint_class, key) in the current tenant, then one from the
+    tenant's own LLM quota. Returns None if allowed, else seconds to wait."""
+    tenant_id = store.current_tenant()
+    rate, burst = LIMITS[endpoint_class]
+    allowed, wait = BACKEND.take(f"{endpoint_class}:{tenant_id}:{key}", rate, burst)
+    if not allowed:
+        return wait
+    if tenant_id != store.DEFAULT_TENANT:
+        rate, burst = _tenant_limit(tenants.quota("llm", tenant_id))
+        allowed, wait = BACKEND.take(f"tenant:{tenant_id}", rate, burst)
+        if not allowed:
+            return wait
+    return None
+
+
+def _reject(status, error, retry_after):
+    retry_after = max(1, math.ceil(retry_after))
+    resp = jsonify({"error": error, "retry_after": retry_after})
+    resp.status_code = status
+    resp.headers["Retry-After"] = str(retry_after)
+    return resp
+
+
+def limited(endpoint_class):
+    """Decorator: apply the token bucket for `endpoint_class` and the global concurrency gate."""
+    if endpoint_class not in LIMITS:
+        raise KeyError(f"unknown endpoint class: {endpoint_class}")
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return view(*args, **kwargs)
+            wait = check(endpoint_class, client_key())
+            if wait is not None:
+                return _reject(429, "Rate limit exceeded", wait)
+            if not GATE.try_acquire():
+                return _reject(503, "Server busy, try again shortly", 1)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                GATE.release()
+        return wrapper
+    return decorator
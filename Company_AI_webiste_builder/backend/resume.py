@@ -0,0 +1,47 @@
+# resume.py
+# Regex resume parsing and job-match scoring.
+import re
+
+import metrics
+
+# Skill taxonomy + patterns, compiled once at import (and shared copy-on-write by pre-forked workers)
+SKILL_RE = re.compile(r"\b(Python|JavaScript|React|Django|Flask|SQL|Node|HTML|CSS|Java|C\+\+|AWS|Docker|TensorFlow)\b", re.I)
+YEARS_RE = re.compile(r"(\d+)\s+years?", re.I)
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+DIGIT_RE = re.compile(r"\d")
+
+
+@metrics.timed()
+def parse_resume_text_simple(text):
+    """Very simple regex-based resume parsing for demo. Returns name, email, skills, years."""
+    skills = SKILL_RE.findall(text)
+    years = YEARS_RE.search(text)
+    email = EMAIL_RE.search(text)
+    name = None
+    for line in text.splitlines():
+        s = line.strip()
+        if s and len(s.split()) <= 4 and "@" not in s and not DIGIT_RE.search(s):
+            name = s
+            break
+    return {
+        "name": name or "Unknown",
+        "email": email.group(0) if email else None,
+        "skills": list({s.lower() for s in skills}),
+        "experience_years": int(years.group(1)) if years else 0
+    }
+
+
+@metrics.timed()
+def score_resume(parsed, desired_skills=None):
+    if not desired_skills:
+        desired_skills = []
+    desired_lower = [d.strip().lower() for d in desired_skills if d.strip()]
+    matched = set(parsed.get("skills", [])) & set(desired_lower)
+    skill_score = (len(matched) / max(1, len(desired_lower))) if desired_lower else 0.0
+    return {"match_percent": combined_score(skill_score, parsed.get("experience_years", 0)), "matched_skills": list(matched)}
+
+
+def combined_score(skill_score, experience_years):
+    """Match percent: 70% share of the wanted skills, 30% experience (capped at 5 years)."""
+    exp_score = min((experience_years or 0) / 5.0, 1.0)
+    return round((skill_score * 0.7 + exp_score * 0.3) * 100, 1)
@@ -0,0 +1,215 @@
+# revisions.py
+# Page history stored as JSON patches against periodic full snapshots.
+#
+# DB["pages"][name] always holds the current content (reads stay one lookup);
+# DB["page_revisions"][name] is the history:
+#   {"rev": 1, "kind": "snapshot", "content": {...}, ...}
+#   {"rev": 2, "kind": "delta", "patch": [{"op": "replace", "path": "/services/3/price", "value": ...}], ...}
+# Revision n is rebuilt from the nearest snapshot at or before n plus the deltas
+# after it. A snapshot is written every SNAPSHOT_EVERY revisions, or whenever a
+# delta would not be smaller than the page itself, so replay stays short and an
+# edit to one service of the services page costs a few hundred bytes, not the page.
+#
+# DB["page_drafts"][name] holds at most one unpublished draft per page, as a patch
+# against the revision it was started from.
+import copy
+import datetime
+import os
+
+from json_provider import dumps_bytes
+from store import DB, persist
+
+SNAPSHOT_EVERY = int(os.getenv("PAGE_SNAPSHOT_EVERY", "20"))
+
+
+class PatchConflict(ValueError):
+    """A patch no longer applies to the document (e.g. a draft of an outdated revision)."""
+
+
+# ----------------------------
+# JSON patch (RFC 6902 subset: add / remove / replace)
+# ----------------------------
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old, new, path=""):
+    """Ops turning `old` into `new`. Dicts and equal-length lists are diffed recursively."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(diff(old[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        if len(old) == len(new):
+            ops = []
+            for i, (a, b) in enumerate(zip(old, new)):
+                ops.extend(diff(a, b, f"{path}/{i}"))
+            return ops
+        if len(new) > len(old) and new[:len(old)] == old:
+            return [{"op": "add", "path": f"{path}/-", "value": v} for v in new[len(old):]]
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc, ops):
+    """Return a patched deep copy of `doc`; raises PatchConflict if an op doesn't fit."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            if op["op"] == "remove":
+                raise PatchConflict("cannot remove the whole document")
+            doc = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = doc
+        try:
+            for token in parents:
+                target = target[int(token)] if isinstance(target, list) else target[token]
+            if isinstance(target, list):
+                if op["op"] == "add":
+                    target.insert(len(target) if last == "-" else int(last), copy.deepcopy(op["value"]))
+                elif op["op"] == "remove":
+                    del target[int(last)]
+                else:
+                    target[int(last)] = copy.deepcopy(op["value"])
+            else:
+                if op["op"] == "remove":
+                    del target[last]
+                elif op["op"] == "replace" and last not in target:
+                    raise KeyError(last)
+                else:
+                    target[last] = copy.deepcopy(op["value"])
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise PatchConflict(f"{op['op']} {op['path']}: {e}")
+    return doc
+
+
+# ----------------------------
+# History
+# ----------------------------
+def _now():
+    return datetime.datetime.utcnow().isoformat()
+
+
+def history(name):
+    return DB.get("page_revisions", {}).get(name, [])
+
+
+def current_rev(name):
+    revs = history(name)
+    return revs[-1]["rev"] if revs else 0
+
+
+def _append(name, rev):
+    DB.setdefault("page_revisions", {}).setdefault(name, []).append(rev)
+    persist("append", ["page_revisions", name], rev)
+
+
+def record(name, content, author=None, message=None):
+    """Publish `content` as the page's new current version and add it to the history."""
+    revs = history(name)
+    prev = DB.get("pages", {}).get(name)
+    if not revs and prev is not None and prev != content:
+        # page predates history (seed data, older journal): keep it as the baseline
+        _append(name, {"rev": 1, "kind": "snapshot", "content": prev, "author": "system",
+                       "message": "baseline", "created": _now()})
+        revs = history(name)
+    number = revs[-1]["rev"] + 1 if revs else 1
+    entry = {"rev": number, "author": author, "message": message, "created": _now()}
+    since_snapshot = next((number - r["rev"] for r in reversed(revs) if r["kind"] == "snapshot"), None)
+    patch = diff(prev, content) if prev is not None and since_snapshot is not None and since_snapshot < SNAPSHOT_EVERY else None
+    if patch is not None and len(dumps_bytes(patch)) < len(dumps_bytes(content)):
+        entry.update(kind="delta", patch=patch)
+    else:
+        entry.update(kind="snapshot", content=content)
+    DB.setdefault("pages", {})[name] = content
+    persist("set", ["pages", name], content)
+    _append(name, entry)
+    return entry
+
+
+def content_at(name, rev):
+    """Materialize revision `rev` of a page (None if it doesn't exist)."""
+    revs = history(name)
+    if not revs or rev < 1 or rev > revs[-1]["rev"]:
+        return None
+    # revision numbers are dense (1..n), so list index = rev - 1
+    upto = revs[:rev]
+    start = max(i for i, r in enumerate(upto) if r["kind"] == "snapshot")
+    doc = upto[start]["content"]
+    if start == rev - 1:
+        return copy.deepcopy(doc)   # never hand out the stored snapshot itself
+    for r in upto[start + 1:]:
+        doc = apply_patch(doc, r["patch"])   # patches work on a copy
+    return doc
+
+
+def summary(name):
+    """Revision metadata (no content) with stored sizes, newest first."""
+    out = []
+    for r in reversed(history(name)):
+        body = r.get("content") if r["kind"] == "snapshot" else r.get("patch")
+        out.append({"rev": r["rev"], "kind": r["kind"], "author": r.get("author"), "message": r.get("message"),
+                    "created": r["created"], "bytes": len(dumps_bytes(body))})
+    return out
+
+
+def rollback(name, rev, author=None):
+    content = content_at(name, rev)
+    if content is None:
+        return None
+    return record(name, content, author=author, message=f"rollback to {rev}")
+
+
+# ----------------------------
+# Drafts
+# ----------------------------
+def save_draft(name, content, author=None):
+    base = DB.get("pages", {}).get(name) or {}
+    draft = {"base_rev": current_rev(name), "patch": diff(base, content), "author": author, "updated": _now()}
+    DB.setdefault("page_drafts", {})[name] = draft
+    persist("set", ["page_drafts", name], draft)
+    return draft
+
+
+def get_draft(name):
+    return DB.get("page_drafts", {}).get(name)
+
+
+def preview_draft(name):
+    """(draft content, draft record) or (None, None). Raises PatchConflict if it no longer applies."""
+    draft = get_draft(name)
+    if draft is None:
+        return None, None
+    base = content_at(name, draft["base_rev"]) if draft["base_rev"] else DB.get("pages", {}).get(name)
+    return apply_patch(base or {}, draft["patch"]), draft
+
+
+def discard_draft(name):
+    if DB.get("page_drafts", {}).pop(name, None) is not None:
+        persist("delete", ["page_drafts", name])
+        return True
+    return False
+
+
+def publish_draft(name, author=None):
+    """Apply the draft's patch to the *current* page (so concurrent edits survive) and publish it."""
+    draft = get_draft(name)
+    if draft is None:
+        return None
+    content = apply_patch(DB.get("pages", {}).get(name) or {}, draft["patch"])
+    entry = record(name, content, author=author or draft.get("author"), message="publish draft")
+    discard_draft(name)
+    return entry
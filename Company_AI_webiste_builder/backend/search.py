@@ -0,0 +1,249 @@
+# search.py
+# Full-text search over blog posts, pages, services and jobs (GET /api/search).
+#
+# Each tenant has an in-process inverted index (term -> {doc: term frequency}) ranked
+# with BM25. It is built from DB on the first search and then kept current by
+# store.on_write: every persisted write to pages/jobs/blog re-indexes just the
+# documents it touched, so results are fresh without periodic rebuilds. The last
+# query term also matches as a prefix ("devel" -> developer, development), looked up
+# in a sorted vocabulary with bisect.
+import bisect
+import html
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+import store
+from store import DB
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 2        # title tokens count this many times
+PREFIX_WEIGHT = 0.7    # prefix expansions score lower than exact terms
+MAX_EXPANSIONS = 30
+INDEX_TENANTS = int(os.getenv("SEARCH_INDEX_TENANTS", "200"))
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*[+#]*")  # keeps node.js, c++, c#
+STOPWORDS = frozenset("a an and are as at be by for from has have in is it of on or our that the this to we with you your".split())
+SKIP_KEYS = frozenset(("id", "image", "images", "icon", "url", "link", "avatar"))
+
+# page name -> public site route (pages not listed are served at /<name>)
+PAGE_ROUTES = {"home": "/", "about": "/about", "services": "/services", "projects": "/projects",
+               "blog": "/blog", "contact": "/contact", "careers": "/careers"}
+TYPES = ("blog", "page", "service", "job")
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _strings(value, key=None):
+    """All human-readable strings in a JSON value (ids, image URLs etc. skipped)."""
+    if key in SKIP_KEYS:
+        return
+    if isinstance(value, str):
+        if not value.startswith(("http://", "https://", "#")):
+            yield value
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            yield from _strings(v, k)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _strings(v, key)
+
+
+class Index:
+    """One tenant's inverted index. Documents are keyed "<type>:<id>"."""
+
+    def __init__(self):
+        self.docs = {}        # key -> {"type", "id", "title", "url", "text", "tf", "len"}
+        self.postings = {}    # term -> {key: tf}
+        self.vocab = []       # sorted terms, for prefix matching
+        self.total_len = 0
+        self.lock = threading.RLock()
+
+    def upsert(self, doc_type, doc_id, title, text, url):
+        key = f"{doc_type}:{doc_id}"
+        tf = Counter(tokenize(text))
+        for _ in range(TITLE_BOOST):
+            tf.update(tokenize(title))
+        with self.lock:
+            self._remove(key)
+            length = sum(tf.values())
+            self.docs[key] = {"type": doc_type, "id": doc_id, "title": title, "url": url,
+                              "text": text, "tf": tf, "len": length}
+            self.total_len += length
+            for term, n in tf.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = {}
+                    bisect.insort(self.vocab, term)
+                posting[key] = n
+
+    def remove(self, doc_type, doc_id):
+        with self.lock:
+            self._remove(f"{doc_type}:{doc_id}")
+
+    def remove_type(self, doc_type, keep=()):
+        """Drop all documents of a type except the ids in `keep`."""
+        with self.lock:
+            for key in [k for k, d in self.docs.items() if d["type"] == doc_type and d["id"] not in keep]:
+                self._remove(key)
+
+    def _remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.total_len -= doc["len"]
+        for term in doc["tf"]:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+                del self.vocab[bisect.bisect_left(self.vocab, term)]
+
+    def _expand(self, prefix):
+        i = bisect.bisect_left(self.vocab, prefix)
+        out = []
+        while i < len(self.vocab) and self.vocab[i].startswith(prefix) and len(out) < MAX_EXPANSIONS:
+            out.append(self.vocab[i])
+            i += 1
+        return out
+
+    def search(self, query, types=None, prefix=True):
+        """Ranked [(score, doc, matched terms)] for all matching documents."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        weighted = {t: 1.0 for t in terms}
+        with self.lock:
+            if prefix and len(terms[-1]) >= 2:
+                for t in self._expand(terms[-1]):
+                    weighted.setdefault(t, PREFIX_WEIGHT)
+            n = len(self.docs)
+            avgdl = (self.total_len / n) if n else 1.0
+            scores = Counter()
+            matched = {}
+            for term, weight in weighted.items():
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for key, tf in posting.items():
+                    doc = self.docs[key]
+                    if types and doc["type"] not in types:
+                        continue
+                    norm = K1 * (1 - B + B * doc["len"] / avgdl)
+                    scores[key] += weight * idf * tf * (K1 + 1) / (tf + norm)
+                    matched.setdefault(key, set()).add(term)
+            return [(score, self.docs[key], matched[key]) for key, score in scores.most_common()]
+
+
+# ----------------------------
+# Documents from DB
+# ----------------------------
+def _index_page(index, name, page):
+    if not isinstance(page, dict):
+        index.remove("page", name)
+        if name == "services":
+            index.remove_type("service")
+        return
+    body = page
+    if name == "services" and isinstance(page.get("services"), list):
+        items = [s for s in page["services"] if isinstance(s, dict)]
+        ids = set()
+        for i, svc in enumerate(items):
+            sid = str(svc.get("id") or i)
+            ids.add(sid)
+            index.upsert("service", sid, str(svc.get("title") or ""), "\n".join(_strings(svc)), "/services")
+        index.remove_type("service", keep=ids)
+        body = {k: v for k, v in page.items() if k != "services"}
+    title = page.get("title") if isinstance(page.get("title"), str) else name.replace("_", " ").title()
+    index.upsert("page", name, title, "\n".join(_strings(body)), PAGE_ROUTES.get(name, f"/{name}"))
+
+
+def _index_job(index, job):
+    index.upsert("job", str(job.get("id")), str(job.get("title") or ""),
+                 "\n".join(_strings({k: v for k, v in job.items() if k != "title"})), "/careers")
+
+
+def _index_post(index, post):
+    index.upsert("blog", str(post.get("id")), str(post.get("title") or ""),
+                 "\n".join(_strings({k: v for k, v in post.items() if k != "title"})), f"/blog/{post.get('id')}")
+
+
+def _build():
+    index = Index()
+    for name, page in DB.get("pages", {}).items():
+        _index_page(index, name, page)
+    for job in DB.get("jobs", []):
+        _index_job(index, job)
+    for post in DB.get("blog", []):
+        _index_post(index, post)
+    return index
+
+
+_INDEXES = store.TenantCache(_build, INDEX_TENANTS)
+
+
+def get_index():
+    """The current tenant's index, built on first use."""
+    return _INDEXES.get()
+
+
+def reset():
+    """Forget the current tenant's index (after writes that bypass persist)."""
+    _INDEXES.reset()
+
+
+@store.on_write
+def _on_write(op, path, value):
+    if not path or path[0] not in ("pages", "jobs", "blog"):
+        return
+    index = _INDEXES.written()
+    if index is None:
+        return  # not built yet; the first search reads DB as it is then
+    if path[0] == "pages" and len(path) == 2:
+        _index_page(index, path[1], value if op == "set" else None)
+    elif op == "append" and len(path) == 1:
+        (_index_job if path[0] == "jobs" else _index_post)(index, value)
+    else:
+        reset()  # any other shape of write: rebuild lazily
+
+
+# ----------------------------
+# Highlighting
+# ----------------------------
+def highlight(text, terms, width=160):
+    """HTML-escaped snippet around the first match, with matched words in <mark>."""
+    text = " ".join(text.split())
+    words = list(TOKEN_RE.finditer(text.lower()))
+    hits = [m for m in words if m.group() in terms]
+    start = max(0, hits[0].start() - width // 3) if hits else 0
+    if start:
+        start = text.find(" ", start) + 1 or start
+    end = min(len(text), start + width)
+    if end < len(text):
+        end = text.rfind(" ", start, end) if text.rfind(" ", start, end) > start else end
+    out, pos = [], start
+    for m in hits:
+        if m.start() < start or m.end() > end:
+            continue
+        out.append(html.escape(text[pos:m.start()]))
+        out.append("<mark>" + html.escape(text[m.start():m.end()]) + "</mark>")
+        pos = m.end()
+    out.append(html.escape(text[pos:end]))
+    return ("..." if start else "") + "".join(out) + ("..." if end < len(text) else "")
+
+
+def search(query, types=None, page=1, per_page=10):
+    """One page of results for the current tenant."""
+    ranked = get_index().search(query, types=types)
+    results = []
+    for score, doc, terms in ranked[(page - 1) * per_page: page * per_page]:
+        results.append({"type": doc["type"], "id": doc["id"], "url": doc["url"], "score": round(score, 4),
+                        "title": highlight(doc["title"], terms, width=200),
+                        "snippet": highlight(doc["text"], terms)})
+    return {"query": query, "total": len(ranked), "page": page, "per_page": per_page, "results": results}
@@ -0,0 +1,484 @@
+# seed.py
+# Sample Mastersolis Infotech content. Imported on demand (admin ensure_seed,
+# serve.py preload), so normal startup never builds these literals.
+import datetime
+
+from store import DB, persist
+
+SEED_PAGES = ("home", "about", "services", "projects")
+SEED_COLLECTIONS = ("testimonials", "blog", "jobs", "applications", "faq", "themes", "portfolios")
+
+
+def ensure_seed_data():
+    """Create sample Mastersolis Infotech data if missing (idempotent). Every change is persisted."""
+    new_pages = [name for name in SEED_PAGES if not DB.get("pages", {}).get(name)]
+    new_collections = [key for key in SEED_COLLECTIONS if not DB.get(key)]
+    # Home / About
+    DB.setdefault("pages", {})
+    if not DB["pages"].get("home"):
+        DB["pages"]["home"] = {
+            "title": "Mastersolis Infotech",
+            "hero": "We build AI-driven digital solutions for businesses",
+            "tagline": "Automate. Analyze. Accelerate."
+        }
+    if not DB["pages"].get("about"):
+        DB["pages"]["about"] = {
+            "mission": "Empower organizations using intelligent automation and actionable insights.",
+            "vision": "To be the trusted AI partner for small and medium enterprises.",
+            "values": ["Innovation", "Integrity", "Customer-first"],
+            "team": [
+                {"name":"Asha Patel","role":"CEO","bio":"Product leader with 10+ years in AI"},
+                {"name":"Rajan Kumar","role":"CTO","bio":"ML engineer and cloud architect"},
+                {"name":"Nisha Rao","role":"Head of Design","bio":"Design thinker and UX lead"}
+            ],
+            "milestones": [
+                {"year":2022,"event":"Founded"},
+                {"year":2023,"event":"Launched first AI automation product"},
+                {"year":2024,"event":"Served 100+ SME customers"}
+            ]
+        }
+    # Services
+    if not DB["pages"].get("services"):
+        DB["pages"]["services"] = {
+            "services": [
+                {
+                    "id": "svc_ai_chat",
+                    "title": "AI Chatbots & Virtual Assistants",
+                    "desc": "Build intelligent conversational assistants for customer support and sales.",
+                    "features": [
+                        "24/7 Customer Support Automation",
+                        "Multi-language Support",
+                        "Natural Language Processing",
+                        "Integration with CRM Systems"
+                    ],
+                    "benefits": [
+                        "Reduce Response Time by 45%",
+                        "Handle Multiple Queries Simultaneously",
+                        "Improve Customer Satisfaction",
+                        "Lower Operational Costs"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?ai",
+                    "price": "Starting from $499/month",
+                    "category": "AI Solutions",
+                    "testimonial": {
+                        "text": "The chatbot reduced our support tickets by 60% in the first month!",
+                        "author": "Sarah Chen",
+                        "company": "TechStart Inc."
+                    }
+                },
+                {
+                    "id": "svc_auto_ops",
+                    "title": "Business Process Automation",
+                    "desc": "Transform your operations with intelligent automation and AI-driven workflows.",
+                    "features": [
+                        "Custom Workflow Automation",
+                        "Document Processing & OCR",
+                        "Email & Calendar Automation",
+                        "Integration with Enterprise Systems"
+                    ],
+                    "benefits": [
+                        "Save 20+ Hours Per Week",
+                        "Eliminate Manual Data Entry",
+                        "Reduce Error Rates by 99%",
+                        "Scale Operations Efficiently"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?automation",
+                    "price": "Starting from $999/month"
+                },
+                {
+                    "id": "svc_data_analytics",
+                    "title": "Business Intelligence & Analytics",
+                    "desc": "Transform raw data into actionable insights with our advanced analytics solutions.",
+                    "features": [
+                        "Real-time Data Dashboards",
+                        "Predictive Analytics",
+                        "Custom Report Generation",
+                        "Data Visualization"
+                    ],
+                    "benefits": [
+                        "Make Data-Driven Decisions",
+                        "Forecast Market Trends",
+                        "Optimize Business Processes",
+                        "Track KPIs in Real-time"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?data",
+                    "price": "Starting from $799/month"
+                },
+                {
+                    "id": "svc_ai_consulting",
+                    "title": "AI Strategy Consulting",
+                    "desc": "Expert guidance on implementing AI solutions in your business.",
+                    "features": [
+                        "AI Readiness Assessment",
+                        "Technology Stack Planning",
+                        "ROI Analysis",
+                        "Implementation Roadmap"
+                    ],
+                    "benefits": [
+                        "Clear AI Strategy",
+                        "Competitive Advantage",
+                        "Risk Mitigation",
+                        "Expert Guidance"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?consulting",
+                    "price": "Custom Quote",
+                    "category": "Consulting",
+                    "testimonial": {
+                        "text": "Their strategic guidance helped us implement AI across our entire organization.",
+                        "author": "Michael Rodriguez",
+                        "company": "Global Retail Solutions"
+                    }
+                },
+                {
+                    "id": "svc_ai_website",
+                    "title": "AI-Powered Website Builder",
+                    "desc": "Create and maintain dynamic websites with AI-driven content and personalization.",
+                    "features": [
+                        "AI Content Generation",
+                        "Dynamic Personalization",
+                        "SEO Optimization",
+                        "Analytics Dashboard",
+                        "Mobile-First Design"
+                    ],
+                    "benefits": [
+                        "Launch Website in Days",
+                        "Always Fresh Content",
+                        "Higher Conversion Rates",
+                        "SEO-Optimized Pages",
+                        "24/7 AI Updates"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?website",
+                    "price": "Starting from $299/month",
+                    "category": "Web Solutions",
+                    "testimonial": {
+                        "text": "Our website traffic increased by 200% after implementing their AI solutions!",
+                        "author": "Emily Watson",
+                        "company": "Digital First Media"
+                    }
+                },
+                {
+                    "id": "svc_ai_marketing",
+                    "title": "AI Marketing Automation",
+                    "desc": "Transform your marketing with AI-powered campaign optimization and personalization.",
+                    "features": [
+                        "Smart Campaign Management",
+                        "Customer Journey Optimization",
+                        "Predictive Analytics",
+                        "Multi-channel Automation",
+                        "A/B Testing with AI"
+                    ],
+                    "benefits": [
+                        "2x Marketing ROI",
+                        "Personalized Customer Experience",
+                        "Data-Driven Decisions",
+                        "Automated Campaign Optimization",
+                        "Real-time Performance Tracking"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?marketing",
+                    "price": "Starting from $899/month",
+                    "category": "Marketing",
+                    "testimonial": {
+                        "text": "We saw a 150% increase in conversion rates within 3 months!",
+                        "author": "Lisa Thompson",
+                        "company": "Growth Marketing Pro"
+                    }
+                },
+                {
+                    "id": "svc_ml_models",
+                    "title": "Custom ML Model Development",
+                    "desc": "Develop and deploy custom machine learning models for your specific needs.",
+                    "features": [
+                        "Custom Model Development",
+                        "Model Training & Optimization",
+                        "MLOps Setup",
+                        "Performance Monitoring"
+                    ],
+                    "benefits": [
+                        "Tailored AI Solutions",
+                        "High Accuracy Models",
+                        "Scalable Architecture",
+                        "Continuous Improvement"
+                    ],
+                    "image": "https://source.unsplash.com/random/800x600/?machine-learning",
+                    "price": "Starting from $2,499/month",
+                    "category": "AI Development",
+                    "testimonial": {
+                        "text": "Their custom ML models helped us achieve 99.9% accuracy in prediction!",
+                        "author": "David Park",
+                        "company": "FinTech Solutions"
+                    }
+                }
+            ],
+            "categories": [
+                "AI Solutions",
+                "Consulting",
+                "Web Solutions",
+                "Marketing",
+                "AI Development"
+            ],
+            "summary": {
+                "title": "Transform Your Business with AI",
+                "description": "We offer end-to-end AI solutions to help businesses innovate and grow. From chatbots to custom ML models, our services are designed to deliver measurable results.",
+                "stats": [
+                    {"label": "Clients Served", "value": "100+"},
+                    {"label": "Success Rate", "value": "95%"},
+                    {"label": "ROI Average", "value": "3x"}
+                ]
+            }
+        }
+    # Projects
+    if not DB["pages"].get("projects"):
+        DB["pages"]["projects"] = {
+            "projects": [
+                {"id":"prj_1","title":"SupportBot","tags":["chatbot","automation"],"summary":"Reduced support load by 45% for a retail client."},
+                {"id":"prj_2","title":"SalesInsights","tags":["analytics","dashboard"],"summary":"Actionable sales dashboards for 20 stores."},
+                {"id":"prj_3","title":"ResumeAI","tags":["hr","nlp"],"summary":"Automated resume scoring and ATS formatting service."}
+            ]
+        }
+    # Testimonials & case studies
+    DB.setdefault("testimonials", [])
+    if not DB["testimonials"]:
+        DB["testimonials"] = [
+            {"client":"GreenMart","quote":"Mastersolis built our chatbot - response rates improved dramatically.","author":"Priya S."},
+            {"client":"TravelCo","quote":"Their analytics platform helped us optimize promotions.","author":"Arjun V."}
+        ]
+    # Blog posts
+    DB.setdefault("blog", [])
+    if not DB["blog"]:
+        DB["blog"] = [
+            {
+                "id": "b1",
+                "title": "How AI Improves Customer Support",
+                "content": """
+                In today's digital age, AI-powered customer support is revolutionizing how businesses interact with their customers. Here are key benefits we've observed:
+
+                1. 24/7 Availability
+                - Instant responses at any time
+                - No wait times or queues
+                - Global customer coverage
+
+                2. Consistent Quality
+                - Standardized responses
+                - No human mood variations
+                - Multi-language support
+
+                3. Cost Efficiency
+                - Reduced support staff needs
+                - Handle multiple queries simultaneously
+                - Lower operational costs
+
+                4. Data-Driven Insights
+                - Track common issues
+                - Identify improvement areas
+                - Measure customer satisfaction
+
+                Our clients have seen:
+                - 45% reduction in response time
+                - 30% cost savings
+                - 25% increase in customer satisfaction
+
+                Ready to transform your customer support? Contact us to learn more.
+                """,
+                "summary": "AI reduces response time and improves CSAT scores dramatically through 24/7 availability and consistent service quality.",
+                "date": "2024-11-01"
+            },
+            {
+                "id": "b2",
+                "title": "Top 5 Automation Ideas for SMEs",
+                "content": """
+                Small and Medium Enterprises can benefit greatly from automation. Here are our top 5 recommendations:
+
+                1. Customer Service Automation
+                - AI chatbots for common queries
+                - Automated email responses
+                - Appointment scheduling bots
+
+                2. Invoice Processing
+                - Automated data extraction
+                - Digital approval workflows
+                - Payment reconciliation
+
+                3. Social Media Management
+                - Scheduled posts
+                - Automated engagement
+                - Analytics reporting
+
+                4. Inventory Management
+                - Automated stock alerts
+                - Purchase order generation
+                - Supplier communication
+
+                5. HR Process Automation
+                - Resume screening
+                - Interview scheduling
+                - Onboarding workflows
+
+                Each of these can save 5-10 hours per week for your team. Start small, measure results, and scale what works.
+                """,
+                "summary": "Practical automation ideas to save time and cost for small and medium businesses.",
+                "date": "2024-11-05"
+            },
+            {
+                "id": "b3",
+                "title": "The Future of AI in Business",
+                "content": """
+                As we look towards 2025 and beyond, AI is set to transform business operations in unprecedented ways:
+
+                Key Trends:
+                1. Generative AI
+                - Content creation
+                - Code generation
+                - Design automation
+
+                2. Predictive Analytics
+                - Sales forecasting
+                - Inventory optimization
+                - Risk assessment
+
+                3. Process Automation
+                - Workflow optimization
+                - Document processing
+                - Quality control
+
+                4. Intelligent Decision Support
+                - Data-driven insights
+                - Scenario analysis
+                - Real-time recommendations
+
+                The businesses that adapt early will gain significant competitive advantages. Let us help you stay ahead.
+                """,
+                "summary": "Explore upcoming AI trends and their impact on business operations.",
+                "date": "2024-11-08"
+            }
+        ]
+    # Jobs & applications
+    DB.setdefault("jobs", [])
+    if not DB["jobs"]:
+        DB["jobs"] = [
+            {
+                "id": "job-frontend",
+                "title": "Senior Frontend Developer",
+                "skills": "React, TypeScript, Tailwind CSS, Next.js",
+                "description": """
+                We're looking for a Senior Frontend Developer to join our growing team.
+
+                Key Responsibilities:
+                - Build responsive, performant user interfaces for our AI-powered applications
+                - Collaborate with UX designers and backend engineers
+                - Mentor junior developers and contribute to architecture decisions
+                
+                Requirements:
+                - 3+ years of React experience
+                - Strong TypeScript skills
+                - Experience with modern CSS frameworks (Tailwind preferred)
+                - Understanding of web performance optimization
+                
+                Benefits:
+                - Competitive salary
+                - Remote work options
+                - Learning and development budget
+                - Health insurance
+                """,
+                "location": "Remote / Hybrid",
+                "type": "Full-time",
+                "salary_range": "$90,000 - $130,000"
+            },
+            {
+                "id": "job-ml",
+                "title": "Machine Learning Engineer",
+                "skills": "Python, TensorFlow, PyTorch, MLOps, AWS/Azure",
+                "description": """
+                Join our AI team to build and deploy cutting-edge ML models.
+
+                Key Responsibilities:
+                - Design and implement ML models for various use cases
+                - Build and maintain ML pipelines
+                - Optimize model performance and deployment
+                - Collaborate with data scientists and engineers
+
+                Requirements:
+                - Masters/PhD in CS, ML, or related field
+                - 2+ years ML engineering experience
+                - Strong Python and deep learning framework expertise
+                - Experience with MLOps and cloud platforms
+
+                Benefits:
+                - Competitive compensation
+                - Remote work flexibility
+                - Conference attendance budget
+                - Premium healthcare
+                """,
+                "location": "Remote / Hybrid",
+                "type": "Full-time",
+                "salary_range": "$100,000 - $160,000"
+            },
+            {
+                "id": "job-data",
+                "title": "Data Engineer",
+                "skills": "Python, SQL, Spark, Airflow, AWS",
+                "description": """
+                We're seeking a Data Engineer to build robust data pipelines.
+
+                Key Responsibilities:
+                - Design and implement data pipelines
+                - Optimize data warehouse performance
+                - Ensure data quality and reliability
+                - Support ML team with data needs
+
+                Requirements:
+                - 3+ years data engineering experience
+                - Expert in SQL and Python
+                - Experience with big data tools
+                - Strong problem-solving skills
+
+                Benefits:
+                - Competitive package
+                - Flexible work hours
+                - Learning allowance
+                - Health benefits
+                """,
+                "location": "Remote",
+                "type": "Full-time",
+                "salary_range": "$85,000 - $140,000"
+            }
+        ]
+        for job in DB["jobs"]:
+            job["date_posted"] = datetime.date.today().isoformat()
+    DB.setdefault("applications", [])
+    if not DB["applications"]:
+        DB["applications"] = [
+            {"id":"app1","name":"Riya Sharma","email":"riya@example.com","job_title":"Frontend Developer","resume_path":None,"parsed":{"name":"Riya Sharma","skills":["react","flask","python"],"experience_years":3},"score":{"match_percent":82.0}},
+            {"id":"app2","name":"Siddharth Rao","email":"sid@example.com","job_title":"Machine Learning Engineer","resume_path":None,"parsed":{"name":"Siddharth Rao","skills":["python","tensorflow","aws"],"experience_years":4},"score":{"match_percent":88.0}}
+        ]
+    # FAQ
+    DB.setdefault("faq", [])
+    if not DB["faq"]:
+        DB["faq"] = [
+            {"q":"What services do you offer?","a":"We offer AI chatbots, automation ops, and data analytics."},
+            {"q":"How to contact?","a":"Use the Contact page or email contact@mastersolis.com"}
+        ]
+    # Analytics
+    DB.setdefault("analytics", {})
+    DB["analytics"] = {"visitors": 1240, "applications": len(DB.get("applications",[])), "popular_pages":["careers","home","projects"]}
+    # Themes
+    DB.setdefault("themes", {})
+    if not DB["themes"]:
+        DB["themes"] = {"default":{"primary":"#0b72ff","accent":"#ffb400","bg":"#ffffff","text":"#0f172a"}}
+    # Sample portfolio
+    DB.setdefault("portfolios", {})
+    if not DB["portfolios"]:
+        DB["portfolios"]["sample-portfolio-1"] = {
+            "html":"<html><body><h1>Riya Sharma</h1><p>Frontend developer (React, Tailwind)</p></body></html>",
+            "meta":{"name":"Riya Sharma","skills":["react","tailwind"],"experience_years":3},
+            "theme": "classic",
+            "version": 1
+        }
+    # Mark seed time
+    DB.setdefault("_meta", {})["seeded_at"] = datetime.datetime.utcnow().isoformat()
+
+    for name in new_pages:
+        persist("set", ["pages", name], DB["pages"][name])
+    for key in new_collections:
+        persist("set", [key], DB[key])
+    persist("set", ["analytics"], DB["analytics"])
+    persist("set", ["_meta", "seeded_at"], DB["_meta"]["seeded_at"])
@@ -0,0 +1,313 @@
+# seo.py
+# Sitemap, meta descriptions and JSON-LD for the public site, kept precomputed.
+#
+# Every public URL (pages, blog posts, job listings) has an entry holding its
+# <url> sitemap fragment and its encoded /api/seo/meta response: title, meta
+# description, canonical URL and JSON-LD (Organization for the home page,
+# BlogPosting, JobPosting, WebPage). /sitemap.xml and /api/seo/meta only return
+# stored bytes.
+#
+# A site's entries are built on the first request and then maintained incrementally.
+# store.on_write only marks the touched page/post/job as dirty. A background thread
+# (one per process) regenerates just those entries after SEO_LINGER seconds, so a
+# burst of edits is handled in one pass, then re-joins the sitemap from the stored
+# fragments. Until that pass runs, the previous version is served.
+import datetime
+import hashlib
+import html
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import store
+import tenants
+from json_provider import dumps_bytes
+from revisions import history
+from search import PAGE_ROUTES, _strings
+from store import DB
+
+log = logging.getLogger(__name__)
+
+SITE_URL = os.getenv("SITE_URL", "").rstrip("/")   # default site's public URL; else the request host
+LINGER = float(os.getenv("SEO_LINGER", "1"))
+SITE_TENANTS = int(os.getenv("SEO_SITE_TENANTS", "200"))
+DESCRIPTION_CHARS = 155
+PRIVATE_PAGES = frozenset(("admin", "dashboard", "login"))
+
+EMPLOYMENT_TYPES = {"full-time": "FULL_TIME", "part-time": "PART_TIME", "contract": "CONTRACTOR",
+                    "contractor": "CONTRACTOR", "temporary": "TEMPORARY", "internship": "INTERN", "intern": "INTERN"}
+MONEY_RE = re.compile(r"\d[\d,]*(?:\.\d+)?\s*[kK]?")
+
+
+def _today():
+    return datetime.date.today().isoformat()
+
+
+def describe(*texts):
+    """First DESCRIPTION_CHARS characters of the first non-empty text, cut at a word boundary."""
+    for text in texts:
+        text = " ".join(str(text or "").split())
+        if not text:
+            continue
+        if len(text) <= DESCRIPTION_CHARS:
+            return text
+        cut = text.rfind(" ", 0, DESCRIPTION_CHARS - 3)
+        return text[:cut if cut > 0 else DESCRIPTION_CHARS - 3].rstrip(",;:.-") + "..."
+    return ""
+
+
+def _base_url(request_root=None):
+    domains = tenants.site().get("domains") or []
+    if domains:
+        return f"https://{domains[0]}"
+    if tenants.BASE_DOMAIN and store.current_tenant() != store.DEFAULT_TENANT:
+        return f"https://{store.current_tenant()}.{tenants.BASE_DOMAIN}"
+    return SITE_URL or (request_root or "http://localhost").rstrip("/")
+
+
+# ----------------------------
+# Entries
+# ----------------------------
+def _salary(text):
+    amounts = [float(m.replace(",", "").rstrip("kK").strip()) * (1000 if m.strip()[-1] in "kK" else 1)
+               for m in MONEY_RE.findall(text or "")]
+    if not amounts:
+        return None
+    salary = {"@type": "MonetaryAmount", "value": {"@type": "QuantitativeValue", "minValue": min(amounts),
+                                                   "maxValue": max(amounts), "unitText": "YEAR"}}
+    if "$" in text or "USD" in text:
+        salary["currency"] = "USD"
+    return salary
+
+
+def _page_entry(site, name, page):
+    path = PAGE_ROUTES.get(name, f"/{name}")
+    revs = history(name)
+    title = page.get("title") if isinstance(page.get("title"), str) else name.replace("_", " ").title()
+    description = describe(page.get("meta_description"), page.get("description"), page.get("subtitle"),
+                           " ".join(s for s in _strings(page) if s != title))
+    if name == "home":
+        ld = {"@context": "https://schema.org", "@type": "Organization", "name": site.company,
+              "url": site.base_url + "/", "description": description}
+    else:
+        ld = {"@context": "https://schema.org", "@type": "WebPage", "name": title,
+              "url": site.base_url + path, "description": description}
+    lastmod = revs[-1]["created"][:10] if revs else None
+    return path, title if name == "home" else f"{title} | {site.company}", description, ld, lastmod, "weekly"
+
+
+def _post_entry(site, post):
+    path = f"/blog/{post.get('id')}"
+    description = describe(post.get("summary"), post.get("content"))
+    ld = {"@context": "https://schema.org", "@type": "BlogPosting", "headline": post.get("title"),
+          "description": description, "datePublished": post.get("date"), "url": site.base_url + path,
+          "mainEntityOfPage": site.base_url + path,
+          "author": {"@type": "Organization", "name": post.get("author") or site.company},
+          "publisher": {"@type": "Organization", "name": site.company}}
+    if post.get("image"):
+        ld["image"] = post["image"]
+    return path, f"{post.get('title')} | {site.company}", description, ld, post.get("date"), "monthly"
+
+
+def _job_entry(site, job):
+    path = f"/careers/{job.get('id')}"
+    location = job.get("location") or ""
+    ld = {"@context": "https://schema.org", "@type": "JobPosting", "title": job.get("title"),
+          "description": html.escape(" ".join(str(job.get("description") or job.get("title") or "").split()), quote=False),
+          "datePosted": job.get("date_posted") or site.first_seen.setdefault(str(job.get("id")), _today()),
+          "hiringOrganization": {"@type": "Organization", "name": site.company, "sameAs": site.base_url + "/"},
+          "url": site.base_url + path}
+    kind = EMPLOYMENT_TYPES.get((job.get("type") or "").strip().lower())
+    if kind:
+        ld["employmentType"] = kind
+    if "remote" in location.lower():
+        ld["jobLocationType"] = "TELECOMMUTE"
+        ld["applicantLocationRequirements"] = {"@type": "Country", "name": job.get("country") or "Worldwide"}
+    if location and location.lower() != "remote":
+        ld["jobLocation"] = {"@type": "Place", "address": {"@type": "PostalAddress", "addressLocality": location}}
+    salary = _salary(job.get("salary_range"))
+    if salary:
+        ld["baseSalary"] = salary
+    description = describe(job.get("summary"), job.get("description"))
+    return path, f"{job.get('title')} | Careers at {site.company}", description, ld, ld["datePosted"], "daily"
+
+
+class Site:
+    """One tenant's precomputed SEO output."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.company = "Our company"
+        self.entries = {}       # (kind, key) -> (path, sitemap fragment, meta response bytes)
+        self.by_path = {}       # path -> meta response bytes
+        self.first_seen = {}    # job id -> date first seen, for jobs stored without a date_posted
+        self.sitemap = b""
+        self.etag = ""
+        self.lock = threading.Lock()
+
+    def _store(self, key, built):
+        path, title, description, ld, lastmod, changefreq = built
+        loc = html.escape(self.base_url + path)
+        fragment = f"<url><loc>{loc}</loc>" + (f"<lastmod>{html.escape(str(lastmod)[:10])}</lastmod>" if lastmod else "") \
+            + f"<changefreq>{changefreq}</changefreq></url>"
+        meta = dumps_bytes({"path": path, "title": title, "description": description,
+                            "canonical": self.base_url + path, "json_ld": ld})
+        self.entries[key] = (path, fragment, meta)
+
+    def update(self, kind, key):
+        """Rebuild one entry from DB (or drop it if the row is gone)."""
+        self.entries.pop((kind, key), None)
+        if kind == "page":
+            page = DB.get("pages", {}).get(key)
+            if isinstance(page, dict) and key not in PRIVATE_PAGES:
+                self._store((kind, key), _page_entry(self, key, page))
+        elif kind == "post":
+            post = next((p for p in DB.get("blog", []) if isinstance(p, dict) and str(p.get("id")) == key), None)
+            if post is not None:
+                self._store((kind, key), _post_entry(self, post))
+        elif kind == "job":
+            job = next((j for j in DB.get("jobs", []) if isinstance(j, dict) and str(j.get("id")) == key), None)
+            if job is not None:
+                self._store((kind, key), _job_entry(self, job))
+
+    def rebuild(self, kinds=("page", "post", "job")):
+        home = DB.get("pages", {}).get("home") or {}
+        self.company = home.get("title") if isinstance(home.get("title"), str) else self.company
+        if "page" in kinds:
+            for key in [k for k in self.entries if k[0] == "page"]:
+                del self.entries[key]
+            for name in DB.get("pages", {}):
+                self.update("page", name)
+        if "post" in kinds:
+            for key in [k for k in self.entries if k[0] == "post"]:
+                del self.entries[key]
+            for post in DB.get("blog", []):
+                if isinstance(post, dict):
+                    self.update("post", str(post.get("id")))
+        if "job" in kinds:
+            for key in [k for k in self.entries if k[0] == "job"]:
+                del self.entries[key]
+            for job in DB.get("jobs", []):
+                if isinstance(job, dict):
+                    self.update("job", str(job.get("id")))
+
+    def publish(self):
+        """Re-join the sitemap and the path lookup from the stored entries."""
+        entries = sorted(self.entries.values())
+        sitemap = ('<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                   + "\n".join(fragment for _, fragment, _ in entries) + "\n</urlset>\n").encode("utf-8")
+        by_path = {path: meta for path, _, meta in entries}
+        self.sitemap, self.by_path = sitemap, by_path
+        self.etag = hashlib.sha1(sitemap).hexdigest()[:20]
+
+
+# ----------------------------
+# Per-tenant sites + background refresh
+# ----------------------------
+_SITES = OrderedDict()      # tenant -> Site, LRU-evicted
+_dirty = {}                 # tenant -> set of (kind, key); key None = every row of that kind
+_lock = threading.Lock()
+_wake = threading.Event()
+_pid = None
+
+
+def get_site(request_root=None):
+    """The current tenant's Site, built (synchronously) on first use."""
+    tenant_id = store.current_tenant()
+    with _lock:
+        site = _SITES.get(tenant_id)
+        if site is not None:
+            _SITES.move_to_end(tenant_id)
+            return site
+    site = Site(_base_url(request_root))
+    with site.lock:
+        site.rebuild()
+        site.publish()
+    with _lock:
+        site = _SITES.setdefault(tenant_id, site)
+        while len(_SITES) > SITE_TENANTS:
+            _SITES.popitem(last=False)
+    return site
+
+
+def reset():
+    """Forget the current tenant's output (after writes that bypass persist, or new site settings)."""
+    with _lock:
+        _SITES.pop(store.current_tenant(), None)
+
+
+def _mark(kind, key):
+    tenant_id = store.current_tenant()
+    with _lock:
+        if tenant_id not in _SITES:
+            return  # not built yet; the first request reads DB as it is then
+        _dirty.setdefault(tenant_id, set()).add((kind, key))
+    _start()
+    _wake.set()
+
+
+@store.on_write
+def _on_write(op, path, value):
+    if path and path[0] == "_site":
+        reset()  # domains changed: every URL is built from the base URL
+        return
+    if not path or path[0] not in ("pages", "page_revisions", "blog", "jobs"):
+        return
+    if path[0] in ("pages", "page_revisions") and len(path) == 2:
+        if path[1] == "home":  # its title is the company name used in every other entry
+            for kind in ("page", "post", "job"):
+                _mark(kind, None)
+        else:
+            _mark("page", path[1])
+    elif path[0] in ("blog", "jobs") and op == "append" and len(path) == 1 and isinstance(value, dict):
+        _mark("post" if path[0] == "blog" else "job", str(value.get("id")))
+    elif path[0] in ("blog", "jobs"):
+        _mark("post" if path[0] == "blog" else "job", None)
+    else:
+        _mark("page", None)
+
+
+def refresh():
+    """Apply pending changes for every tenant; returns the number of tenants republished."""
+    with _lock:
+        pending = list(_dirty.items())
+        _dirty.clear()
+    for tenant_id, keys in pending:
+        with _lock:
+            site = _SITES.get(tenant_id)
+        if site is None:
+            continue
+        with store.using_tenant(tenant_id), site.lock:
+            whole = {kind for kind, key in keys if key is None}
+            if whole:
+                site.rebuild(whole)
+            for kind, key in keys:
+                if key is not None and kind not in whole:
+                    site.update(kind, key)
+            site.publish()
+    return len(pending)
+
+
+def _run():
+    while True:
+        _wake.wait()
+        time.sleep(LINGER)
+        _wake.clear()
+        try:
+            refresh()
+        except Exception:
+            log.exception("seo: refresh failed")
+
+
+def _start():
+    global _pid
+    if _pid == os.getpid():
+        return
+    with _lock:
+        if _pid == os.getpid():
+            return
+        _pid = os.getpid()
+    threading.Thread(target=_run, name="seo", daemon=True).start()
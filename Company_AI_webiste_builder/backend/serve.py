@@ -0,0 +1,145 @@
+# serve.py
+# Production entry point: pre-fork gunicorn workers instead of app.run(debug=True).
+#
+#   python serve.py                          # app:app on 0.0.0.0:5001, 1 worker x 4 threads
+#   python serve.py --app mymodule:app --bind 0.0.0.0:5000
+#
+# The app is imported and warmed in the master before forking (seed content,
+# encoded pages of every tenant, compiled portfolio templates), then gc.freeze() moves that heap out of the
+# collector's reach so workers keep sharing it copy-on-write.
+#
+# A replacement worker is forked from the master's preload-time memory, not from the
+# worker it replaces. With DB_JOURNAL_DIR set, each worker therefore reloads the
+# snapshot + journal after fork when an earlier worker has written to them (so no
+# write is lost and journal seqs keep increasing). Without a journal the writes
+# only live in the worker, so --max-requests recycling is turned off, and several
+# workers would each serve their own copy of the DB: one worker is the default and
+# splitting takes an explicit --workers (or WEB_CONCURRENCY).
+#
+# Operations:
+#   kill -HUP  <master>   graceful worker restart (re-reads config; preloaded code is kept)
+#   kill -USR2 <master>   start a new master with new code, then -WINCH / -TERM the old one
+# Workers are recycled after --max-requests (+ jitter) to cap memory growth (journal mode only).
+import argparse
+import gc
+import importlib
+import logging
+import os
+import sys
+
+log = logging.getLogger("serve")
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+
+def default_workers():
+    """One: the in-memory DB has a single owner, so scale with --threads."""
+    return 1
+
+
+def preload(target):
+    """Import `module:attr` and warm shared read-only state before forking.
+
+    Startup is lazy by default (see app.py); here we load everything up front
+    instead, so it is paid once in the master and shared by every worker.
+    """
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    wsgi_app = getattr(module, attr or "app")
+    store = sys.modules.get("store")
+    if store is not None:
+        import portfolio_render
+        from seed import ensure_seed_data
+
+        ensure_seed_data()  # journaled, so workers that reload the journal keep it
+        for tenant_id in store.tenant_ids():
+            with store.using_tenant(tenant_id):
+                store.invalidate_page_json()
+                for name in list(store.DB.get("pages", {})):
+                    store.page_json(name)
+        portfolio_render.load_templates()
+    # everything allocated so far is long-lived; keep the GC from touching (and un-sharing) it
+    gc.collect()
+    gc.freeze()
+    return store, wsgi_app
+
+
+if BaseApplication is not None:
+    class Server(BaseApplication):
+        """Embedded gunicorn application serving a preloaded WSGI app."""
+
+        def __init__(self, store, wsgi_app, options):
+            self.store = store
+            self.wsgi_app = wsgi_app
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+            self.cfg.set("post_fork", self._post_fork)
+
+        def _post_fork(self, server, worker):
+            if self.store is not None and self.store.reopen_journal():
+                log.info("worker %s: reloaded the DB from the journal (seq %d)", worker.pid, self.store.JOURNAL.seq)
+
+        def load(self):
+            return self.wsgi_app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the backend under gunicorn")
+    ap.add_argument("--app", default="app:app", help="WSGI target as module:attribute")
+    ap.add_argument("--bind", default=os.getenv("BIND", "0.0.0.0:5001"))
+    ap.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or default_workers())
+    ap.add_argument("--threads", type=int, default=int(os.getenv("WEB_THREADS", "4")),
+                    help="threads per worker (LLM calls are I/O bound)")
+    ap.add_argument("--max-requests", type=int, default=int(os.getenv("MAX_REQUESTS", "2000")))
+    ap.add_argument("--max-requests-jitter", type=int, default=int(os.getenv("MAX_REQUESTS_JITTER", "200")))
+    ap.add_argument("--timeout", type=int, default=int(os.getenv("WORKER_TIMEOUT", "60")))
+    ap.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")))
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    if BaseApplication is None:
+        sys.exit("gunicorn is not installed (pip install gunicorn); it is not available on Windows.")
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # an admin event stream holds a thread while open; leave most threads for requests
+    os.environ.setdefault("CHANGEFEED_SYNC_STREAMS", str(max(1, args.threads // 4)))
+    store, wsgi_app = preload(args.app)
+
+    workers = args.workers
+    max_requests, jitter = args.max_requests, args.max_requests_jitter
+    if store is not None:
+        if store.JOURNAL is not None and workers > 1:
+            # one journal file can only have one writer; scale with threads instead
+            log.warning("DB_JOURNAL_DIR is set: forcing 1 worker (%d threads)", args.threads)
+            workers = 1
+        elif workers > 1:
+            log.warning("--workers %d: the in-memory DB is per worker, writes in one worker are "
+                        "not visible to the others", workers)
+        if store.JOURNAL is None and max_requests:
+            # a recycled worker would restart from the master's copy of the DB, dropping every write
+            log.warning("in-memory DB without DB_JOURNAL_DIR: worker recycling (--max-requests) disabled")
+            max_requests, jitter = 0, 0
+
+    Server(store, wsgi_app, {
+        "bind": args.bind,
+        "workers": workers,
+        "worker_class": "gthread",
+        "threads": args.threads,
+        "preload_app": True,
+        "max_requests": max_requests,
+        "max_requests_jitter": jitter,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "accesslog": "-",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# site_builder.py
+# Section-level site generation for /api/ai/auto_build.
+#
+# The generated site is split into sections, each written by its own small prompt
+# and merged into one field of one page (other fields are left alone). A section
+# remembers a fingerprint of the inputs it was generated from, so a new build only
+# regenerates sections whose inputs changed — e.g. sending just {"services": "..."}
+# rewrites the services list and nothing else. The prompts of one build run in
+# parallel (see llm.run_llm_plan), except that a generated company name comes first
+# so the tagline and about text can use it. The response says which pages, API paths
+# and site routes changed so caches / static exports can be refreshed selectively.
+import datetime
+import hashlib
+import json
+import threading
+
+import llm
+import revisions
+import tokens
+from store import DB, persist
+
+# Build inputs; any input left out of a request keeps its previous value.
+INPUT_KEYS = ("brief", "name", "tone", "services", "projects")
+
+# section -> inputs it depends on, target page/field, output kind, prompt
+SECTIONS = {
+    "name": {
+        "inputs": ("brief", "name"), "page": "home", "field": "title", "kind": "text", "max_tokens": 20,
+        "prompt": "Suggest a short company name (2-4 words, plain text only) for this company: {brief}",
+    },
+    "tagline": {
+        "inputs": ("brief", "name", "tone"), "page": "home", "field": "hero", "kind": "text", "max_tokens": 40,
+        "prompt": "Write a one-line website tagline (max 12 words, plain text) for {name}. Tone: {tone}. Company: {brief}",
+    },
+    "about": {
+        "inputs": ("brief", "name", "tone"), "page": "about", "field": "about", "kind": "text", "max_tokens": 160,
+        "prompt": "Write a 2-3 sentence 'About us' paragraph (plain text) for {name}. Tone: {tone}. Company: {brief}",
+    },
+    "services": {
+        "inputs": ("brief", "services"), "page": "about", "field": "services", "kind": "list", "max_tokens": 120,
+        "prompt": "List exactly 3 services this company offers as a JSON array of short strings. Focus: {services}. Company: {brief}",
+    },
+    "projects": {
+        "inputs": ("brief", "projects"), "page": "projects", "field": "projects", "kind": "objects", "max_tokens": 200,
+        "prompt": "Describe 2 sample client projects as a JSON array of objects with keys title and desc. Focus: {projects}. Company: {brief}",
+    },
+}
+
+FALLBACKS = {
+    "name": "Mastersolis Infotech",
+    "tagline": "AI-driven digital presence",
+    "services": ["Custom AI Solutions", "Web Development", "Data Analytics"],
+    "projects": [
+        {"title": "Project A", "desc": "AI automation for retail"},
+        {"title": "Project B", "desc": "Analytics dashboard deployment"},
+    ],
+}
+
+# page -> public site route (frontend) that renders it
+PAGE_ROUTES = {"home": "/", "about": "/about", "projects": "/projects", "services": "/services"}
+
+_lock = threading.Lock()    # one build at a time merges into DB["site_build"] and the pages
+
+
+def _norm(value):
+    return " ".join(str(value or "").split())
+
+
+def _fingerprint(spec, inputs):
+    raw = json.dumps([inputs[k] for k in spec["inputs"]], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse(section, out, inputs):
+    """Turn a completion into the section's value, falling back to a safe default."""
+    kind = SECTIONS[section]["kind"]
+    try:
+        if kind == "text":
+            text = (out or "").strip().splitlines()[0].strip().strip('"')
+            if text:
+                return text
+        else:
+            start = out.find("[")
+            value = json.loads(out[start:out.rfind("]") + 1]) if start != -1 else None
+            if kind == "list" and isinstance(value, list) and value and all(isinstance(v, str) for v in value):
+                return value
+            if kind == "objects" and isinstance(value, list) and value and all(isinstance(v, dict) and v.get("title") for v in value):
+                return [{"title": v["title"], "desc": v.get("desc", "")} for v in value]
+    except (AttributeError, IndexError, ValueError):
+        pass
+    return inputs["brief"] if section == "about" else FALLBACKS[section]
+
+
+def _stale_sections(inputs, state, requested):
+    if requested:
+        return list(requested)
+    pages = DB.get("pages", {})
+    stale = []
+    for section, spec in SECTIONS.items():
+        prev = state.get("sections", {}).get(section)
+        if (prev is None or prev["fingerprint"] != _fingerprint(spec, inputs)
+                or spec["field"] not in pages.get(spec["page"], {})):
+            stale.append(section)
+    return stale
+
+
+def plan(payload):
+    """Plan an incremental build (see llm.run_llm_plan for the plan format)."""
+    state = DB.get("site_build") or {}
+    prev_inputs = state.get("inputs", {})
+    inputs = {k: _norm(payload[k]) if k in payload else prev_inputs.get(k, "") for k in INPUT_KEYS}
+    if not inputs["brief"]:
+        return {"result": {"error":"Provide 'brief' in JSON body"}, "status": 400}
+    requested = payload.get("sections")
+    if requested is not None:
+        unknown = [s for s in requested if s not in SECTIONS] if isinstance(requested, list) else [requested]
+        if unknown:
+            return {"result": {"error": f"Unknown section(s): {unknown}", "sections": list(SECTIONS)}, "status": 400}
+    stale = _stale_sections(inputs, state, requested)
+
+    fmt = {k: inputs[k] or default for k, default in
+           (("brief", ""), ("name", "the company"), ("tone", "professional"), ("services", "core offering"), ("projects", "typical clients"))}
+    # keep every section prompt within the auto_build budget (the brief gets most of it)
+    for k in fmt:
+        fmt[k] = tokens.truncate(fmt[k], tokens.budget("auto_build") - 100 if k == "brief" else 60, "auto_build")
+    naming = "name" in stale and not inputs["name"]
+    first, after_name = [], []
+    for section in stale:
+        if section == "name" and inputs["name"]:
+            continue  # given explicitly, nothing to generate
+        # a generated name is written first, so the tagline and about text can use it
+        named = naming and section != "name" and "name" in SECTIONS[section]["inputs"]
+        (after_name if named else first).append(section)
+
+    def prompts(sections, values):
+        return {s: (SECTIONS[s]["prompt"].format(**values), SECTIONS[s]["max_tokens"]) for s in sections}
+
+    def finish(completions):
+        values = {}
+        for section in stale:
+            if section == "name" and inputs["name"]:
+                values[section] = inputs["name"]
+            else:
+                values[section] = _parse(section, completions.get(section), inputs)
+        return _merge(inputs, [k for k in INPUT_KEYS if k in payload], stale, values)
+
+    def finish_first(completions):
+        if not after_name:
+            return finish(completions)
+        name = tokens.truncate(_parse("name", completions.get("name"), inputs), 60, "auto_build")
+        return llm.Chain({"endpoint": "auto_build", "prompts": prompts(after_name, dict(fmt, name=name)),
+                          "finish": lambda more: finish({**completions, **more})})
+
+    if not first or not llm.USE_OPENAI:
+        return {"result": finish({})}
+    return {"endpoint": "auto_build", "prompts": prompts(first, fmt), "finish": finish_first}
+
+
+def _merge(inputs, given, stale, values):
+    """Write regenerated sections into their pages (copy-on-write) and bump versions.
+
+    State and pages are re-read under the lock: another build may have finished while
+    this one waited on the LLM, and its sections and inputs are kept.
+    """
+    with _lock:
+        state = DB.get("site_build") or {}
+        version = state.get("version", 0) + (1 if stale else 0)
+        now = datetime.datetime.utcnow().isoformat()
+        pages = DB.get("pages", {})
+        changed = {}
+        for section in stale:
+            spec = SECTIONS[section]
+            changed.setdefault(spec["page"], []).append(spec["field"])
+        for name, fields in changed.items():
+            page = dict(pages.get(name) or {})  # a new object, so the encoded-page cache misses
+            for section in stale:
+                if SECTIONS[section]["page"] == name:
+                    page[SECTIONS[section]["field"]] = values[section]
+            revisions.record(name, page, author="auto_build", message=f"build {version}")
+        sections = dict(state.get("sections", {}))
+        for section in stale:
+            sections[section] = {"fingerprint": _fingerprint(SECTIONS[section], inputs), "version": version, "updated": now}
+        # inputs this build was sent win; the rest stay as the latest state has them
+        merged_inputs = dict(state.get("inputs") or inputs, **{k: inputs[k] for k in given})
+        new_state = {"version": version, "inputs": merged_inputs, "sections": sections}
+        DB["site_build"] = new_state
+        persist("set", ["site_build"], new_state)
+        return {
+            "version": version,
+            "generated": values,
+            "regenerated": stale,
+            "unchanged": [s for s in SECTIONS if s not in stale],
+            "invalidate": {
+                "pages": {name: sorted(fields) for name, fields in changed.items()},
+                "api": [f"/api/pages/{name}" for name in changed] + (["/api/projects"] if "projects" in changed else []),
+                "routes": [PAGE_ROUTES[name] for name in changed if name in PAGE_ROUTES],
+                "chatbot_context": bool(changed),
+            },
+        }
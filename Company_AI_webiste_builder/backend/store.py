@@ -0,0 +1,267 @@
+# store.py
+# Shared application state: the in-memory DB (one per tenant), its optional journal
+# and the encoded-page cache. Every blueprint reads and writes through this module.
+#
+# `DB` is a proxy for the current tenant's dict. The tenant is a context variable
+# set per request (tenants.py), so it follows both request threads and asyncio
+# tasks; outside a request (CLI, seeding, benchmarks) it is the default tenant.
+import contextlib
+import contextvars
+import copy
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from werkzeug.local import LocalProxy
+from werkzeug.utils import secure_filename
+
+from journal import Journal
+from json_provider import RawJSON, dumps_bytes
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+DEFAULT_TENANT = "default"
+
+# In-memory DB (demo). Keys: pages, jobs, applications, portfolios, faq, themes, blog, testimonials, analytics
+# This is the default tenant; every other tenant is a dict of the same shape under
+# _ROOT["_tenants"][tenant_id] (with its site settings in "_site"), so one journal
+# covers all tenants and single-site journals replay unchanged.
+_ROOT = {
+    "pages": {
+        "home": {"title":"Mastersolis Infotech", "hero":"AI-driven digital presence"},
+        "about": {"mission":"Empowering AI-driven innovation for modern businesses."}
+    },
+    "jobs": [],
+    "applications": [],
+    "portfolios": {},
+    "faq": [],
+    "themes": {},
+    "blog": [],
+    "testimonials": [],
+    "analytics": {}
+}
+
+_INITIAL = copy.deepcopy(_ROOT)  # what a journal replays onto
+
+_current = contextvars.ContextVar("tenant", default=DEFAULT_TENANT)
+
+
+def tenant_db(tenant_id):
+    """The DB dict of `tenant_id`, or None if there is no such tenant."""
+    if tenant_id == DEFAULT_TENANT:
+        return _ROOT
+    return _ROOT.get("_tenants", {}).get(tenant_id)
+
+
+def tenant_ids():
+    return [DEFAULT_TENANT, *_ROOT.get("_tenants", {})]
+
+
+def current_tenant():
+    return _current.get()
+
+
+def set_tenant(tenant_id):
+    """Make `tenant_id` current for this request / task; returns a token for reset."""
+    return _current.set(tenant_id)
+
+
+@contextlib.contextmanager
+def using_tenant(tenant_id):
+    token = _current.set(tenant_id)
+    try:
+        yield tenant_db(tenant_id)
+    finally:
+        _current.reset(token)
+
+
+def _current_db():
+    db = tenant_db(_current.get())
+    if db is None:
+        raise LookupError(f"unknown tenant: {_current.get()}")
+    return db
+
+
+DB = LocalProxy(_current_db)
+
+# Optional durable persistence for the in-memory DB (append-only journal + snapshots).
+# Set DB_JOURNAL_DIR to enable; DB_JOURNAL_FSYNC is one of always / interval / never.
+JOURNAL = None
+
+
+def open_journal():
+    """Open the journal once (replaying it into DB); returns it, or None when disabled."""
+    global JOURNAL
+    if JOURNAL is None and os.getenv("DB_JOURNAL_DIR"):
+        JOURNAL = Journal(
+            os.getenv("DB_JOURNAL_DIR"),
+            fsync=os.getenv("DB_JOURNAL_FSYNC", "interval"),
+            fsync_interval=float(os.getenv("DB_JOURNAL_FSYNC_INTERVAL", "1.0")),
+            snapshot_every=int(os.getenv("DB_SNAPSHOT_EVERY", "50000")),
+        )
+        JOURNAL.open(_ROOT)
+    return JOURNAL
+
+
+def reopen_journal():
+    """In a freshly forked worker: pick up writes made by earlier workers since the fork source
+    loaded the DB (a recycled or crashed worker's replacement). Returns True if DB was reloaded."""
+    if JOURNAL is None:
+        return False
+    reloaded = JOURNAL.reopen(_ROOT, copy.deepcopy(_INITIAL))
+    if reloaded:
+        with _cache_lock:
+            _PAGE_JSON_CACHE.clear()
+    return reloaded
+
+
+# Write listeners: derived state (e.g. the search index) follows DB writes by
+# subscribing here. Called with the tenant-relative (op, path, value) of every persist(),
+# after the write is journaled; a failing listener is logged and never fails the write.
+_listeners = []
+
+
+def on_write(fn):
+    """Register fn(op, path, value) to be called after each persisted write (usable as a decorator)."""
+    _listeners.append(fn)
+    return fn
+
+
+def persist(op, path, value=None):
+    """Record a mutation of the current tenant's DB in the journal, then notify the listeners."""
+    if JOURNAL is not None:
+        tenant_id = _current.get()
+        JOURNAL.record(op, path if tenant_id == DEFAULT_TENANT else ["_tenants", tenant_id, *path], value)
+    for fn in _listeners:
+        try:
+            fn(op, path, value)
+        except Exception:
+            log.exception("write listener %s failed for %s %s", getattr(fn, "__module__", fn), op, path)
+
+
+def add_tenant(tenant_id, db):
+    """Register a new tenant DB (journaled)."""
+    _ROOT.setdefault("_tenants", {})[tenant_id] = db
+    if JOURNAL is not None:
+        JOURNAL.record("set", ["_tenants", tenant_id], db)
+
+
+def save_upload(file):
+    """Save an uploaded file under DATA_DIR/uploads/<tenant> (created on first use); returns its path.
+
+    Each upload gets its own file ("<random>_<name>"), so a later upload with the same name
+    never overwrites one that an application still points to.
+    """
+    updir = DATA_DIR / "uploads"
+    if _current.get() != DEFAULT_TENANT:
+        updir = updir / _current.get()
+    updir.mkdir(parents=True, exist_ok=True)
+    path = updir / f"{uuid.uuid4().hex[:16]}_{secure_filename(file.filename or '') or 'upload'}"
+    file.save(path)
+    return path
+
+
+# ----------------------------
+# Encoded-page cache
+# ----------------------------
+# tenant -> {pagename: (page dict, RawJSON)}. Entries are only valid while
+# DB["pages"][name] is still the same object, so replacing a page invalidates it
+# implicitly. Partitions are LRU-evicted per tenant, so a burst of traffic to
+# cold sites cannot flush out every page of the busy ones.
+PAGE_CACHE_TENANTS = int(os.getenv("PAGE_CACHE_TENANTS", "1000"))
+_PAGE_JSON_CACHE = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _page_partition(tenant_id):
+    with _cache_lock:
+        part = _PAGE_JSON_CACHE.get(tenant_id)
+        if part is None:
+            part = _PAGE_JSON_CACHE[tenant_id] = {}
+            while len(_PAGE_JSON_CACHE) > PAGE_CACHE_TENANTS:
+                _PAGE_JSON_CACHE.popitem(last=False)
+        else:
+            _PAGE_JSON_CACHE.move_to_end(tenant_id)
+        return part
+
+
+def page_json(pagename):
+    """Return the page as pre-encoded RawJSON (cached), or None if it doesn't exist."""
+    page = DB.get("pages", {}).get(pagename)
+    if page is None:
+        return None
+    part = _page_partition(_current.get())
+    hit = part.get(pagename)
+    if hit is not None and hit[0] is page:
+        return hit[1]
+    raw = RawJSON(dumps_bytes(page))
+    part[pagename] = (page, raw)
+    return raw
+
+
+def invalidate_page_json(pagename=None):
+    """Drop the current tenant's cached encodings after an in-place page edit (all its pages if no name given)."""
+    tenant_id = _current.get()
+    with _cache_lock:
+        if pagename is None:
+            _PAGE_JSON_CACHE.pop(tenant_id, None)
+        else:
+            _PAGE_JSON_CACHE.get(tenant_id, {}).pop(pagename, None)
+
+
+# ----------------------------
+# Per-tenant derived indexes
+# ----------------------------
+class TenantCache:
+    """Something built from a tenant's DB (search index, dedup index, job matrix), one per
+    tenant, LRU-evicted across tenants and kept current by its owner's write listener.
+
+    The listener calls written() for every write it cares about, built or not; that bumps
+    the tenant's write generation. A build that saw the generation move while it ran may
+    have missed the write, so it is rebuilt (after a few tries, returned but not kept).
+    """
+
+    BUILD_TRIES = 3
+
+    def __init__(self, build, max_tenants):
+        self._build = build
+        self.max_tenants = max_tenants
+        self._items = OrderedDict()
+        self._generation = {}   # tenant -> number of relevant writes seen
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The current tenant's value, built on first use."""
+        tenant_id = _current.get()
+        for _ in range(self.BUILD_TRIES):
+            with self._lock:
+                value = self._items.get(tenant_id)
+                if value is not None:
+                    self._items.move_to_end(tenant_id)
+                    return value
+                generation = self._generation.get(tenant_id, 0)
+            value = self._build()
+            with self._lock:
+                if self._generation.get(tenant_id, 0) == generation:
+                    value = self._items.setdefault(tenant_id, value)
+                    while len(self._items) > self.max_tenants:
+                        self._items.popitem(last=False)
+                    return value
+        log.warning("tenant %s: index rebuilt %d times during writes, not caching it", tenant_id, self.BUILD_TRIES)
+        return value
+
+    def written(self):
+        """Record a write for the current tenant; returns its built value to update in place, or None."""
+        tenant_id = _current.get()
+        with self._lock:
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+            return self._items.get(tenant_id)
+
+    def reset(self):
+        """Forget the current tenant's value; the next get() rebuilds it."""
+        with self._lock:
+            self._items.pop(_current.get(), None)
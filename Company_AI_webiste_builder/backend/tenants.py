@@ -0,0 +1,177 @@
+# tenants.py
+# Multi-tenant site hosting: resolve the tenant for each request and enforce
+# per-tenant quotas. Tenant data itself lives in store.py.
+#
+# A request's tenant is, in order:
+#   1. a custom domain registered for a tenant ("www.acme.com"),
+#   2. a subdomain of TENANT_BASE_DOMAIN ("acme.sites.example.com" -> "acme"),
+#   3. the "tid" claim of an admin token (admin UI on the shared API host),
+#   4. otherwise the default tenant (single-site installs work unchanged).
+# An unknown subdomain / tenant is a 404 rather than a fallback to another site.
+import datetime
+import os
+import re
+import threading
+
+from flask import g, jsonify, request
+
+import auth
+import store
+from store import DB, DEFAULT_TENANT, persist
+
+BASE_DOMAIN = os.getenv("TENANT_BASE_DOMAIN", "").strip(".").lower()
+TENANT_ID_RE = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$")
+
+# Per-tenant limits (the default tenant is the operator's own site and is not limited).
+# Each tenant may override them in its "_site"["quotas"].
+DEFAULT_QUOTAS = {
+    "pages": int(os.getenv("TENANT_MAX_PAGES", "50")),
+    "jobs": int(os.getenv("TENANT_MAX_JOBS", "200")),
+    "portfolios": int(os.getenv("TENANT_MAX_PORTFOLIOS", "500")),
+    "llm": os.getenv("TENANT_LLM_QUOTA", "300/hour"),  # LLM-backed requests, all endpoints together
+}
+
+_domains = None  # domain -> tenant id, rebuilt when tenants change
+_lock = threading.Lock()
+
+
+def _domain_index():
+    global _domains
+    index = _domains
+    if index is None:
+        index = {}
+        for tenant_id in store.tenant_ids():
+            for domain in site(tenant_id).get("domains", []):
+                index[domain.lower()] = tenant_id
+        _domains = index
+    return index
+
+
+def resolve(host, authorization=None):
+    """Tenant id for a request, or None when the host names a site that doesn't exist."""
+    host = (host or "").lower()
+    if host.count(":") == 1:
+        host = host.split(":", 1)[0]
+    host = host.rstrip(".")
+    tenant_id = _domain_index().get(host)
+    if tenant_id is not None:
+        return tenant_id
+    if BASE_DOMAIN and host.endswith("." + BASE_DOMAIN):
+        tenant_id = host[:-len(BASE_DOMAIN) - 1]
+        return tenant_id if store.tenant_db(tenant_id) is not None else None
+    if authorization and authorization.startswith("Bearer "):
+        claims = auth.verify_token(authorization[7:].strip())
+        if claims is not None and claims.get("tid"):
+            return claims["tid"] if store.tenant_db(claims["tid"]) is not None else None
+    return DEFAULT_TENANT
+
+
+def site(tenant_id=None):
+    """Settings of a tenant (domains, admins, quotas); {} for the default tenant."""
+    db = store.tenant_db(tenant_id or store.current_tenant())
+    return (db or {}).get("_site", {})
+
+
+def quota(name, tenant_id=None):
+    return site(tenant_id).get("quotas", {}).get(name, DEFAULT_QUOTAS[name])
+
+
+def over_quota(collection):
+    """The current tenant's limit for `collection` if it is already reached, else None."""
+    tenant_id = store.current_tenant()
+    if tenant_id == DEFAULT_TENANT:
+        return None
+    limit = quota(collection, tenant_id)
+    return limit if len(DB.get(collection) or ()) >= limit else None
+
+
+def _clean_domains(domains):
+    return [d.strip().lower().rstrip(".") for d in domains if d.strip()]
+
+
+def _check_quotas(quotas):
+    unknown = set(quotas or {}) - set(DEFAULT_QUOTAS)
+    if unknown:
+        raise ValueError(f"unknown quota(s): {', '.join(sorted(unknown))}")
+
+
+def _check_domains_free(domains, tenant_id):
+    taken = [d for d in domains if _domain_index().get(d, tenant_id) != tenant_id]
+    if taken:
+        raise ValueError(f"domain already in use: {', '.join(taken)}")
+
+
+def create(tenant_id, domains=(), admins=(), quotas=None, admin_password=None):
+    """Create an empty tenant. Raises ValueError for bad ids / taken ids or domains.
+
+    Its site admins log in with `admin_password` (stored hashed); without one they can't log in.
+    """
+    if not TENANT_ID_RE.match(tenant_id or "") or tenant_id == DEFAULT_TENANT:
+        raise ValueError("tenant id must be 1-63 lowercase letters, digits or '-'")
+    domains = _clean_domains(domains)
+    _check_quotas(quotas)
+    with _lock:
+        if store.tenant_db(tenant_id) is not None:
+            raise ValueError(f"tenant '{tenant_id}' already exists")
+        _check_domains_free(domains, tenant_id)
+        db = {
+            "pages": {}, "jobs": [], "applications": [], "portfolios": {}, "faq": [],
+            "themes": {}, "blog": [], "testimonials": [], "analytics": {},
+            "_site": {
+                "domains": domains,
+                "admins": list(admins),
+                "quotas": dict(quotas or {}),
+                "created": datetime.datetime.utcnow().isoformat(),
+            },
+        }
+        if admin_password:
+            db["_site"]["admin_password_hash"] = auth.hash_password(admin_password)
+        store.add_tenant(tenant_id, db)
+        global _domains
+        _domains = None
+    return db
+
+
+def update(tenant_id, domains=None, admins=None, quotas=None, admin_password=None):
+    """Change a tenant's settings (None keeps a setting); returns them.
+
+    Raises KeyError for an unknown tenant, ValueError for taken domains or unknown quotas.
+    Written through persist(["_site"]), so caches built from the settings (seo) are reset.
+    """
+    if tenant_id == DEFAULT_TENANT or store.tenant_db(tenant_id) is None:
+        raise KeyError(tenant_id)
+    _check_quotas(quotas)
+    with _lock:
+        settings = dict(site(tenant_id))
+        if domains is not None:
+            settings["domains"] = _clean_domains(domains)
+            _check_domains_free(settings["domains"], tenant_id)
+        if admins is not None:
+            settings["admins"] = list(admins)
+        if quotas is not None:
+            settings["quotas"] = dict(quotas)
+        if admin_password:
+            settings["admin_password_hash"] = auth.hash_password(admin_password)
+        settings["updated"] = datetime.datetime.utcnow().isoformat()
+        with store.using_tenant(tenant_id):
+            DB["_site"] = settings
+            persist("set", ["_site"], settings)
+        global _domains
+        _domains = None
+    return settings
+
+
+def init_app(app):
+    """Resolve the tenant before every request (must run before the admin guard)."""
+
+    @app.before_request
+    def _resolve_tenant():
+        authorization = request.headers.get("Authorization")
+        if authorization is None and request.path == "/api/admin/events" and request.args.get("access_token"):
+            authorization = "Bearer " + request.args["access_token"]  # EventSource cannot send headers
+        tenant_id = resolve(request.host, authorization)
+        if tenant_id is None:
+            return jsonify({"error": "Unknown site"}), 404
+        store.set_tenant(tenant_id)
+        g.tenant = tenant_id
+        return None
@@ -0,0 +1,73 @@
+# tests/test_asgi.py
+# ASGI entry point: one process per DATA_DIR, and error handling once headers are out.
+import asyncio
+import json
+
+import pytest
+
+asgi = pytest.importorskip("asgi")
+
+
+def _lifespan_startup():
+    sent = []
+
+    async def receive():
+        return {"type": "lifespan.startup"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "lifespan.startup.complete":
+            raise asyncio.CancelledError  # stop the loop after startup
+
+    try:
+        asyncio.run(asgi._lifespan(receive, send))
+    except asyncio.CancelledError:
+        pass
+    return sent[-1]
+
+
+def test_second_process_on_the_same_data_dir_fails_startup(monkeypatch):
+    assert _lifespan_startup()["type"] == "lifespan.startup.complete"
+    first = asgi._process_lock
+    try:
+        monkeypatch.setattr(asgi, "_process_lock", None)   # as if another process
+        failed = _lifespan_startup()
+        assert failed["type"] == "lifespan.startup.failed" and "one worker" in failed["message"]
+    finally:
+        first.close()
+        asgi._process_lock = None
+
+
+def _post(path, body, send):
+    scope = {"type": "http", "method": "POST", "path": path, "headers": [(b"host", b"localhost")],
+             "client": ("127.0.0.1", 1), "query_string": b""}
+    messages = [{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    asyncio.run(asgi.application(scope, receive, send))
+
+
+def test_async_route():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    _post("/api/voice/text", {"text": "hello   there"}, send)
+    assert sent[0]["status"] == 200
+    assert json.loads(sent[1]["body"]) == {"speech_text": "hello there"}
+
+
+def test_failure_after_headers_does_not_start_a_second_response():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body":
+            raise RuntimeError("client went away")
+
+    with pytest.raises(RuntimeError):
+        _post("/api/voice/text", {"text": "hello"}, send)
+    assert [m["type"] for m in sent].count("http.response.start") == 1
@@ -0,0 +1,78 @@
+# tests/test_auth.py
+import pytest
+
+import auth
+import tenants
+from conftest import ADMIN_EMAIL, ADMIN_PASSWORD, login
+
+
+def test_token_roundtrip_and_tampering():
+    token, claims = auth.issue_token("a@example.com", tenant="acme")
+    assert auth.verify_token(token)["tid"] == "acme"
+    payload, sig = token.split(".")
+    assert auth.verify_token(payload + "." + sig[:-2] + ("AA" if sig[-2:] != "AA" else "BB")) is None
+    forged = auth._b64(b'{"sub":"x","exp":9999999999,"jti":"1"}') + "." + sig
+    assert auth.verify_token(forged) is None
+    assert auth.verify_token("garbage") is None
+
+
+def test_expired_and_revoked_tokens_are_rejected():
+    token, _ = auth.issue_token("a@example.com", ttl=-1)
+    assert auth.verify_token(token) is None
+    token, claims = auth.issue_token("a@example.com")
+    auth.revoke(claims)
+    assert auth.verify_token(token) is None
+
+
+def test_login_checks_the_password(client):
+    assert client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": "wrong"}).status_code == 401
+    assert client.post("/api/auth/login", json={"email": "x@example.com", "password": ADMIN_PASSWORD}).status_code == 403
+    assert client.post("/api/auth/login", json={"email": ADMIN_EMAIL}).status_code == 400
+    headers = login(client)
+    assert client.get("/api/admin/messages", headers=headers).status_code == 200
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/admin/messages", headers=headers).status_code == 401
+
+
+def test_site_admins_need_their_sites_password(app):
+    from conftest import HostClient
+
+    tenants.create("pw-site", ["pw-site.test"], admins=["owner@pw.test"], admin_password="site-secret")
+    tenants.create("nopw-site", ["nopw-site.test"], admins=["owner@nopw.test"])
+    site = HostClient(app, app.response_class, host="pw-site.test")
+    assert site.post("/api/auth/login", json={"email": "owner@pw.test", "password": ADMIN_PASSWORD}).status_code == 401
+    resp = site.post("/api/auth/login", json={"email": "owner@pw.test", "password": "site-secret"})
+    assert resp.get_json()["tenant"] == "pw-site"
+    other = HostClient(app, app.response_class, host="nopw-site.test")
+    assert other.post("/api/auth/login", json={"email": "owner@nopw.test", "password": "x"}).status_code == 401
+
+
+def test_tenant_listing_hides_password_hashes(client, admin_headers):
+    resp = client.post("/api/admin/tenants", headers=admin_headers,
+                       json={"id": "hidden-hash", "admins": ["o@h.test"], "admin_password": "pw"})
+    assert resp.status_code == 201 and "admin_password_hash" not in resp.get_json()["tenant"]
+    listing = client.get("/api/admin/tenants", headers=admin_headers).get_json()
+    assert all("admin_password_hash" not in t for t in listing)
+
+
+def test_app_refuses_to_start_without_a_password_hash(monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASH", "")
+    monkeypatch.delenv("ADMIN_PASSWORD_HASH")
+    with pytest.raises(RuntimeError, match="ADMIN_PASSWORD_HASH"):
+        auth.init_app(None)
+
+
+def test_settings_loaded_after_import_are_picked_up(monkeypatch):
+    # as when ADMIN_PASSWORD_HASH only comes from .env, loaded by create_app
+    monkeypatch.setattr(auth, "PASSWORD_HASH", "")
+    monkeypatch.setattr(auth, "SECRET", auth.SECRET)
+    monkeypatch.setenv("ADMIN_PASSWORD_HASH", auth.hash_password("from-dotenv"))
+    monkeypatch.setenv("ADMIN_TOKEN_SECRET", "dotenv-secret")
+    auth.init_app(None)
+    assert auth.check_password("from-dotenv", auth.PASSWORD_HASH) and auth.SECRET == b"dotenv-secret"
+
+
+def test_check_password_handles_bad_hashes():
+    assert auth.check_password("x", "not-a-hash") is False
+    assert auth.check_password("x", None) is False
+    assert auth.check_password("", auth.hash_password("")) is False
@@ -0,0 +1,69 @@
+# tests/test_changefeed.py
+import threading
+
+import changefeed
+import store
+from store import DB, persist
+
+
+def _apply(name):
+    rec = {"id": name, "name": name, "email": f"{name}@example.com", "job_title": "Engineer"}
+    DB.setdefault("applications", []).append(rec)
+    persist("append", ["applications"], rec)
+
+
+def test_writes_become_events_with_increasing_ids(site):
+    _apply("a")
+    _apply("b")
+    events = list(changefeed._history[site.tenant_id])
+    assert [e["type"] for e in events] == ["application.created"] * 2
+    assert events[0]["id"] < events[1]["id"]
+    assert events[0]["id"] > 10 ** 15  # boot-time based, not restarting at 1
+
+
+def test_catch_up_replays_after_a_known_id(site):
+    _apply("a")
+    _apply("b")
+    _apply("c")
+    first, *_, last = changefeed._history[site.tenant_id]
+    chunks, seen = changefeed.catch_up(site.tenant_id, first["id"])
+    assert len(chunks) == 2 and b"id: %d" % last["id"] in chunks[-1]
+    assert seen == last["id"]
+    assert changefeed.catch_up(site.tenant_id, None) == ([], 0)
+
+
+def test_unknown_last_id_gets_a_resync(site):
+    _apply("a")
+    newest = changefeed._history[site.tenant_id][-1]["id"]
+    # an id from before a restart is higher than anything this process has issued
+    chunks, seen = changefeed.catch_up(site.tenant_id, newest + 10 ** 9)
+    assert chunks == [changefeed.RESYNC] and seen == newest
+    assert changefeed.catch_up(site.tenant_id + "-empty", 5) == ([changefeed.RESYNC], 0)
+
+
+def test_stream_sends_live_events_after_catch_up(site):
+    _apply("a")
+    gen = changefeed.stream(site.tenant_id, (), changefeed._history[site.tenant_id][-1]["id"])
+    assert next(gen).startswith(b"retry: 3000")
+    with store.using_tenant(site.tenant_id):
+        _apply("live")
+    assert b'"live"' in next(gen)
+    gen.close()
+    assert not changefeed._subscribers.get(site.tenant_id)
+
+
+def test_events_endpoint_requires_admin(site):
+    assert site.get("/api/admin/events").status_code == 401
+    assert site.get("/api/admin/events?types=nope&access_token=x").status_code == 401
+
+
+def test_open_streams_are_capped_per_process(site, admin_headers, monkeypatch):
+    monkeypatch.setattr(changefeed, "_sync_slots", threading.BoundedSemaphore(1))
+    first = site.get("/api/admin/events", headers=admin_headers, buffered=False)
+    assert first.status_code == 200
+    busy = site.get("/api/admin/events", headers=admin_headers, buffered=False)
+    assert busy.status_code == 503 and busy.headers["Retry-After"] == "60"
+    first.close()   # the slot is given back when the connection closes
+    again = site.get("/api/admin/events", headers=admin_headers, buffered=False)
+    assert again.status_code == 200
+    again.close()
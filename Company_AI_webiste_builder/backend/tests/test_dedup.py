@@ -0,0 +1,75 @@
+# tests/test_dedup.py
+import io
+import os
+
+import dedup
+
+RESUME = (b"Jane Doe\njane@example.com\nSenior engineer with 6 years of experience building Python, "
+          b"React and AWS services for retail and logistics companies. Led a team of five.\n")
+
+
+def _apply(site, content, name="resume.txt", **form):
+    data = {"name": "Jane Doe", "email": "jane@example.com", "job_title": "Engineer",
+            "resume": (io.BytesIO(content), name), **form}
+    resp = site.post("/api/apply", data=data, content_type="multipart/form-data")
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()["application"]
+
+
+def test_exact_duplicate_reuses_parse_but_scores_its_own_skills(site):
+    first = _apply(site, RESUME, desired_skills="python")
+    second = _apply(site, RESUME, job_title=" engineer ", desired_skills="java,go")
+
+    assert second["duplicate_of"] == first["id"] and second["duplicate_reason"] == "exact"
+    assert second["parsed"] == first["parsed"]
+    assert first["score"]["matched_skills"] == ["python"]
+    assert second["score"]["matched_skills"] == []
+    assert second["resume_path"] == first["resume_path"] and os.path.exists(first["resume_path"])
+
+
+def test_same_file_name_never_overwrites_a_shared_resume(site):
+    first = _apply(site, RESUME)
+    dup = _apply(site, RESUME)
+    other = _apply(site, b"A completely different resume for someone else entirely.", email="x@example.com",
+                   job_title="Designer")
+    assert other["resume_path"] != first["resume_path"]
+    with open(dup["resume_path"], "rb") as f:
+        assert f.read() == RESUME
+
+
+def test_near_duplicate_and_email_job(site):
+    first = _apply(site, RESUME)
+    near = _apply(site, RESUME.replace(b"five", b"six"), email="jane.doe@example.com")
+    assert near["duplicate_of"] == first["id"] and near["duplicate_reason"] == "near"
+    again = _apply(site, b"Short new resume text, nothing in common with the first one.")
+    assert again["duplicate_of"] == first["id"] and again["duplicate_reason"] == "email_job"
+
+
+def test_same_resume_for_another_job_is_a_new_application(site, monkeypatch):
+    import outbox
+
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    acks = []
+    monkeypatch.setattr(outbox, "enqueue", lambda template, to, context: acks.append(context["application_id"]))
+    first = _apply(site, RESUME)
+    other = _apply(site, RESUME, job_title="Data Engineer")
+    assert "duplicate_of" not in other
+    assert other["same_candidate_as"] == first["id"] and other["match_reason"] == "exact"
+    assert other["parsed"] == first["parsed"]
+    near = _apply(site, RESUME.replace(b"five", b"six"), job_title="Designer")
+    assert "duplicate_of" not in near and near["same_candidate_as"] in (first["id"], other["id"])
+    assert acks == [first["id"], other["id"], near["id"]]
+
+    again = _apply(site, RESUME.replace(b"five", b"six"), job_title="Data Engineer")
+    assert again["duplicate_of"] == other["id"] and again["duplicate_reason"] == "near"   # prefers the same job
+    assert acks[-1] == near["id"]
+    assert {c["canonical"]["id"]: c["size"] for c in dedup.clusters()} == {other["id"]: 2}
+
+
+def test_minhash_similarity():
+    a = dedup.minhash(RESUME.decode())
+    b = dedup.minhash(RESUME.decode().replace("five", "six"))
+    c = dedup.minhash("Unrelated text about gardening, tomatoes and the weather this spring.")
+    assert dedup.similarity(a, a) == 1.0
+    assert dedup.similarity(a, b) >= dedup.NEAR_THRESHOLD > dedup.similarity(a, c)
+    assert dedup.minhash("") is None
@@ -0,0 +1,65 @@
+# tests/test_exports.py
+# Streaming CSV/NDJSON exports, and the formula guard on CSV cells.
+import csv
+import io
+import json
+
+import pytest
+
+import exports
+from store import DB, persist
+
+
+def _message(i, text="Hello"):
+    message = {"id": str(i), "name": f"Sender {i}", "email": f"s{i}@example.com", "message": text,
+               "created": "2024-01-01T00:00:00"}
+    DB.setdefault("messages", []).append(message)
+    persist("append", ["messages"], message)
+
+
+@pytest.mark.parametrize("text", ["=HYPERLINK(\"x\")", "+1", "-1", "@SUM(A1)", "\t=1", "\r=1"])
+def test_formula_prefixes_are_quoted(text):
+    assert exports._csv_cell(text) == "'" + text
+
+
+def test_plain_cells_are_unchanged():
+    assert exports._csv_cell("hello") == "hello"
+    assert exports._csv_cell(None) == ""
+    assert exports._csv_cell(3) == "3"
+
+
+def test_csv_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(exports, "CHUNK_ROWS", 2)
+    records = [{"id": str(i), "name": "n", "email": "e", "message": "m", "created": "c"} for i in range(5)]
+    chunks = list(exports.iter_csv("messages", records))
+    assert len(chunks) == 3   # rows 1-2 (plus the header), 3-4, 5
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == [name for name, _, _ in exports.COLUMNS["messages"]]
+    assert [r[0] for r in rows[1:]] == ["0", "1", "2", "3", "4"]
+
+
+def test_csv_export_route(site, admin_headers):
+    _message(1)
+    _message(2, "=cmd|' /C calc'!A0")
+    resp = site.get("/api/admin/export/messages", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/csv"
+    assert "attachment" in resp.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [r["id"] for r in rows] == ["1", "2"]
+    assert rows[1]["message"].startswith("'=")
+
+
+def test_ndjson_export_route(site, admin_headers):
+    _message(1)
+    resp = site.get("/api/admin/export/messages?format=ndjson", headers=admin_headers)
+    assert resp.status_code == 200
+    lines = resp.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["email"] for line in lines] == ["s1@example.com"]
+
+
+def test_unknown_collection_and_format(site, admin_headers):
+    assert site.get("/api/admin/export/users", headers=admin_headers).status_code == 404
+    assert site.get("/api/admin/export/messages?format=xlsx", headers=admin_headers).status_code == 400
+    if not exports.USE_PYARROW:
+        assert site.get("/api/admin/export/messages?format=parquet", headers=admin_headers).status_code == 501
@@ -0,0 +1,74 @@
+# tests/test_extract.py
+import hashlib
+import io
+import zipfile
+import zlib
+from concurrent.futures import Future
+
+import extract
+
+
+def test_pdf_unescape():
+    assert extract._pdf_unescape(rb"A\101\102C") == "AABC"
+    assert extract._pdf_unescape(rb"\8\9") == "89"  # not octal: the digit itself
+    assert extract._pdf_unescape(rb"x\1234") == "xS4"
+    assert extract._pdf_unescape(rb"\(a\)\\ \n") == "(a)\\ \n"
+
+
+def test_detect_type():
+    assert extract.detect_type(b"%PDF-1.7 ...") == "pdf"
+    assert extract.detect_type(b"PK\x03\x04garbage") == "unknown"
+    assert extract.detect_type(b"\x00\x01binary") == "unknown"
+    assert extract.detect_type("Résumé".encode()) == "txt"
+
+
+def test_pdf_fallback_reads_text_operators():
+    content = zlib.compress(rb"BT /F1 12 Tf (Jane \8 Doe) Tj 0 -14 Td [(Python) -250 (dev)] TJ ET")
+    pdf = b"%%PDF-1.4\n1 0 obj<</Length %d/Filter/FlateDecode>>stream\n%s\nendstream endobj" % (len(content), content)
+    text = extract._extract_pdf_fallback(pdf, 5)
+    assert "Jane 8 Doe" in text and "Pythondev" in text
+
+
+def test_docx_and_txt_are_extracted_and_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "CACHE_DIR", tmp_path)
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        zf.writestr("word/document.xml", '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+                    'wordprocessingml/2006/main"><w:body><w:p><w:r><w:t>Skills: Flask</w:t></w:r></w:p>'
+                    '</w:body></w:document>')
+    assert extract.extract_text(out.getvalue(), "cv.docx") == "Skills: Flask"
+    assert extract.extract_text(b"plain resume", "cv.txt") == "plain resume"
+    assert len(list(tmp_path.glob("*.txt"))) == 2
+
+
+def _zip(files):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return out.getvalue()
+
+
+class _CancellingPool:
+    """A pool that another request reset while this job was still queued."""
+
+    def submit(self, *args):
+        future = Future()
+        future.cancel()
+        return future
+
+
+def test_cancelled_extraction_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(extract.POOL, "get", lambda: _CancellingPool())
+    data = _zip({"word/document.xml": "<w:document/>", "cancelled": ""})
+    assert extract.extract_text(data, "cv.docx") == ""
+    assert extract._cache_get(hashlib.sha256(data).hexdigest()) is None
+    assert not list(tmp_path.glob("*.txt"))
+
+
+def test_parser_failure_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "CACHE_DIR", tmp_path)
+    data = _zip({"word/document.xml": "<not xml"})
+    assert extract.extract_text(data, "cv.docx") == ""
+    assert extract._cache_get(hashlib.sha256(data).hexdigest()) == ""
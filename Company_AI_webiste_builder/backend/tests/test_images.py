@@ -0,0 +1,97 @@
+# tests/test_images.py
+import io
+
+import pytest
+
+import images
+
+PIL = pytest.importorskip("PIL.Image")
+
+
+def _image(size=(1200, 600), mode="RGB", fmt="PNG"):
+    out = io.BytesIO()
+    PIL.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(out, format=fmt)
+    return out.getvalue()
+
+
+def _upload(site, admin_headers, data, name="photo.png"):
+    resp = site.post("/api/admin/media", headers=admin_headers, content_type="multipart/form-data",
+                     data={"image": (io.BytesIO(data), name)})
+    assert resp.status_code == 201, resp.get_json()
+    return resp.get_json()["src"]
+
+
+def _decoded(resp):
+    return PIL.open(io.BytesIO(resp.data))
+
+
+def test_resize_snaps_to_a_standard_width(site, admin_headers):
+    src = _upload(site, admin_headers, _image())
+    resp = site.get(f"/api/img?src={src}&w=300&fmt=png")
+    assert resp.status_code == 200 and resp.mimetype == "image/png"
+    assert _decoded(resp).size == (320, 160)
+    # never upscaled
+    assert _decoded(site.get(f"/api/img?src={src}&w=5000&fmt=png")).width == 1200
+
+
+def test_format_negotiation(site, admin_headers):
+    opaque = _upload(site, admin_headers, _image())
+    alpha = _upload(site, admin_headers, _image(mode="RGBA"), "alpha.png")
+    resp = site.get(f"/api/img?src={opaque}&w=160", headers={"Accept": "image/webp,*/*"})
+    assert resp.mimetype == "image/webp" and "Accept" in resp.headers["Vary"]
+    assert site.get(f"/api/img?src={opaque}&w=160").mimetype == "image/jpeg"
+    assert site.get(f"/api/img?src={alpha}&w=160").mimetype == "image/png"
+    assert images.negotiate("avif", "") in ("avif", "webp")
+    assert site.get(f"/api/img?src={opaque}&fmt=bmp").status_code == 400
+
+
+def test_second_request_is_a_cache_hit(site, admin_headers, monkeypatch):
+    src = _upload(site, admin_headers, _image())
+    first = site.get(f"/api/img?src={src}&w=480&fmt=jpeg")
+    assert first.status_code == 200
+
+    def no_pool():
+        raise AssertionError("cache hit expected, not a resize")
+
+    monkeypatch.setattr(images.POOL, "get", no_pool)
+    again = site.get(f"/api/img?src={src}&w=480&fmt=jpeg")
+    assert again.data == first.data and again.headers["ETag"] == first.headers["ETag"]
+    assert "max-age" in again.headers["Cache-Control"]
+    assert site.get(f"/api/img?src={src}&w=480&fmt=jpeg",
+                    headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_uploads_and_other_files_are_not_served(site, admin_headers):
+    resume = site.post("/api/apply", content_type="multipart/form-data",
+                       data={"name": "A", "email": "a@example.com", "job_title": "X",
+                             "resume": (io.BytesIO(_image()), "resume.png")}).get_json()["application"]
+    name = resume["resume_path"].rsplit("/", 1)[-1]
+    assert site.get(f"/api/img?src=media:{name}").status_code == 404
+    assert site.get(f"/api/img?src=upload:{name}").status_code == 403
+    assert site.get("/api/img?src=media:../uploads/x.png").status_code == 404
+    assert site.get("/api/img?src=https://evil.example/x.png").status_code == 403
+
+
+def test_media_upload_rejects_non_images(site, admin_headers):
+    resp = site.post("/api/admin/media", headers=admin_headers, content_type="multipart/form-data",
+                     data={"image": (io.BytesIO(b"%PDF-1.4 not an image"), "cv.pdf")})
+    assert resp.status_code == 415
+    assert site.post("/api/admin/media", content_type="multipart/form-data",
+                     data={"image": (io.BytesIO(_image()), "x.png")}).status_code == 401
+
+
+def test_original_evicted_before_the_resize_is_fetched_again(site, admin_headers, monkeypatch):
+    src = _upload(site, admin_headers, _image(size=(900, 450)))   # not resized by another test
+    original, calls = images.original, []
+
+    def evicted_right_after(source):
+        path, mime = original(source)
+        if not calls:
+            path.unlink()   # eviction between original() and the resize reading it
+        calls.append(path)
+        return path, mime
+
+    monkeypatch.setattr(images, "original", evicted_right_after)
+    resp = site.get(f"/api/img?src={src}&w=320&fmt=png")
+    assert resp.status_code == 200 and resp.mimetype == "image/png"
+    assert len(calls) == 2
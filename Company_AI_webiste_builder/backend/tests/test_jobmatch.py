@@ -0,0 +1,62 @@
+# tests/test_jobmatch.py
+# Job-skill matrix: alias folding, ranking, and staying current as jobs change.
+import jobmatch
+from store import DB, persist
+
+
+def _add_job(site, title, skills):
+    return site.post("/api/jobs", json={"title": title, "skills": skills}).get_json()["job"]
+
+
+def test_normalize_folds_aliases():
+    assert jobmatch.normalize(" ReactJS ") == "react"
+    assert jobmatch.normalize("Node.js") == "node"
+    assert jobmatch.normalize("K8s") == "kubernetes"
+    assert jobmatch.job_skills({"skills": "Postgres, golang,"}) == {"postgresql", "go"}
+    assert jobmatch.job_skills({"title": "Python developer", "description": "Docker and AWS"}) == {"python", "docker", "aws"}
+
+
+def test_bitset_ranking():
+    matrix = jobmatch.Matrix()
+    frontend = {"id": "f", "skills": "react, typescript, css"}
+    backend = {"id": "b", "skills": "python, postgresql"}
+    matrix.add(frontend)
+    matrix.add(backend)
+    bits = matrix.vector("Five years of ReactJS and TypeScript, some Postgres")
+    assert set(matrix.skill_names(bits)) == {"react", "typescript", "postgresql"}
+
+    ranked = matrix.rank(bits)
+    assert [job["id"] for job, _, _, _ in ranked] == ["f", "b"]
+    job, row, hits, coverage = ranked[0]
+    assert set(matrix.skill_names(row & ~hits)) == {"css"} and coverage == 2 / 3
+
+
+def test_match_route(site):
+    _add_job(site, "Frontend Developer", "React, TypeScript, Tailwind CSS")
+    _add_job(site, "Data Engineer", "Python, SQL, AWS")
+    _add_job(site, "Chef", "cooking")
+
+    resp = site.post("/api/jobs/match", json={"text": "Jane\n4 years of Python and AWS, some React."})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["jobs_considered"] == 3
+    titles = [m["job"]["title"] for m in body["matches"]]
+    assert titles == ["Data Engineer", "Frontend Developer"]
+    assert body["matches"][0]["missing_skills"] == ["sql"]
+
+    assert site.post("/api/jobs/match", json={"text": " "}).status_code == 400
+    assert site.post("/api/jobs/match?limit=x", json={"text": "python"}).status_code == 400
+
+
+def test_matrix_follows_job_changes(site):
+    _add_job(site, "Data Engineer", "Python")
+    assert jobmatch.match("python", {})["jobs_considered"] == 1
+
+    _add_job(site, "Go Developer", "golang")   # appended row
+    result = jobmatch.match("I write Go", {})
+    assert result["jobs_considered"] == 2 and result["matches"][0]["job"]["title"] == "Go Developer"
+
+    DB["jobs"] = [j for j in DB["jobs"] if j["title"] != "Go Developer"]
+    persist("set", ["jobs"], DB["jobs"])       # any other change rebuilds the matrix
+    result = jobmatch.match("I write Go", {})
+    assert result["jobs_considered"] == 1 and result["matches"] == []
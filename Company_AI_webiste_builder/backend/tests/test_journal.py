@@ -0,0 +1,137 @@
+# tests/test_journal.py
+import threading
+import time
+
+import journal
+
+
+def _open(path, db=None, **kw):
+    jrnl = journal.Journal(path, fsync="never", **kw)
+    jrnl.open({} if db is None else db)
+    return jrnl
+
+
+def test_replay_restores_set_append_delete(tmp_path):
+    db = {}
+    jrnl = _open(tmp_path, db)
+    for op, path, value in [("set", ["pages", "home"], {"title": "Hi"}), ("append", ["jobs"], {"id": 1}),
+                            ("set", ["portfolios", "p1"], {"v": 1}), ("delete", ["portfolios", "p1"], None)]:
+        journal.apply_op(db, op, path, value)
+        jrnl.record(op, path, value)
+    jrnl.close()
+
+    replayed = {}
+    again = _open(tmp_path, replayed)
+    assert replayed == {"pages": {"home": {"title": "Hi"}}, "jobs": [{"id": 1}], "portfolios": {}}
+    assert again.seq == 4
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    jrnl = _open(tmp_path)
+    jrnl.record("append", ["jobs"], {"id": 1})
+    jrnl.close()
+    with open(jrnl.journal_path, "ab") as f:
+        f.write(journal._pack([2, "append", ["jobs"], {"id": 2}])[:-3])
+    db = {}
+    _open(tmp_path, db).record("append", ["jobs"], {"id": 3})
+    db2 = {}
+    _open(tmp_path, db2)
+    assert db2["jobs"] == [{"id": 1}, {"id": 3}]
+
+
+def test_reopen_reloads_only_when_another_process_wrote(tmp_path):
+    master_db = {"jobs": []}
+    master = _open(tmp_path, master_db)
+
+    # first worker after fork: nothing written since, so nothing to reload
+    assert master.reopen(master_db, {"jobs": []}) is False
+
+    # a worker appends, then is recycled; its replacement starts from the master's state
+    worker = _open(tmp_path, {"jobs": []})
+    worker.record("append", ["jobs"], {"id": "w1"})
+    worker.close()
+    stale = {"jobs": []}
+    assert master.reopen(stale, {"jobs": []}) is True
+    assert stale["jobs"] == [{"id": "w1"}]
+    master.record("append", ["jobs"], {"id": "w2"})
+    assert master.seq == 2
+
+
+def test_snapshot_compacts_and_replay_continues(tmp_path):
+    db = {}
+    jrnl = _open(tmp_path, db)
+    for i in range(3):
+        journal.apply_op(db, "append", ["jobs"], {"id": i})
+        jrnl.record("append", ["jobs"], {"id": i})
+    assert jrnl.snapshot() is True
+    assert jrnl.journal_path.stat().st_size == 0
+    journal.apply_op(db, "append", ["jobs"], {"id": 3})
+    jrnl.record("append", ["jobs"], {"id": 3})
+    jrnl.close()
+
+    replayed = {}
+    again = _open(tmp_path, replayed)
+    assert replayed["jobs"] == [{"id": i} for i in range(4)]
+    assert again.seq == 4
+
+
+def test_snapshot_ignores_changes_not_yet_recorded(tmp_path):
+    db = {}
+    jrnl = _open(tmp_path, db)
+    jrnl.record("set", ["jobs"], [])
+    db["jobs"] = []
+    # a handler has appended in memory but not reached persist() when the snapshot runs
+    db["jobs"].append({"id": "in-flight"})
+    assert jrnl.snapshot() is True
+    jrnl.record("append", ["jobs"], {"id": "in-flight"})
+    jrnl.close()
+
+    replayed = {}
+    _open(tmp_path, replayed)
+    assert replayed["jobs"] == [{"id": "in-flight"}]
+
+
+def test_snapshot_every_compacts_in_the_background(tmp_path, monkeypatch):
+    jrnl = _open(tmp_path, snapshot_every=2)
+    threads = []
+    snapshot = jrnl.snapshot
+    monkeypatch.setattr(jrnl, "snapshot", lambda: threads.append(threading.current_thread()) or snapshot())
+    jrnl.record("append", ["jobs"], 1)
+    jrnl.record("append", ["jobs"], 2)
+    deadline = time.monotonic() + 5
+    while jrnl.since_snapshot and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert jrnl.since_snapshot == 0 and jrnl.snapshot_path.exists()
+    assert threads and threading.current_thread() not in threads   # not on the writer's thread
+    jrnl.close()
+
+
+def test_records_written_during_compaction_are_kept(tmp_path, monkeypatch):
+    jrnl = _open(tmp_path)
+    for i in range(3):
+        jrnl.record("append", ["jobs"], i)
+    read = jrnl._read
+
+    def read_while_writing(db, until=None):
+        result = read(db, until)
+        jrnl.record("append", ["jobs"], 3)   # another request, while the snapshot is built
+        return result
+
+    monkeypatch.setattr(jrnl, "_read", read_while_writing)
+    assert jrnl.snapshot() is True
+    assert jrnl.since_snapshot == 1
+    jrnl.record("append", ["jobs"], 4)
+    jrnl.close()
+
+    replayed = {}
+    again = _open(tmp_path, replayed)
+    assert replayed["jobs"] == [0, 1, 2, 3, 4] and again.seq == 5
+
+
+def test_failed_snapshot_is_logged(tmp_path, caplog, monkeypatch):
+    jrnl = _open(tmp_path)
+    jrnl.record("append", ["jobs"], 1)
+    monkeypatch.setattr(jrnl, "seq", 5)
+    assert jrnl.snapshot() is False
+    assert "snapshot skipped" in caplog.text
+    assert jrnl.journal_path.stat().st_size > 0
@@ -0,0 +1,117 @@
+# tests/test_outbox.py
+# Delivery against a local SMTP server (aiosmtpd): sent, retried on 4xx, dead-lettered on 5xx.
+import socket
+
+import pytest
+
+import outbox
+from store import DB
+
+controller_mod = pytest.importorskip("aiosmtpd.controller")
+
+
+class Handler:
+    """Accepts mail for ok@, answers 451 for busy@ and 550 for bad@."""
+
+    def __init__(self):
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bad@"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if any(r.startswith("busy@") for r in envelope.rcpt_tos):
+            return "451 4.3.0 Try again later"
+        self.delivered.append((envelope.rcpt_tos, envelope.content.decode("utf-8", "replace")))
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = Handler()
+    server = controller_mod.Controller(handler, hostname="127.0.0.1", port=port)
+    server.start()
+    monkeypatch.setattr(outbox, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(outbox, "SMTP_PORT", port)
+    monkeypatch.setattr(outbox, "ENABLED", True)
+    monkeypatch.setattr(outbox, "BACKOFF", 0)
+    monkeypatch.setattr(outbox, "MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(outbox, "start", lambda: None)  # the test drives flush() itself
+    monkeypatch.setattr(outbox, "_conn", outbox._Connection())
+    yield handler
+    outbox._conn.close()
+    server.stop()
+
+
+def _enqueue(to):
+    return outbox.enqueue("application_ack", to, {"name": "Ann", "job_title": "Engineer", "application_id": "a1"})
+
+
+def test_delivery(site, smtp):
+    DB.setdefault("pages", {})["home"] = {"title": "Acme"}
+    msg = _enqueue("ok@example.com")
+    assert outbox.flush() == 1
+    (rcpts, content), = smtp.delivered
+    assert rcpts == ["ok@example.com"] and "Subject: We received your application: Engineer" in content
+    assert "Hi Ann" in content and "Acme" in content
+    assert msg["id"] not in DB["outbox"]
+
+
+def test_temporary_failure_retries_then_dead_letters(site, smtp):
+    msg = _enqueue("busy@example.com")
+    assert outbox.flush() == 0
+    assert DB["outbox"][msg["id"]]["attempts"] == 1 and "451" in DB["outbox"][msg["id"]]["last_error"]
+    outbox.flush()
+    outbox.flush()
+    assert msg["id"] not in DB["outbox"]
+    assert DB["outbox_dead"][msg["id"]]["attempts"] == 3
+
+
+def test_permanent_failure_is_dead_lettered_and_can_be_requeued(site, smtp, admin_headers):
+    msg = _enqueue("bad@example.com")
+    ok = _enqueue("ok@example.com")
+    assert outbox.flush() == 1  # the refused recipient doesn't hold up the rest of the batch
+    dead = DB["outbox_dead"][msg["id"]]
+    assert dead["attempts"] == 0 and "550" in dead["last_error"]
+    assert ok["id"] not in DB["outbox"]
+
+    status = site.get("/api/admin/outbox", headers=admin_headers).get_json()
+    assert [m["id"] for m in status["dead"]] == [msg["id"]] and status["pending"] == []
+    assert site.post(f"/api/admin/outbox/{msg['id']}/retry", headers=admin_headers).status_code == 200
+    assert DB["outbox"][msg["id"]]["attempts"] == 0 and msg["id"] not in DB["outbox_dead"]
+
+
+def test_address_must_be_a_single_plain_address():
+    assert outbox.clean_address("  ann@example.com ") == "ann@example.com"
+    for bad in ("ann@example.com\nBcc: x@evil.com", "a@b.com, c@d.com", "Ann <ann@example.com>", "", None, "ann"):
+        assert outbox.clean_address(bad) is None
+    with pytest.raises(ValueError):
+        _enqueue("ann@example.com\r\nBcc: x@evil.com")
+
+
+def test_unbuildable_message_is_dead_lettered_and_the_rest_are_sent(site, smtp):
+    # e.g. journaled before addresses were validated
+    broken = dict(_enqueue("ok@example.com"), to="eve@example.com\nBcc: x@evil.com")
+    DB["outbox"][broken["id"]] = broken
+    ok = _enqueue("ok@example.com")
+    assert outbox.flush() == 1
+    assert broken["id"] in DB["outbox_dead"] and ok["id"] not in DB["outbox"]
+    assert not DB["outbox"]
+
+
+def test_apply_with_a_bad_email_is_recorded_without_an_ack(site, smtp):
+    import io
+
+    for email in ("eve@example.com\nBcc: x@evil.com", "bob@x.com"):
+        resp = site.post("/api/apply", content_type="multipart/form-data",
+                         data={"name": "A", "email": email, "job_title": "Engineer",
+                               "resume": (io.BytesIO(email.encode() + b" resume text"), "cv.txt")})
+        assert resp.status_code == 200
+    assert [m["to"] for m in DB["outbox"].values()] == ["bob@x.com"]
+    assert outbox.flush() == 1
@@ -0,0 +1,73 @@
+# tests/test_ratelimit.py
+# Token buckets, the per-tenant LLM quota and the concurrency gate.
+import pytest
+
+import ratelimit
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Rate limiting on, with fresh in-memory buckets."""
+    monkeypatch.setattr(ratelimit, "ENABLED", True)
+    monkeypatch.setattr(ratelimit, "BACKEND", ratelimit.MemoryBackend())
+    return monkeypatch
+
+
+def test_parse_limit():
+    assert ratelimit.parse_limit("20/min") == (20 / 60, 20)
+    assert ratelimit.parse_limit("5/s") == (5, 5)
+    assert ratelimit.parse_limit("300/hour") == (300 / 3600, 300)
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    backend = ratelimit.MemoryBackend()
+    assert backend.take("k", rate=1, burst=2) == (True, 0.0)
+    assert backend.take("k", rate=1, burst=2) == (True, 0.0)
+    allowed, wait = backend.take("k", rate=1, burst=2)
+    assert not allowed and wait == pytest.approx(1.0)
+    now[0] += 1
+    assert backend.take("k", rate=1, burst=2)[0]
+    assert backend.take("other", rate=1, burst=2)[0]   # keys don't share a bucket
+
+
+def test_limited_route_returns_429_with_retry_after(client, limits):
+    limits.setitem(ratelimit.LIMITS, "ai", (1 / 60, 2))
+    for _ in range(2):
+        assert client.post("/api/voice/text", json={"text": "hello"}).status_code == 200
+    resp = client.post("/api/voice/text", json={"text": "hello"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1 and resp.get_json()["retry_after"] >= 1
+
+
+def test_clients_are_limited_separately(client, admin_headers, limits):
+    limits.setitem(ratelimit.LIMITS, "ai", (1 / 60, 1))
+    assert client.post("/api/voice/text", json={"text": "hi"}).status_code == 200
+    assert client.post("/api/voice/text", json={"text": "hi"}).status_code == 429
+    # a verified token is its own client, whatever the IP
+    assert client.post("/api/voice/text", json={"text": "hi"}, headers=admin_headers).status_code == 200
+    assert client.post("/api/voice/text", json={"text": "hi"},
+                       headers={"Authorization": "Bearer junk"}).status_code == 429
+
+
+def test_tenant_llm_quota_is_shared_by_its_clients(site, limits):
+    import tenants
+
+    tenants.site(site.tenant_id)["quotas"]["llm"] = "2/hour"
+    for ip in ("10.0.0.1", "10.0.0.2"):
+        assert site.post("/api/voice/text", json={"text": "hi"},
+                         environ_base={"REMOTE_ADDR": ip}).status_code == 200
+    resp = site.post("/api/voice/text", json={"text": "hi"}, environ_base={"REMOTE_ADDR": "10.0.0.3"})
+    assert resp.status_code == 429
+
+
+def test_full_gate_sheds_with_503(client, limits):
+    limits.setattr(ratelimit, "GATE", ratelimit.ConcurrencyGate(1))
+    assert ratelimit.GATE.try_acquire()
+    try:
+        resp = client.post("/api/voice/text", json={"text": "hello"})
+        assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+    finally:
+        ratelimit.GATE.release()
+    assert client.post("/api/voice/text", json={"text": "hello"}).status_code == 200
@@ -0,0 +1,63 @@
+# tests/test_revisions.py
+# JSON patch diff/apply, history replay, rollback and drafts.
+import pytest
+
+import revisions
+from store import DB
+
+
+def test_diff_and_apply_round_trip():
+    old = {"title": "Services", "services": [{"name": "Web", "price": 10}, {"name": "SEO", "price": 5}],
+           "a/b": 1, "gone": True}
+    new = {"title": "Services", "services": [{"name": "Web", "price": 12}, {"name": "SEO", "price": 5}],
+           "a/b": 2, "added": [1]}
+    patch = revisions.diff(old, new)
+    assert {"op": "replace", "path": "/services/0/price", "value": 12} in patch
+    assert {"op": "replace", "path": "/a~1b", "value": 2} in patch
+    assert {"op": "remove", "path": "/gone"} in patch
+    assert revisions.apply_patch(old, patch) == new
+    assert old["services"][0]["price"] == 10   # the input is not modified
+
+
+def test_list_append_is_an_add():
+    assert revisions.diff([1, 2], [1, 2, 3]) == [{"op": "add", "path": "/-", "value": 3}]
+    assert revisions.apply_patch([1, 2], [{"op": "add", "path": "/-", "value": 3}]) == [1, 2, 3]
+
+
+def test_patch_that_no_longer_fits_is_a_conflict():
+    with pytest.raises(revisions.PatchConflict):
+        revisions.apply_patch({"a": 1}, [{"op": "replace", "path": "/b/c", "value": 2}])
+
+
+def test_history_replays_every_revision(site, monkeypatch):
+    monkeypatch.setattr(revisions, "SNAPSHOT_EVERY", 3)
+    versions = [{"title": "About", "body": "x" * 200, "n": n} for n in range(7)]
+    for content in versions:
+        revisions.record("about", content, author="test")
+
+    kinds = [r["kind"] for r in revisions.history("about")]
+    assert kinds == ["snapshot", "delta", "delta", "snapshot", "delta", "delta", "snapshot"]
+    for n, content in enumerate(versions, 1):
+        assert revisions.content_at("about", n) == content
+    assert revisions.content_at("about", 8) is None
+
+    snapshot = revisions.content_at("about", 4)
+    snapshot["body"] = "changed"   # a caller mutating the result doesn't rewrite history
+    assert revisions.content_at("about", 4) == versions[3] and revisions.content_at("about", 5) == versions[4]
+    assert DB["pages"]["about"] == versions[-1]
+
+
+def test_rollback_and_draft_routes(site, admin_headers):
+    site.post("/api/admin/pages/about", json={"title": "One"}, headers=admin_headers)
+    site.post("/api/admin/pages/about", json={"title": "Two"}, headers=admin_headers)
+
+    resp = site.post("/api/admin/pages/about/rollback", json={"rev": 1}, headers=admin_headers)
+    assert resp.get_json()["page"] == {"title": "One"}
+    assert revisions.current_rev("about") == 3
+
+    site.post("/api/admin/pages/about/draft", json={"title": "Draft"}, headers=admin_headers)
+    assert site.get("/api/admin/pages/about/draft", headers=admin_headers).get_json()["content"] == {"title": "Draft"}
+    assert DB["pages"]["about"] == {"title": "One"}
+    resp = site.post("/api/admin/pages/about/draft/publish", headers=admin_headers)
+    assert resp.get_json()["page"] == {"title": "Draft"}
+    assert site.get("/api/admin/pages/about/draft", headers=admin_headers).status_code == 404
@@ -0,0 +1,45 @@
+# tests/test_search.py
+import search
+from store import DB, persist
+
+
+def _add_post(post):
+    DB.setdefault("blog", []).append(post)
+    persist("append", ["blog"], post)
+
+
+def test_bm25_ranks_title_and_frequency(site):
+    _add_post({"id": "1", "title": "Kubernetes in production", "content": "Running kubernetes clusters."})
+    _add_post({"id": "2", "title": "Team update", "content": "We also use kubernetes."})
+    _add_post({"id": "3", "title": "Hiring", "content": "Nothing relevant here."})
+
+    out = search.search("kubernetes")
+    assert out["total"] == 2
+    assert [r["id"] for r in out["results"]] == ["1", "2"]
+    assert "<mark>Kubernetes</mark>" in out["results"][0]["title"]
+
+
+def test_index_follows_writes_and_prefix_matches_last_term(site):
+    search.search("warmup")  # build the index, later writes update it incrementally
+    _add_post({"id": "p", "title": "Developer experience", "content": "Tooling for development teams."})
+    assert search.search("devel")["total"] == 1
+    assert search.search("devel", types=["job"])["total"] == 0
+
+    DB["blog"] = []
+    persist("set", ["blog"], [])
+    assert search.search("devel")["total"] == 0
+
+
+def test_bad_rows_do_not_break_indexing(site):
+    search.search("warmup")
+    DB.setdefault("jobs", []).append({"id": "j", "title": None, "description": "python backend"})
+    persist("append", ["jobs"], DB["jobs"][-1])
+    DB.setdefault("pages", {})["odd"] = ["not", "a", "dict"]
+    persist("set", ["pages", "odd"], DB["pages"]["odd"])
+    assert search.search("python")["results"][0]["id"] == "j"
+
+
+def test_search_endpoint(site):
+    assert site.get("/api/search").status_code == 400
+    assert site.get("/api/search?q=x&type=nope").status_code == 400
+    assert site.get("/api/search?q=anything").get_json()["total"] == 0
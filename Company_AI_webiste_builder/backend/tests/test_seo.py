@@ -0,0 +1,89 @@
+# tests/test_seo.py
+# Sitemap and per-URL metadata: incremental refresh, posting dates, base URL after a domain change.
+import datetime
+
+import seo
+from store import DB, persist
+
+
+def _meta(site, path):
+    resp = site.get("/api/seo/meta", query_string={"path": path})
+    return resp.status_code, resp.get_json()
+
+
+def test_describe_cuts_at_a_word():
+    text = "word " * 60
+    out = seo.describe("", None, text)
+    assert out.endswith("...") and len(out) <= seo.DESCRIPTION_CHARS
+    assert seo.describe("short") == "short"
+
+
+def test_sitemap_and_meta(site):
+    DB["pages"]["home"] = {"title": "Acme", "subtitle": "We build things"}
+    persist("set", ["pages", "home"], DB["pages"]["home"])
+    DB["pages"]["admin"] = {"title": "secret"}
+    persist("set", ["pages", "admin"], DB["pages"]["admin"])
+
+    resp = site.get("/sitemap.xml")
+    assert resp.status_code == 200 and resp.mimetype == "application/xml"
+    body = resp.get_data(as_text=True)
+    assert f"<loc>https://{site.tenant_id}.test/</loc>" in body
+    assert "/admin" not in body
+    assert site.get("/sitemap.xml", headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+
+    status, meta = _meta(site, "/")
+    assert status == 200
+    assert meta["json_ld"]["@type"] == "Organization" and meta["json_ld"]["name"] == "Acme"
+    assert meta["description"] == "We build things"
+    assert _meta(site, "/admin")[0] == 404
+
+
+def test_new_job_is_added_with_its_posting_date(site):
+    site.get("/sitemap.xml")   # build the site first, so the job arrives as an incremental update
+    job = site.post("/api/jobs", json={"title": "Data Engineer", "type": "Full-time", "location": "Remote",
+                                       "salary_range": "$90k - $120k"}).get_json()["job"]
+    assert job["date_posted"] == datetime.date.today().isoformat()
+    seo.refresh()
+
+    status, meta = _meta(site, f"/careers/{job['id']}")
+    assert status == 200
+    ld = meta["json_ld"]
+    assert ld["@type"] == "JobPosting" and ld["datePosted"] == job["date_posted"]
+    assert ld["employmentType"] == "FULL_TIME" and ld["jobLocationType"] == "TELECOMMUTE"
+    assert ld["baseSalary"]["value"]["minValue"] == 90000
+    assert f"/careers/{job['id']}</loc>" in site.get("/sitemap.xml").get_data(as_text=True)
+
+
+def test_stored_posting_date_is_kept(site):
+    site.post("/api/jobs", json={"id": "old", "title": "Writer", "date_posted": "2024-03-01"})
+    assert _meta(site, "/careers/old")[1]["json_ld"]["datePosted"] == "2024-03-01"
+
+
+def test_appended_non_dict_is_ignored(site):
+    site.get("/sitemap.xml")
+    DB.setdefault("blog", []).append("not a post")
+    persist("append", ["blog"], "not a post")   # a row without an id has no URL: skipped
+    seo.refresh()
+    assert site.get("/sitemap.xml").status_code == 200
+
+
+def test_domain_change_resets_the_base_url(site, client, admin_headers):
+    DB["pages"]["home"] = {"title": "Acme"}
+    persist("set", ["pages", "home"], DB["pages"]["home"])
+    assert f"https://{site.tenant_id}.test/" in site.get("/sitemap.xml").get_data(as_text=True)
+
+    resp = client.patch(f"/api/admin/tenants/{site.tenant_id}", headers=admin_headers,
+                        json={"domains": [f"www.{site.tenant_id}.example"]})
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json()["tenant"]["domains"] == [f"www.{site.tenant_id}.example"]
+    assert "admin_password_hash" not in resp.get_json()["tenant"]
+
+    moved = client.get("/sitemap.xml", base_url=f"http://www.{site.tenant_id}.example").get_data(as_text=True)
+    assert f"<loc>https://www.{site.tenant_id}.example/" in moved and f"{site.tenant_id}.test" not in moved
+
+
+def test_tenant_update_errors(site, client, admin_headers):
+    url = f"/api/admin/tenants/{site.tenant_id}"
+    assert client.patch("/api/admin/tenants/no-such-site", headers=admin_headers, json={}).status_code == 404
+    assert client.patch(url, headers=admin_headers, json={"quotas": {"bogus": 1}}).status_code == 400
+    assert client.patch(url, json={"admins": []}).status_code == 401
@@ -0,0 +1,54 @@
+# tests/test_server.py
+# The app starts and serves its public and admin routes.
+import store
+
+
+def test_health(client):
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.get_json()["message"] == "AI Website Builder Backend Running"
+
+
+def test_services_and_projects_come_from_seeded_pages(client, admin_headers):
+    assert client.post("/api/admin/ensure_seed", headers=admin_headers).status_code == 200
+    services = client.get("/api/services").get_json()
+    assert services and all("title" in s or "name" in s for s in services)
+    assert isinstance(client.get("/api/projects").get_json(), list)
+
+
+def test_pages(client):
+    assert client.get("/api/pages/home").get_json()["title"]
+    assert client.get("/api/pages/no-such-page").status_code == 404
+
+
+def test_metrics(client):
+    client.get("/")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+
+
+def test_admin_routes_need_a_token(client, admin_headers):
+    assert client.get("/api/admin/applications").status_code == 401
+    assert client.get("/api/admin/applications", headers=admin_headers).status_code == 200
+
+
+def test_jobs_and_contact_are_tenant_scoped(site, client):
+    resp = site.post("/api/jobs", json={"title": "Platform Engineer", "skills": "python, k8s"})
+    assert resp.get_json()["status"] == "job_added"
+    assert [j["title"] for j in site.get("/api/jobs").get_json()] == ["Platform Engineer"]
+    assert "Platform Engineer" not in [j["title"] for j in client.get("/api/jobs").get_json()]
+
+    assert site.post("/api/contact", json={"name": "Ann", "email": "ann@example.com",
+                                           "message": "Hello"}).status_code == 201
+    assert len(store.tenant_db(site.tenant_id)["messages"]) == 1
+
+
+def test_unknown_site_is_404(app):
+    import tenants
+
+    tenants.BASE_DOMAIN, saved = "sites.test", tenants.BASE_DOMAIN
+    try:
+        assert app.test_client().get("/", base_url="http://nope.sites.test").status_code == 404
+    finally:
+        tenants.BASE_DOMAIN = saved
@@ -0,0 +1,81 @@
+# tests/test_site_builder.py
+# Incremental auto_build: name before tagline, and concurrent builds that both survive.
+import llm
+import site_builder
+from store import DB
+
+
+def _fake_llm(monkeypatch, seen):
+    def complete(endpoint, prompt, max_tokens=200):
+        seen.append(prompt)
+        if prompt.startswith("Suggest a short company name"):
+            return "Acme Labs"
+        if prompt.startswith("List exactly 3 services"):
+            return '["Audits", "Training", "Support"]'
+        if prompt.startswith("Describe 2 sample client projects"):
+            return '[{"title": "P1", "desc": "d"}]'
+        return "Generated text"
+    monkeypatch.setattr(llm, "USE_OPENAI", True)
+    monkeypatch.setattr(llm, "complete", complete)
+
+
+def test_tagline_and_about_use_the_generated_name(site, monkeypatch):
+    seen = []
+    _fake_llm(monkeypatch, seen)
+    body, status = llm.run_llm_plan(site_builder.plan({"brief": "Security consulting for banks"}))
+
+    assert status == 200
+    assert body["generated"]["name"] == "Acme Labs"
+    assert sorted(body["regenerated"]) == sorted(site_builder.SECTIONS)
+    tagline = next(p for p in seen if p.startswith("Write a one-line website tagline"))
+    about = next(p for p in seen if p.startswith("Write a 2-3 sentence"))
+    assert "Acme Labs" in tagline and "Acme Labs" in about
+    assert seen.index(tagline) > seen.index(next(p for p in seen if p.startswith("Suggest a short company name")))
+    assert DB["pages"]["home"]["title"] == "Acme Labs"
+
+
+def test_a_given_name_is_not_generated(site, monkeypatch):
+    seen = []
+    _fake_llm(monkeypatch, seen)
+    body, _ = llm.run_llm_plan(site_builder.plan({"brief": "Bakery", "name": "Crumbs"}))
+    assert body["generated"]["name"] == "Crumbs"
+    assert not any(p.startswith("Suggest a short company name") for p in seen)
+    assert "Crumbs" in next(p for p in seen if p.startswith("Write a one-line website tagline"))
+
+
+def test_only_changed_sections_are_rebuilt(site):
+    site_builder.plan({"brief": "Bakery", "name": "Crumbs"})
+    result = site_builder.plan({"services": "wedding cakes"})["result"]
+    assert result["regenerated"] == ["services"]
+    assert result["invalidate"]["api"] == ["/api/pages/about"]
+
+
+def test_concurrent_builds_keep_each_others_sections(site):
+    site_builder.plan({"brief": "Bakery", "name": "Crumbs"})
+    version = DB["site_build"]["version"]
+
+    # both planned against the same state, finished one after the other
+    services = site_builder.plan({"services": "wedding cakes", "sections": ["services"]})
+    tone = site_builder.plan({"tone": "playful", "sections": ["tagline"]})
+    assert "result" in services and "result" in tone   # no LLM configured: finished while planning
+
+    state = DB["site_build"]
+    assert state["version"] == version + 2
+    assert state["inputs"]["services"] == "wedding cakes" and state["inputs"]["tone"] == "playful"
+    assert state["sections"]["services"]["version"] == version + 1
+    assert state["sections"]["tagline"]["version"] == version + 2
+
+
+def test_merge_reads_the_state_as_it_is_at_merge_time(site, monkeypatch):
+    site_builder.plan({"brief": "Bakery", "name": "Crumbs"})
+    monkeypatch.setattr(llm, "USE_OPENAI", True)
+    slow = site_builder.plan({"services": "wedding cakes", "sections": ["services"]})   # waiting on the LLM
+    monkeypatch.setattr(llm, "USE_OPENAI", False)
+    site_builder.plan({"tone": "playful", "sections": ["tagline"]})                      # finishes first
+
+    slow["finish"]({"services": '["Cakes", "Bread", "Coffee"]'})
+    state = DB["site_build"]
+    assert state["inputs"]["tone"] == "playful" and state["inputs"]["services"] == "wedding cakes"
+    assert {"services", "tagline"} <= set(state["sections"])
+    assert DB["pages"]["about"]["services"] == ["Cakes", "Bread", "Coffee"]
+    assert DB["pages"]["home"]["hero"] == site_builder.FALLBACKS["tagline"]
@@ -0,0 +1,79 @@
+# tests/test_store.py
+import journal
+import store
+from store import DB, persist
+
+
+def test_persist_journals_before_listeners_and_survives_a_failing_one(site, tmp_path, monkeypatch, caplog):
+    jrnl = journal.Journal(tmp_path, fsync="never")
+    jrnl.open({})
+    monkeypatch.setattr(store, "JOURNAL", jrnl)
+    seen = []
+
+    def broken(op, path, value):
+        seen.append(jrnl.seq)
+        raise AttributeError("listener bug")
+
+    monkeypatch.setattr(store, "_listeners", [broken, lambda op, path, value: seen.append(path)])
+    DB.setdefault("jobs", []).append({"id": "j1", "title": None})
+    persist("append", ["jobs"], {"id": "j1", "title": None})
+
+    assert seen == [1, ["jobs"]]  # journaled first, later listeners still ran
+    assert "listener" in caplog.text
+    jrnl.close()
+    replayed = {}
+    journal.Journal(tmp_path, fsync="never").open(replayed)
+    assert replayed["_tenants"][site.tenant_id]["jobs"] == [{"id": "j1", "title": None}]
+
+
+def test_seed_data_is_journaled(site, tmp_path, monkeypatch):
+    from seed import ensure_seed_data
+
+    jrnl = journal.Journal(tmp_path, fsync="never")
+    jrnl.open({})
+    monkeypatch.setattr(store, "JOURNAL", jrnl)
+    ensure_seed_data()
+    jrnl.close()
+
+    replayed = {}
+    journal.Journal(tmp_path, fsync="never").open(replayed)
+    tenant = replayed["_tenants"][site.tenant_id]
+    assert set(tenant["pages"]) >= {"home", "about", "services", "projects"}
+    assert tenant["jobs"] == DB["jobs"] and tenant["blog"] == DB["blog"]
+    assert tenant["_meta"]["seeded_at"] == DB["_meta"]["seeded_at"]
+
+
+def test_tenant_cache_rebuilds_when_a_write_lands_during_the_build(site):
+    builds = []
+
+    def build():
+        builds.append(len(builds))
+        if len(builds) == 1:
+            cache.written()   # a write listener runs while the first build is reading DB
+        return {"build": len(builds)}
+
+    cache = store.TenantCache(build, max_tenants=2)
+    assert cache.get() == {"build": 2}
+    assert cache.get() is cache.get() and len(builds) == 2
+    assert cache.written() == {"build": 2}   # built: the listener updates it in place
+
+
+def test_tenant_cache_gives_up_caching_under_constant_writes(site):
+    cache = None
+
+    def build():
+        cache.written()
+        return object()
+
+    cache = store.TenantCache(build, max_tenants=2)
+    first = cache.get()
+    assert cache.get() is not first   # never kept: a later call builds again
+
+
+def test_tenant_cache_is_per_tenant_and_lru(site):
+    cache = store.TenantCache(lambda: {"tenant": store.current_tenant()}, max_tenants=1)
+    assert cache.get()["tenant"] == site.tenant_id
+    with store.using_tenant(store.DEFAULT_TENANT):
+        assert cache.get()["tenant"] == store.DEFAULT_TENANT
+        assert cache.written() is not None
+    assert cache.written() is None   # evicted by the other tenant
@@ -0,0 +1,44 @@
+# tests/test_themes.py
+# Theme compilation to CSS bundles, content-hashed URLs and catalog lookups.
+import themes
+
+
+def test_compile_css_adds_derived_values():
+    css = themes.compile_css({"primary": "#FFFFFF", "text": "#111827", "radius": "8px",
+                              "colors": {"accent": "#000"}, "bad": "url(evil)"})
+    assert css.startswith(":root{") and css.endswith("}\n")
+    decls = dict(d.split(":", 1) for d in css[6:-2].split(";"))
+    assert decls["--primary"] == "#fff" and decls["--primary-rgb"] == "255,255,255"
+    assert decls["--on-primary"] == "#000" and decls["--primary-hover"] == "#e0e0e0"
+    assert decls["--accent"] == "#000" and decls["--on-accent"] == "#fff"   # "colors" wrapper is flattened
+    assert decls["--radius"] == "8px"
+    assert "--text-hover" not in decls and "--bad" not in decls
+
+
+def test_bundle_url_is_the_content_hash():
+    a = themes.bundle_url({"primary": "#0b72ff"})
+    assert a == themes.bundle_url({"primary": "#0B72FF"})   # same CSS, same bundle
+    assert a != themes.bundle_url({"primary": "#ff0000"})
+    assert themes.bundle(a.rsplit("/", 1)[1][:-4]) == themes.compile_css({"primary": "#0b72ff"}).encode()
+
+
+def test_bundle_route_is_immutable(client):
+    url = themes.bundle_url(themes.BUILTIN["modern"])
+    resp = client.get(url)
+    assert resp.status_code == 200 and resp.mimetype == "text/css"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert client.get(url, headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+    assert client.get("/api/themes/0000.css").status_code == 404
+
+
+def test_catalog_tone_is_answered_without_the_llm(site):
+    body = site.post("/api/ai/theme", json={"tone": "  Dark "}).get_json()
+    assert body["tone"] == "dark" and body["theme"] == themes.BUILTIN["dark"]
+    assert body["css"] == themes.bundle_url(themes.BUILTIN["dark"])
+
+
+def test_site_theme_overrides_the_catalog(site):
+    site.post("/api/ai/theme", json={"tone": "space age"})   # no LLM: stored from the default palette
+    listing = {t["tone"]: t for t in site.get("/api/themes").get_json()}
+    assert not listing["space age"]["builtin"] and listing["dark"]["builtin"]
+    assert site.get(listing["space age"]["css"]).status_code == 200
@@ -0,0 +1,18 @@
+# tests/test_workers.py
+import time
+
+from workers import ProcessPool
+
+
+def test_retire_keeps_other_jobs_running():
+    workers = ProcessPool("test", 1, reap_after=30)
+    pool = workers.get()
+    other = pool.submit(time.sleep, 0.2)
+    workers.retire(pool)
+    workers.retire(pool)  # a second timed-out request doesn't retire the new pool
+    assert other.result(timeout=30) is None  # finished, not terminated
+    fresh = workers.get()
+    assert fresh is not pool
+    workers.reset()
+    assert workers.get() is not fresh
+    workers.reset()
@@ -0,0 +1,261 @@
+# themes.py
+# Site themes compiled to static CSS bundles.
+#
+# A theme is the color JSON from /api/ai/theme (stored in DB["themes"][tone]). It is
+# compiled once, server-side, into a minified stylesheet of CSS custom properties on
+# :root, including the values the frontend would otherwise compute (rgb triplets
+# for translucent overlays, a hover shade, a readable text color on each brand
+# color). The bundle is named by a hash of its content and served from
+# /api/themes/<hash>.css as an immutable asset, so applying a theme is one cacheable
+# fetch instead of an LLM round trip.
+#
+# A catalog of common tones is always available: built-in palettes, replaced by
+# LLM-generated ones that a background thread creates once (with OpenAI configured)
+# and keeps in DATA_DIR/theme_catalog.json. Asking /api/ai/theme for a tone that
+# the site or the catalog already has returns the cached theme without calling the LLM.
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import llm
+import store
+from store import DB
+
+log = logging.getLogger(__name__)
+
+CATALOG_FILE = store.DATA_DIR / "theme_catalog.json"
+CATALOG_LLM = os.getenv("THEME_CATALOG_LLM", "1") == "1"
+BUNDLE_CACHE = int(os.getenv("THEME_BUNDLE_CACHE", "2048"))
+MAX_AGE = 365 * 86400  # bundles never change: the URL is the content hash
+
+BUILTIN = {
+    "professional": {"primary": "#0b72ff", "secondary": "#0b9eff", "accent": "#ffb400", "bg": "#ffffff", "text": "#111827", "button": "#0b72ff"},
+    "corporate": {"primary": "#1e3a8a", "secondary": "#334155", "accent": "#0ea5e9", "bg": "#f8fafc", "text": "#0f172a", "button": "#1e3a8a"},
+    "modern": {"primary": "#6366f1", "secondary": "#8b5cf6", "accent": "#22d3ee", "bg": "#ffffff", "text": "#18181b", "button": "#6366f1"},
+    "minimal": {"primary": "#111111", "secondary": "#525252", "accent": "#a3a3a3", "bg": "#ffffff", "text": "#171717", "button": "#111111"},
+    "playful": {"primary": "#f43f5e", "secondary": "#f59e0b", "accent": "#10b981", "bg": "#fffbeb", "text": "#1f2937", "button": "#f43f5e"},
+    "elegant": {"primary": "#7c2d12", "secondary": "#a16207", "accent": "#d4af37", "bg": "#fdfaf5", "text": "#1c1917", "button": "#7c2d12"},
+    "bold": {"primary": "#dc2626", "secondary": "#111827", "accent": "#facc15", "bg": "#ffffff", "text": "#0a0a0a", "button": "#dc2626"},
+    "dark": {"primary": "#3b82f6", "secondary": "#a855f7", "accent": "#f59e0b", "bg": "#0b1120", "text": "#e5e7eb", "button": "#3b82f6"},
+    "warm": {"primary": "#ea580c", "secondary": "#b45309", "accent": "#65a30d", "bg": "#fff7ed", "text": "#292524", "button": "#ea580c"},
+    "tech": {"primary": "#0891b2", "secondary": "#2563eb", "accent": "#84cc16", "bg": "#f0f9ff", "text": "#0c1a2b", "button": "#0891b2"},
+}
+BRAND = ("primary", "secondary", "accent", "button")   # get --on-<name> (text color) and --<name>-hover
+
+HEX_RE = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6})")
+VALUE_RE = re.compile(r"#[0-9a-f]{3,8}|(?:rgb|rgba|hsl|hsla)\([0-9.,%\s/]+\)|[a-z]+|-?[0-9.]+(?:px|rem|em|%|vh|vw)?")
+NAME_RE = re.compile(r"[^a-z0-9]+")
+WRAPPERS = frozenset(("colors", "colours", "variables", "css_variables", "cssvariables", "vars"))
+
+
+def normalize_tone(tone):
+    return " ".join(str(tone).lower().split())
+
+
+# ----------------------------
+# Compile
+# ----------------------------
+def _variables(theme, prefix=""):
+    """Flatten a theme into (name, css value); anything that isn't a plain CSS value is skipped."""
+    for key, value in theme.items():
+        name = NAME_RE.sub("-", str(key).lower()).strip("-")
+        if isinstance(value, dict):
+            yield from _variables(value, prefix if name.replace("-", "_") in WRAPPERS else f"{prefix}{name}-")
+        elif isinstance(value, str) and name:
+            value = value.strip().lower()
+            if VALUE_RE.fullmatch(value):
+                yield prefix + name, value
+
+
+def _rgb(hex_color):
+    h = hex_color[1:]
+    if len(h) == 3:
+        h = "".join(c * 2 for c in h)
+    return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _hex(rgb):
+    h = "".join(f"{max(0, min(255, round(c))):02x}" for c in rgb)
+    return f"#{h[0]}{h[2]}{h[4]}" if h[0::2] == h[1::2] else f"#{h}"  # #aabbcc -> #abc
+
+
+def _luminance(rgb):
+    def channel(c):
+        c /= 255
+        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    r, g, b = (channel(c) for c in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def compile_css(theme):
+    """Minified `:root{...}` stylesheet for a theme dict."""
+    out = {}
+    for name, value in _variables(theme if isinstance(theme, dict) else {}):
+        if HEX_RE.fullmatch(value):
+            rgb = _rgb(value)
+            out[name] = _hex(rgb)
+            out[f"{name}-rgb"] = ",".join(map(str, rgb))
+            if name in BRAND:
+                out[f"{name}-hover"] = _hex([c * 0.88 for c in rgb])
+                out[f"on-{name}"] = "#000" if _luminance(rgb) > 0.179 else "#fff"
+        else:
+            out[name] = value
+    return ":root{" + ";".join(f"--{k}:{v}" for k, v in out.items()) + "}\n"
+
+
+_bundles = OrderedDict()    # digest -> css bytes, LRU
+_digests = OrderedDict()    # canonical theme JSON -> digest
+_lock = threading.Lock()
+
+
+def bundle_url(theme):
+    """Content-hashed URL of the theme's compiled bundle (compiled on first use)."""
+    key = json.dumps(theme, sort_keys=True, default=str)
+    with _lock:
+        digest = _digests.get(key)
+        if digest is not None and digest in _bundles:
+            _digests.move_to_end(key)
+            _bundles.move_to_end(digest)
+            return f"/api/themes/{digest}.css"
+    css = compile_css(theme).encode("utf-8")
+    digest = hashlib.sha256(css).hexdigest()[:20]
+    with _lock:
+        _digests[key] = digest
+        _bundles[digest] = css
+        while len(_digests) > BUNDLE_CACHE:
+            _digests.popitem(last=False)
+        while len(_bundles) > BUNDLE_CACHE:
+            _bundles.popitem(last=False)
+    return f"/api/themes/{digest}.css"
+
+
+def bundle(digest):
+    """Compiled CSS for a bundle hash, or None. A miss (restart, another worker) recompiles
+    the catalog and the current site's themes, since every URL handed out came from one of them."""
+    with _lock:
+        css = _bundles.get(digest)
+    if css is None:
+        for theme in list(catalog().values()) + list(DB.get("themes", {}).values()):
+            bundle_url(theme)
+        with _lock:
+            css = _bundles.get(digest)
+    return css
+
+
+# ----------------------------
+# Catalog
+# ----------------------------
+_catalog = None
+_catalog_lock = threading.Lock()
+_pid = None
+
+
+def _load_catalog():
+    themes = dict(BUILTIN)
+    try:
+        generated = json.loads(CATALOG_FILE.read_text())
+        themes.update({tone: t for tone, t in generated.items() if tone in BUILTIN and isinstance(t, dict)})
+    except (OSError, ValueError):
+        pass
+    return themes
+
+
+def catalog():
+    """tone -> theme for the common tones (built-in, or LLM-generated once available)."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = _load_catalog()
+    return _catalog
+
+
+def parse(out):
+    """Theme dict from LLM output, or None."""
+    start, end = out.find("{"), out.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        theme = json.loads(out[start:end + 1])
+    except ValueError:
+        return None
+    return theme if isinstance(theme, dict) else None
+
+
+def prompt(tone):
+    return (f"Suggest CSS variables for a {tone} website (JSON: primary, secondary, accent, bg, text, button) "
+            f"and 3 Tailwind class groups for hero, button, card.")
+
+
+def _generate_catalog():
+    global _catalog
+    try:
+        generated = json.loads(CATALOG_FILE.read_text())
+    except (OSError, ValueError):
+        generated = {}
+    for tone in BUILTIN:
+        if tone in generated:
+            continue
+        theme = parse(llm.complete("theme", prompt(tone), max_tokens=200) or "")
+        if theme is None or not list(_variables(theme)):
+            log.warning("themes: no usable theme generated for '%s', keeping the built-in one", tone)
+            continue
+        generated[tone] = theme
+        CATALOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CATALOG_FILE.with_name(CATALOG_FILE.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(generated, indent=2))
+        os.replace(tmp, CATALOG_FILE)
+        current = catalog()
+        with _catalog_lock:
+            _catalog = dict(current, **{tone: theme})
+        bundle_url(theme)
+
+
+def warm():
+    """Compile every catalog bundle, and start generating the LLM catalog (once per process)."""
+    global _pid
+    if _pid == os.getpid():
+        return
+    with _catalog_lock:
+        if _pid == os.getpid():
+            return
+        _pid = os.getpid()
+    for theme in catalog().values():
+        bundle_url(theme)
+    if CATALOG_LLM and llm.USE_OPENAI:
+        threading.Thread(target=_generate_catalog, name="theme-catalog", daemon=True).start()
+
+
+def init_app(app):
+    """Precompute the catalog with the first request of each (possibly forked) worker process."""
+    app.before_request(warm)
+
+
+# ----------------------------
+# Lookup
+# ----------------------------
+def cached(tone):
+    """The site's theme for a tone, else the catalog's; None if the LLM has to make one."""
+    return DB.get("themes", {}).get(tone) or catalog().get(tone)
+
+
+def response(tone, theme):
+    return {"tone": tone, "theme": theme, "css": bundle_url(theme)}
+
+
+def listing():
+    """Catalog tones plus this site's own themes, each with its bundle URL."""
+    themes = dict(catalog(), **DB.get("themes", {}))
+    return [dict(response(tone, theme), builtin=tone in BUILTIN and tone not in DB.get("themes", {}))
+            for tone, theme in themes.items()]
+
+
+@store.on_write
+def _on_write(op, path, value):
+    # compile a newly stored theme right away, so its bundle is ready before anyone asks
+    if op == "set" and len(path) == 2 and path[0] == "themes" and isinstance(value, dict):
+        bundle_url(value)
@@ -0,0 +1,139 @@
+# tokens.py
+# Token counting and per-endpoint prompt budgets for the LLM-backed endpoints.
+#
+# Counting uses tiktoken when it is installed (p50k_base, the text-davinci-003
+# encoding) and otherwise a word-based estimate that errs slightly high, so a prompt
+# that fits the estimate fits the model. Every completion made through
+# llm.complete() is counted per endpoint (llm_tokens_total), and inputs cut to fit
+# a budget are counted in llm_prompt_truncations_total.
+import importlib.util
+import os
+import re
+
+import metrics
+
+MODEL_CONTEXT = int(os.getenv("LLM_CONTEXT_TOKENS", "4097"))  # prompt + completion limit of the model
+USE_TIKTOKEN = importlib.util.find_spec("tiktoken") is not None
+
+# endpoint -> max prompt tokens; override with LLM_PROMPT_BUDGETS="chatbot=3000,seo_analyze=2000"
+BUDGETS = {
+    "chatbot": 2500,
+    "seo_analyze": 2500,    # longer content is summarized in chunks first (map-reduce)
+    "seo_chunk": 1500,      # one map step of seo_analyze
+    "voice_text": 800,
+    "theme": 200,
+    "auto_build": 700,
+    "portfolio": 600,
+    "outbox": 300,
+}
+for _item in filter(None, os.getenv("LLM_PROMPT_BUDGETS", "").split(",")):
+    _name, _, _value = _item.partition("=")
+    BUDGETS[_name.strip()] = int(_value)
+
+TOKENS = metrics.register(metrics.Counter(
+    "llm_tokens_total", "LLM tokens by endpoint and direction (prompt, completion).", ("endpoint", "direction")))
+TRUNCATIONS = metrics.register(metrics.Counter(
+    "llm_prompt_truncations_total", "Inputs shortened to fit a prompt budget.", ("endpoint", "strategy")))
+
+PIECE_RE = re.compile(r"\w+|[^\w\s]")
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+MARKER = " [...]"
+
+_encoding = None
+
+
+def _enc():
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+        _encoding = tiktoken.get_encoding("p50k_base")
+    return _encoding
+
+
+def _estimate(piece):
+    # ~1 token per short word or symbol, +1 per 7 characters of longer words
+    return max(1, (len(piece) + 3) // 7)
+
+
+def count(text):
+    if not text:
+        return 0
+    if USE_TIKTOKEN:
+        return len(_enc().encode(text))
+    return sum(_estimate(m.group()) for m in PIECE_RE.finditer(text))
+
+
+def budget(endpoint):
+    return BUDGETS.get(endpoint, MODEL_CONTEXT // 2)
+
+
+def _prefix(text, limit):
+    """Longest prefix of `text` within `limit` tokens."""
+    if USE_TIKTOKEN:
+        return _enc().decode(_enc().encode(text)[:limit])
+    used = 0
+    for m in PIECE_RE.finditer(text):
+        used += _estimate(m.group())
+        if used > limit:
+            return text[:m.start()].rstrip()
+    return text
+
+
+def truncate(text, limit, endpoint=None):
+    """`text` cut to at most `limit` tokens (with a marker when shortened)."""
+    text = text or ""
+    if count(text) <= limit:
+        return text
+    if endpoint:
+        TRUNCATIONS.inc(endpoint, "truncate")
+    return _prefix(text, max(0, limit - count(MARKER))) + MARKER
+
+
+def chunks(text, size):
+    """Split text into pieces of at most `size` tokens, on paragraph boundaries where possible."""
+    out, current, used = [], [], 0
+    for para in PARAGRAPH_RE.split(text or ""):
+        para = para.strip()
+        if not para:
+            continue
+        n = count(para)
+        while n > size:  # a single oversized paragraph: cut it at token boundaries
+            if current:
+                out.append("\n\n".join(current))
+                current, used = [], 0
+            head = _prefix(para, size) or para[:size]
+            out.append(head)
+            para = para[len(head):].strip()
+            n = count(para)
+        if not para:
+            continue
+        if used + n > size and current:
+            out.append("\n\n".join(current))
+            current, used = [], 0
+        current.append(para)
+        used += n
+    if current:
+        out.append("\n\n".join(current))
+    return out
+
+
+def fit(pieces, limit):
+    """Keep whole pieces in order while they fit in `limit` tokens; the first that doesn't is truncated.
+
+    Returns (kept pieces, whether anything was dropped or shortened)."""
+    out, used = [], 0
+    for piece in pieces:
+        n = count(piece)
+        if used + n <= limit:
+            out.append(piece)
+            used += n
+            continue
+        if limit - used > 50:
+            out.append(truncate(piece, limit - used))
+        return out, True
+    return out, False
+
+
+def record(endpoint, prompt_tokens, completion):
+    TOKENS.inc(endpoint, "prompt", amount=prompt_tokens)
+    TOKENS.inc(endpoint, "completion", amount=count(completion))
@@ -0,0 +1,61 @@
+# workers.py
+# Process pools for CPU-heavy request work (resume extraction, image resizing).
+#
+# Each user owns one ProcessPool: created on first use with the spawn start method
+# (the web process is multi-threaded, forking it is not safe), replaced when a
+# worker dies (reset) or gets stuck past the caller's timeout (retire). Retiring
+# sends new work to a fresh pool but lets the old one finish what other requests
+# are waiting on; its processes are terminated `reap_after` seconds later.
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _processes(pool):
+    return list((getattr(pool, "_processes", None) or {}).values())
+
+
+class ProcessPool:
+    """A lazily started, replaceable ProcessPoolExecutor."""
+
+    def __init__(self, name, max_workers, reap_after):
+        self.name = name
+        self.max_workers = max_workers
+        self.reap_after = reap_after
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def reset(self):
+        """Replace a broken pool (a worker died), killing what is left of its processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        for proc in _processes(pool):
+            proc.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def retire(self, pool):
+        """Replace `pool` after one of its jobs timed out, without killing the others."""
+        with self._lock:
+            if self._pool is not pool:
+                return  # already retired by another request
+            self._pool = None
+        procs = _processes(pool)
+        pool.shutdown(wait=False)
+
+        def reap():
+            time.sleep(self.reap_after)
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+
+        threading.Thread(target=reap, name=f"{self.name}-pool-reaper", daemon=True).start()